@@ -1,22 +1,44 @@
-import os
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_login import LoginManager
-from flask_migrate import Migrate # <-- TAMBAHAN BARU
+from flask_migrate import Migrate
+from app import sqlite_setup
+from app.config import Config
 
-basedir = os.path.abspath(os.path.dirname(__file__))
-app = Flask(__name__)
-app.config['SECRET_KEY'] = 'kunci-rahasia-yang-sangat-sulit-ditebak-sekali'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(basedir, 'app.db')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-
-db = SQLAlchemy(app)
-bcrypt = Bcrypt(app)
-login_manager = LoginManager(app)
-login_manager.login_view = 'login'
+db = SQLAlchemy()
+bcrypt = Bcrypt()
+login_manager = LoginManager()
+login_manager.login_view = 'auth.login'
 login_manager.login_message_category = 'info'
+migrate = Migrate()
+
+
+def create_app(config=Config):
+    """Bangun aplikasi: ekstensi, blueprint per area, hook, dan perintah CLI.
+
+    Route, tugas latar belakang, dan perintah CLI baru diimpor di sini, sehingga `import app.models`
+    (migrasi, benchmark, skrip) tidak ikut memuat seluruh aplikasi.
+    """
+    app = Flask(__name__)
+    app.config.from_object(config)
 
-migrate = Migrate(app, db) # <-- TAMBAHAN BARU
+    db.init_app(app)
+    bcrypt.init_app(app)
+    login_manager.init_app(app)
+    migrate.init_app(app, db)
+    with app.app_context():
+        sqlite_setup.install(db.engine, app.config['SQLITE_PRAGMAS'])
 
-from app import routes, models
\ No newline at end of file
+    from app import archive, assets, backup, identity, instrumentation, jobs, receipts, commands  # noqa: F401 (identity: user_loader)
+    from app.views import BLUEPRINTS
+    for blueprint in BLUEPRINTS:
+        app.register_blueprint(blueprint)
+    archive.init_app(app)
+    assets.init_app(app)
+    instrumentation.init_app(app)
+    jobs.init_app(app)
+    receipts.init_app(app)
+    backup.init_app(app)
+    commands.init_app(app)
+    return app
@@ -0,0 +1,225 @@
+"""Arsip dingin: tagihan lunas dan pengeluaran lama dipindah dari app.db ke archive.db.
+
+`flask archive --before YYYY-MM` memindahkan tagihan lunas dengan periode sebelum batas dan pengeluaran
+bertanggal sebelum batas, per batch. Tabel hot tetap kecil untuk pekerjaan harian. Tagihan yang belum
+lunas tidak pernah diarsipkan. Batas disimpan di tabel `setting` (kunci `arsip_sebelum`).
+
+archive.db di-ATTACH sebagai skema `arsip` saat koneksi diambil dari pool (sekali per koneksi, hanya
+jika file arsip ada). Query baca memakai `invoice_source()` / `expense_source()`: hasilnya tabel hot
+biasa, atau UNION ALL dengan tabel arsip hanya jika periode yang diminta mencapai periode terarsip.
+Rekap bulanan (MonthlyRollup) tetap di app.db dan sudah memuat data terarsip, jadi grafik dan total
+laporan tidak perlu menyentuh arsip sama sekali.
+
+Tiap batch disalin dulu ke arsip (commit), baru dihapus dari app.db (commit). Dalam mode WAL transaksi
+lintas database tidak atomik, jadi urutan ini yang menjamin tidak ada data hilang; baris yang terlanjur
+ada di keduanya karena proses terputus (identik di semua kolom) dibersihkan di awal `archive_before()`
+berikutnya. id invoice/expense memakai AUTOINCREMENT sehingga id yang sudah diarsipkan tidak dipakai ulang.
+"""
+import os
+from datetime import datetime
+from flask import current_app, g, has_app_context
+from sqlalchemy import MetaData, Table, Column, Index, event, select, delete, insert, union_all, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app import db, versions
+from app.models import Invoice, Expense, Setting
+from app.periods import parse_period
+
+SCHEMA = 'arsip'
+BOUNDARY_KEY = 'arsip_sebelum'
+BATCH_SIZE = 5000
+_ATTACHED = 'arsip_attached'
+
+
+def _archived_copy(table, metadata):
+    # Kolom sama dengan tabel hot, tanpa foreign key: SQLite tidak mendukung FK lintas database.
+    return Table(table.name, metadata, *[Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable)
+                                         for c in table.columns])
+
+
+metadata = MetaData(schema=SCHEMA)
+invoices = _archived_copy(Invoice.__table__, metadata)
+expenses = _archived_copy(Expense.__table__, metadata)
+Index('ix_arsip_invoice_periode', invoices.c.tahun, invoices.c.bulan)
+Index('ix_arsip_expense_tanggal', expenses.c.tanggal)
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def archive_path(engine, configured=None):
+    """Lokasi archive.db: ARCHIVE_DATABASE, atau di sebelah file database utama (None jika bukan file SQLite)."""
+    if configured:
+        return configured
+    database = engine.url.database
+    if engine.dialect.name != 'sqlite' or not database or database == ':memory:':
+        return None
+    return os.path.join(os.path.dirname(os.path.abspath(database)), 'archive.db')
+
+
+def install(engine, path):
+    """ATTACH archive.db sebagai skema `arsip` di setiap koneksi pool yang belum, selama filenya ada.
+
+    Dipasang di event `checkout` (bukan `connect`) supaya koneksi yang dibuat sebelum arsip pertama
+    ikut ter-ATTACH begitu archive.db muncul; di titik ini belum ada transaksi yang terbuka.
+    """
+    if not path:
+        return
+
+    @event.listens_for(engine, 'checkout')
+    def _attach(dbapi_connection, connection_record, connection_proxy):
+        if not connection_record.info.get(_ATTACHED) and os.path.exists(path):
+            dbapi_connection.execute(f'ATTACH DATABASE ? AS {SCHEMA}', (path,))
+            connection_record.info[_ATTACHED] = True
+
+
+def current_path():
+    return current_app.extensions.get('archive_path')
+
+
+def is_attached(connection):
+    return bool(connection.info.get(_ATTACHED))
+
+
+def boundary():
+    """Periode (tahun, bulan) pertama yang tidak diarsipkan, atau None jika belum pernah ada arsip."""
+    if has_app_context() and 'arsip_sebelum' in g:
+        return g.arsip_sebelum
+    value = db.session.scalar(select(Setting.value).where(Setting.key == BOUNDARY_KEY))
+    hasil = parse_period(value) if value else None
+    if has_app_context():
+        g.arsip_sebelum = hasil
+    return hasil
+
+
+def reaches(awal=None):
+    """True jika data sejak periode `awal` (None = semua periode) sebagian ada di arsip."""
+    batas = boundary()
+    return batas is not None and (awal is None or tuple(awal) < batas)
+
+
+def is_archived(periode):
+    """True jika periode (tahun, bulan) sudah diarsipkan; tagihan baru untuknya tidak boleh dibuat."""
+    batas = boundary()
+    return batas is not None and tuple(periode) < batas
+
+
+def ensure_open(bulan, tahun):
+    """ArchiveError jika periode sudah diarsipkan: tagihan lunasnya ada di arsip, jadi generate akan menggandakannya."""
+    if is_archived((tahun, bulan)):
+        batas = boundary()
+        raise ArchiveError(f"Periode {bulan}/{tahun} sudah diarsipkan (arsip sebelum {batas[1]:02d}/{batas[0]}); "
+                           "tagihan baru tidak bisa dibuat untuknya.")
+
+
+def _source(hot, cold, awal):
+    if not reaches(awal):
+        return hot
+    kolom = [c.name for c in hot.columns]
+    return union_all(select(*[hot.c[k] for k in kolom]), select(*[cold.c[k] for k in kolom])).subquery(hot.name)
+
+
+def invoice_source(awal=None):
+    """Tabel invoice untuk query baca sejak periode `awal` (None = semua periode)."""
+    return _source(Invoice.__table__, invoices, awal)
+
+
+def expense_source(awal=None):
+    """Tabel expense untuk query baca sejak periode `awal` (None = semua periode)."""
+    return _source(Expense.__table__, expenses, awal)
+
+
+def _ensure_archive():
+    """Buat archive.db beserta tabelnya jika belum ada, dan pastikan koneksi session ter-ATTACH."""
+    path = current_path()
+    if not path:
+        raise ArchiveError("Arsip hanya didukung untuk database file SQLite.")
+    db.session.rollback()
+    conn = db.session.connection()
+    if not is_attached(conn):
+        # Koneksi ini diambil sebelum archive.db ada; koneksi berikutnya di-ATTACH oleh event checkout.
+        conn.exec_driver_sql(f'ATTACH DATABASE ? AS {SCHEMA}', (path,))
+        conn.info[_ATTACHED] = True
+    conn.exec_driver_sql(f'PRAGMA {SCHEMA}.journal_mode=WAL')
+    metadata.create_all(conn)
+    db.session.commit()
+
+
+def _set_boundary(batas):
+    value = f"{batas[0]}-{batas[1]:02d}"
+    stmt = sqlite_insert(Setting).values(key=BOUNDARY_KEY, value=value)
+    db.session.execute(stmt.on_conflict_do_update(index_elements=['key'], set_={'value': value}))
+    g.pop('arsip_sebelum', None)
+
+
+def _same_row(hot, cold):
+    """Baris arsip yang identik (semua kolom) dengan baris hot; id saja tidak cukup karena id lama bisa terpakai ulang."""
+    # Alias wajib: tanpa itu `invoice.id` di dalam FROM arsip.invoice merujuk ke tabel arsip sendiri.
+    cold = cold.alias(f'{SCHEMA}_{cold.name}')
+    return select(cold.c.id).where(*[cold.c[c.name].is_not_distinct_from(c) for c in hot.columns]).exists()
+
+
+def _move(hot, cold, kriteria, batch_size, progress):
+    """Pindahkan baris `hot` yang memenuhi `kriteria` ke `cold` per batch; kembalikan (jumlah dipindah, jumlah bentrok).
+
+    Baris yang id-nya sudah dipakai baris lain di arsip (id terpakai ulang sebelum AUTOINCREMENT) tidak
+    disentuh: tetap di tabel hot dan dihitung sebagai bentrok. Baris arsip tidak pernah ditimpa.
+    """
+    kolom = [c.name for c in hot.columns]
+    # Sisa proses yang terputus: sudah tersalin ke arsip tetapi belum terhapus dari tabel hot.
+    db.session.execute(delete(hot).where(*kriteria, _same_row(hot, cold)))
+    db.session.commit()
+    total, bentrok, terakhir = 0, 0, 0
+    while True:
+        ids = db.session.scalars(select(hot.c.id).where(*kriteria, hot.c.id > terakhir).order_by(hot.c.id).limit(batch_size)).all()
+        if not ids:
+            return total, bentrok
+        terakhir = ids[-1]
+        terpakai = set(db.session.scalars(select(cold.c.id).where(cold.c.id.in_(ids))))
+        ids = [i for i in ids if i not in terpakai]
+        bentrok += len(terpakai)
+        if not ids:
+            continue
+        db.session.execute(insert(cold).from_select(kolom, select(*[hot.c[k] for k in kolom]).where(hot.c.id.in_(ids))))
+        db.session.commit()
+        db.session.execute(delete(hot).where(hot.c.id.in_(ids)))
+        db.session.commit()
+        total += len(ids)
+        progress(hot.name, total)
+
+
+def archive_before(before, batch_size=BATCH_SIZE, dry_run=False, progress=None):
+    """Arsipkan tagihan lunas periode < `before` dan pengeluaran bertanggal < `before` ((tahun, bulan)).
+
+    Batas arsip hanya bisa maju. Kembalikan {'tagihan': n, 'pengeluaran': n, 'batas': 'YYYY-MM'}.
+    """
+    progress = progress or (lambda tabel, jumlah: None)
+    before = tuple(before)
+    batas_lama = boundary()
+    batas = max(before, batas_lama) if batas_lama else before
+    mulai = datetime(before[0], before[1], 1)
+    hot_invoice, hot_expense = Invoice.__table__, Expense.__table__
+    kriteria_tagihan = (hot_invoice.c.status == 'Lunas', tuple_(hot_invoice.c.tahun, hot_invoice.c.bulan) < tuple_(*before))
+    kriteria_pengeluaran = (hot_expense.c.tanggal < mulai,)
+    hasil = {'batas': f"{batas[0]}-{batas[1]:02d}"}
+    if dry_run:
+        hasil['tagihan'] = db.session.scalar(select(db.func.count()).select_from(hot_invoice).where(*kriteria_tagihan))
+        hasil['pengeluaran'] = db.session.scalar(select(db.func.count()).select_from(hot_expense).where(*kriteria_pengeluaran))
+        return hasil
+
+    _ensure_archive()
+    # Batas ditulis sebelum baris dipindah: selama pemindahan, laporan sudah membaca arsip + hot.
+    _set_boundary(batas)
+    versions.touch('keuangan')
+    db.session.commit()
+    hasil['tagihan'], bentrok_tagihan = _move(hot_invoice, invoices, kriteria_tagihan, batch_size, progress)
+    hasil['pengeluaran'], bentrok_pengeluaran = _move(hot_expense, expenses, kriteria_pengeluaran, batch_size, progress)
+    hasil['bentrok'] = bentrok_tagihan + bentrok_pengeluaran
+    return hasil
+
+
+def init_app(app):
+    with app.app_context():
+        path = archive_path(db.engine, app.config['ARCHIVE_DATABASE'])
+        install(db.engine, path)
+    app.extensions['archive_path'] = path
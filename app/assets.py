@@ -0,0 +1,179 @@
+"""Aset statis dengan nama ber-hash isi: static/dist/<path>.<hash>.<ext> plus dist/manifest.json.
+
+`flask build-assets` menyalin semua file di static/ (kecuali uploads/ dan dist/) ke dist/ dengan
+potongan sha256 isinya di nama file, lalu membuat varian .gz (dan .br jika modul brotli terpasang,
+opsional). Selama manifest ada, url_for('static', filename='css/style.css') otomatis menunjuk ke nama
+ber-hash, jadi template tidak perlu tahu. File di dist/ tidak pernah berubah isinya, sehingga dilayani
+dengan Cache-Control immutable satu tahun; varian terkompresi dipilih dari header Accept-Encoding.
+Tanpa manifest (belum di-build) atau dalam mode debug, file asli dilayani seperti biasa.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+from flask import current_app, request, send_from_directory
+from werkzeug.security import safe_join
+
+DIST_DIR = 'dist'
+MANIFEST = 'manifest.json'
+SKIP_DIRS = {DIST_DIR, 'uploads'}
+HASH_LENGTH = 10
+# Gambar dan font sudah terkompresi; gzip hanya membuang CPU untuknya.
+COMPRESSIBLE = {'.css', '.js', '.svg', '.json', '.txt', '.map'}
+MIN_COMPRESS_SIZE = 1024
+ONE_YEAR = 365 * 24 * 3600
+IMMUTABLE = f'public, max-age={ONE_YEAR}, immutable'
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+_CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def _sources(static_folder):
+    """Path relatif (pemisah '/') semua aset sumber; CSS paling akhir karena url() di dalamnya ditulis ulang.
+    File tanpa ekstensi (LICENSE, README) bukan aset dan dilewati."""
+    paths = []
+    for root, dirs, files in os.walk(static_folder):
+        rel_root = os.path.relpath(root, static_folder)
+        if rel_root == '.':
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in files:
+            if not name.startswith('.') and posixpath.splitext(name)[1]:
+                paths.append(posixpath.normpath(posixpath.join(rel_root.replace(os.sep, '/'), name)))
+    return sorted(paths, key=lambda p: (p.endswith('.css'), p))
+
+
+def _rewrite_css(data, path, manifest):
+    """Ganti url(relatif) di CSS dengan nama ber-hash, relatif terhadap lokasi CSS di dist/."""
+    folder = posixpath.dirname(path)
+    hashed_folder = posixpath.dirname(posixpath.join(DIST_DIR, path))
+
+    def ganti(match):
+        quote, url = match.groups()
+        if url.startswith(('data:', '#', '/')) or '://' in url:
+            return match.group(0)
+        target, sep, suffix = _split_suffix(url)
+        hashed = manifest.get(posixpath.normpath(posixpath.join(folder, target)))
+        if not hashed:
+            return match.group(0)
+        return f'url({quote}{posixpath.relpath(hashed, hashed_folder)}{sep}{suffix}{quote})'
+
+    return _CSS_URL.sub(ganti, data.decode('utf-8')).encode('utf-8')
+
+
+def _split_suffix(url):
+    """'font.woff2?v=1#x' -> ('font.woff2', '?', 'v=1#x')."""
+    match = re.search(r'[?#]', url)
+    if not match:
+        return url, '', ''
+    return url[:match.start()], url[match.start()], url[match.start() + 1:]
+
+
+def _write(path, data):
+    if os.path.exists(path):
+        return False  # nama ber-hash: isi sudah pasti sama
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'wb') as f:
+        f.write(data)
+    os.replace(path + '.tmp', path)
+    return True
+
+
+def _compressors():
+    compressors = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    try:
+        import brotli
+    except ImportError:
+        return compressors
+    return [('.br', lambda data: brotli.compress(data, quality=11))] + compressors
+
+
+def build(static_folder, clean=False):
+    """Bangun dist/ dan manifest. Kembalikan ringkasan {'aset', 'ditulis', 'dihapus', 'varian'}."""
+    dist = os.path.join(static_folder, DIST_DIR)
+    compressors = _compressors()
+    manifest, outputs = {}, {MANIFEST}
+    ditulis = 0
+    for path in _sources(static_folder):
+        with open(os.path.join(static_folder, path), 'rb') as f:
+            data = f.read()
+        if path.endswith('.css'):
+            data = _rewrite_css(data, path, manifest)
+        base, ext = posixpath.splitext(path)
+        hashed = f'{base}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}'
+        manifest[path] = posixpath.join(DIST_DIR, hashed)
+        outputs.add(hashed)
+        ditulis += _write(os.path.join(dist, hashed), data)
+        if ext.lower() in COMPRESSIBLE and len(data) >= MIN_COMPRESS_SIZE:
+            for suffix, compress in compressors:
+                target = os.path.join(dist, hashed + suffix)
+                if os.path.exists(target):
+                    outputs.add(hashed + suffix)
+                    continue
+                packed = compress(data)
+                if len(packed) < len(data):
+                    _write(target, packed)
+                    outputs.add(hashed + suffix)
+
+    os.makedirs(dist, exist_ok=True)
+    with open(os.path.join(dist, MANIFEST + '.tmp'), 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(os.path.join(dist, MANIFEST + '.tmp'), os.path.join(dist, MANIFEST))
+
+    # File build lama dibiarkan secara bawaan: halaman yang masih terbuka di browser tetap memuatnya.
+    dihapus = 0
+    if clean:
+        for root, _, files in os.walk(dist):
+            for name in files:
+                rel = os.path.relpath(os.path.join(root, name), dist).replace(os.sep, '/')
+                if rel not in outputs:
+                    os.remove(os.path.join(root, name))
+                    dihapus += 1
+    return {'aset': len(manifest), 'ditulis': ditulis, 'dihapus': dihapus,
+            'varian': [suffix for suffix, _ in compressors]}
+
+
+def load_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, DIST_DIR, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def send_static(filename):
+    """Pengganti view `static`: file ber-hash dilayani immutable, memakai varian .br/.gz bila bisa."""
+    if not filename.startswith(DIST_DIR + '/'):
+        return current_app.send_static_file(filename)
+    folder = current_app.static_folder
+    for encoding, suffix in ENCODINGS:
+        if request.accept_encodings[encoding]:
+            path = safe_join(folder, filename + suffix)
+            if path and os.path.isfile(path):
+                mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                response = send_from_directory(folder, filename + suffix, mimetype=mimetype, max_age=ONE_YEAR)
+                response.headers['Content-Encoding'] = encoding
+                break
+    else:
+        response = send_from_directory(folder, filename, max_age=ONE_YEAR)
+    response.headers['Cache-Control'] = IMMUTABLE
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def init_app(app):
+    manifest = {} if app.debug else load_manifest(app.static_folder)
+    app.extensions['assets_manifest'] = manifest
+    app.view_functions['static'] = send_static
+    if not manifest:
+        return
+
+    @app.url_defaults
+    def hashed_static_url(endpoint, values):
+        if endpoint == 'static':
+            hashed = manifest.get(values.get('filename'))
+            if hashed:
+                values['filename'] = hashed
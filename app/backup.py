@@ -0,0 +1,304 @@
+"""Backup online database SQLite dan nota pembayaran ke BACKUP_DIR (bawaan instance/backups).
+
+Database disalin dengan backup API SQLite per BACKUP_PAGES halaman di dalam satu transaksi baca. Dalam
+mode WAL transaksi baca tidak menghalangi penulis, dan salinannya tetap satu snapshot konsisten (tanpa
+transaksi itu, setiap tulisan dari koneksi lain membuat backup API mengulang dari awal). Server tidak
+perlu dihentikan. Salinan diperiksa (quick_check) lalu disimpan terkompresi sebagai wisp-<waktu UTC>.db.gz
+dengan manifest JSON di sebelahnya.
+
+Nota disimpan per isi di receipts/<sha256>: file yang isinya sudah pernah di-backup tidak disalin ulang,
+dan file yang ukuran serta mtime-nya sama dengan backup sebelumnya tidak dibaca ulang. Manifest mencatat
+path -> hash setiap file, sehingga `restore()` bisa mengembalikan nota persis seperti saat backup.
+Hanya BACKUP_KEEP backup terbaru yang disimpan; isi nota yang tidak lagi dipakai backup mana pun dihapus.
+Jika archive.db (app/archive.py) ada, file itu ikut disalin dengan cara yang sama ke wisp-<waktu>.arsip.db.gz.
+"""
+import fcntl
+import glob
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from app import archive, db, jobs, receipts
+from app.models import DataVersion
+
+PREFIX = 'wisp-'
+OBJECTS = 'receipts'
+CHUNK_SIZE = 1024 * 1024
+STEP_SLEEP = 0.05  # detik tunggu sebelum langkah backup API diulang saat database sibuk/terkunci
+CHECK_INTERVAL = 60
+
+_next_check = 0.0
+
+
+class BackupError(Exception):
+    pass
+
+
+def backup_dir():
+    return current_app.config['BACKUP_DIR']
+
+
+def database_path():
+    url = db.engine.url
+    if url.get_backend_name() != 'sqlite' or not url.database or url.database == ':memory:':
+        raise BackupError("Backup hanya mendukung database file SQLite.")
+    return url.database
+
+
+@contextmanager
+def _locked(folder, wait=True):
+    """Kunci file lintas proses supaya backup/restore tidak berjalan bersamaan (CLI, worker, jadwal)."""
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, '.lock'), 'w') as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+        except BlockingIOError:
+            raise BackupError("Backup atau restore lain sedang berjalan.")
+        yield
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def list_backups(folder=None):
+    """Manifest semua backup, terbaru dulu."""
+    hasil = []
+    for path in glob.glob(os.path.join(folder or backup_dir(), PREFIX + '*.json')):
+        try:
+            with open(path) as f:
+                hasil.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # manifest setengah jadi dari backup yang terputus
+    return sorted(hasil, key=lambda m: m['nama'], reverse=True)
+
+
+def _copy_database(target, path=None):
+    """Salin database live (atau file SQLite `path`) ke `target` lewat backup API, bertahap; kembalikan jumlah halaman."""
+    pages = current_app.config['BACKUP_PAGES']
+    dest = sqlite3.connect(target)
+    raw = db.engine.raw_connection() if path is None else sqlite3.connect(path)
+    try:
+        source = raw.driver_connection if path is None else raw
+        source.execute('BEGIN')
+        source.execute('SELECT count(*) FROM sqlite_master').fetchone()  # BEGIN baru mengambil snapshot di baca pertama
+        try:
+            source.backup(dest, pages=pages, sleep=STEP_SLEEP)
+        finally:
+            source.rollback()
+        hasil = dest.execute('PRAGMA quick_check').fetchone()[0]
+        if hasil != 'ok':
+            raise BackupError(f"Salinan database rusak: {hasil}")
+        return dest.execute('PRAGMA page_count').fetchone()[0]
+    finally:
+        raw.close()
+        dest.close()
+
+
+def _save_database(folder, berkas, path=None):
+    """Salin database ke folder/berkas (gzip). Kembalikan info untuk manifest."""
+    tmp = os.path.join(folder, berkas + '.tmp.db')
+    try:
+        halaman = _copy_database(tmp, path)
+        ukuran = os.path.getsize(tmp)
+        sha = _sha256(tmp)
+        with open(tmp, 'rb') as src, gzip.open(os.path.join(folder, berkas + '.tmp'), 'wb', compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    os.replace(os.path.join(folder, berkas + '.tmp'), os.path.join(folder, berkas))
+    return {'sha256': sha, 'ukuran': ukuran, 'halaman': halaman, 'ukuran_gz': os.path.getsize(os.path.join(folder, berkas))}
+
+
+def _load_database(folder, info, berkas, dest):
+    """Tulis ulang database `dest` (koneksi sqlite3) dari backup folder/berkas setelah checksum dicocokkan."""
+    tmp = os.path.join(folder, berkas + '.restore.tmp')
+    try:
+        with gzip.open(os.path.join(folder, berkas), 'rb') as src, open(tmp, 'wb') as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        if _sha256(tmp) != info['sha256']:
+            raise BackupError(f"Checksum {berkas} tidak cocok; berkas backup rusak.")
+        src = sqlite3.connect(tmp)
+        try:
+            src.backup(dest, pages=current_app.config['BACKUP_PAGES'], sleep=STEP_SLEEP)
+        finally:
+            src.close()
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _snapshot_receipts(folder, previous):
+    """Simpan nota yang belum ada di receipts/<sha256>. Kembalikan ({path: info}, jumlah berkas baru)."""
+    root, objects = receipts.upload_root(), os.path.join(folder, OBJECTS)
+    lama = previous.get('nota', {}) if previous else {}
+    nota, baru = {}, 0
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(dirpath, name)
+            rel = os.path.relpath(path, root).replace(os.sep, '/')
+            st = os.stat(path)
+            info = lama.get(rel)
+            if not (info and info['ukuran'] == st.st_size and info['mtime'] == st.st_mtime_ns
+                    and os.path.exists(os.path.join(objects, info['sha256']))):
+                info = {'sha256': _sha256(path), 'ukuran': st.st_size, 'mtime': st.st_mtime_ns}
+            target = os.path.join(objects, info['sha256'])
+            if not os.path.exists(target):
+                os.makedirs(objects, exist_ok=True)
+                shutil.copyfile(path, target + '.tmp')
+                os.replace(target + '.tmp', target)
+                baru += 1
+            nota[rel] = info
+    return nota, baru
+
+
+def _prune(folder, keep):
+    """Hapus backup di luar `keep` terbaru dan isi nota yang tidak dirujuk backup tersisa."""
+    semua = list_backups(folder)
+    dihapus = 0
+    for manifest in semua[keep:]:
+        arsip = [manifest['arsip']['berkas']] if manifest.get('arsip') else []
+        for name in [manifest['berkas'], *arsip, manifest['nama'] + '.json']:
+            try:
+                os.remove(os.path.join(folder, name))
+            except FileNotFoundError:
+                pass
+        dihapus += 1
+    dipakai = {info['sha256'] for manifest in semua[:keep] for info in manifest['nota'].values()}
+    objects = os.path.join(folder, OBJECTS)
+    if os.path.isdir(objects):
+        for name in os.listdir(objects):
+            if name not in dipakai:
+                os.remove(os.path.join(objects, name))
+    return dihapus
+
+
+def _last_backup_time(folder):
+    return max((os.path.getmtime(p) for p in glob.glob(os.path.join(folder, PREFIX + '*.json'))), default=0)
+
+
+def backup(keep=None, min_interval=None):
+    """Buat satu backup lengkap. Kembalikan manifest-nya (ditambah 'dihapus': backup lama yang dibuang).
+
+    Dengan `min_interval` (detik), kembalikan None tanpa backup jika backup terakhir belum setua itu;
+    diperiksa di dalam kunci supaya beberapa worker yang terjadwal bersamaan hanya membuat satu backup.
+    """
+    folder = backup_dir()
+    keep = keep or current_app.config['BACKUP_KEEP']
+    database_path()
+    with _locked(folder, wait=False):
+        if min_interval and time.time() - _last_backup_time(folder) < min_interval:
+            return None
+        start = time.perf_counter()
+        sebelumnya = next(iter(list_backups(folder)), None)
+        nama = PREFIX + datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+        if os.path.exists(os.path.join(folder, nama + '.json')):
+            nama += '-' + str(os.getpid())
+        database = _save_database(folder, nama + '.db.gz')
+        arsip = None
+        path_arsip = archive.current_path()
+        if path_arsip and os.path.exists(path_arsip):
+            arsip = dict(_save_database(folder, nama + '.arsip.db.gz', path_arsip), berkas=nama + '.arsip.db.gz')
+
+        nota, nota_baru = _snapshot_receipts(folder, sebelumnya)
+        manifest = {'nama': nama, 'berkas': nama + '.db.gz', 'dibuat': datetime.utcnow().isoformat(timespec='seconds'),
+                    'database': database, 'arsip': arsip,
+                    'nota': nota, 'nota_baru': nota_baru, 'detik': round(time.perf_counter() - start, 2)}
+        # Manifest ditulis terakhir: backup tanpa manifest dianggap tidak ada.
+        with open(os.path.join(folder, nama + '.json.tmp'), 'w') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(os.path.join(folder, nama + '.json.tmp'), os.path.join(folder, nama + '.json'))
+        manifest['dihapus'] = _prune(folder, keep)
+    return manifest
+
+
+def restore(nama=None):
+    """Kembalikan database dan nota dari backup `nama` (bawaan: terbaru). Kembalikan manifest-nya.
+
+    Database ditulis ulang lewat backup API ke file live, jadi koneksi lain langsung melihat isi lama;
+    archive.db juga, jika backup memuatnya.
+    Versi data dinaikkan melewati nilai sebelum restore supaya cache per proses tidak memakai isi lama.
+    Nota yang ada di backup dikembalikan; nota lain di folder uploads dibiarkan.
+    """
+    folder = backup_dir()
+    database_path()
+    with _locked(folder):
+        semua = list_backups(folder)
+        manifest = next((m for m in semua if m['nama'] == nama), None) if nama else next(iter(semua), None)
+        if manifest is None:
+            raise BackupError(f"Backup {nama} tidak ditemukan." if nama else "Belum ada backup.")
+        versi_lama = dict(db.session.execute(select(DataVersion.nama, DataVersion.versi)).all())
+        db.session.rollback()
+        raw = db.engine.raw_connection()
+        try:
+            _load_database(folder, manifest['database'], manifest['berkas'], raw.driver_connection)
+        finally:
+            raw.close()
+        path_arsip = archive.current_path()
+        if manifest.get('arsip') and path_arsip:
+            dest = sqlite3.connect(path_arsip)
+            try:
+                _load_database(folder, manifest['arsip'], manifest['arsip']['berkas'], dest)
+            finally:
+                dest.close()
+
+        db.session.expire_all()
+        versi_baru = dict(db.session.execute(select(DataVersion.nama, DataVersion.versi)).all())
+        naik = [{'nama': name, 'versi': max(versi_lama.get(name, 0), versi_baru.get(name, 0)) + 1}
+                for name in sorted(set(versi_lama) | set(versi_baru))]
+        if naik:
+            stmt = insert(DataVersion).values(naik)
+            db.session.execute(stmt.on_conflict_do_update(index_elements=['nama'], set_={'versi': stmt.excluded.versi}))
+        db.session.commit()
+
+        root, objects = receipts.upload_root(), os.path.join(folder, OBJECTS)
+        dipulihkan = 0
+        for rel, info in manifest['nota'].items():
+            path = os.path.join(root, rel)
+            if os.path.exists(path) and os.path.getsize(path) == info['ukuran'] and _sha256(path) == info['sha256']:
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            shutil.copyfile(os.path.join(objects, info['sha256']), path + '.tmp')
+            os.replace(path + '.tmp', path)
+            dipulihkan += 1
+    return dict(manifest, nota_dipulihkan=dipulihkan)
+
+
+def _scheduled_backup(interval):
+    try:
+        manifest = backup(min_interval=interval)
+    except BackupError as e:
+        current_app.logger.info("Backup terjadwal dilewati: %s", e)
+        return
+    if manifest:
+        current_app.logger.info("Backup terjadwal %s selesai dalam %s detik", manifest['nama'], manifest['detik'])
+
+
+def _maybe_schedule():
+    """Paling sering tiap CHECK_INTERVAL detik: jalankan backup di thread job jika backup terakhir sudah terlalu lama."""
+    global _next_check
+    now = time.monotonic()
+    if now < _next_check:
+        return
+    _next_check = now + CHECK_INTERVAL
+    interval = current_app.config['BACKUP_INTERVAL_HOURS'] * 3600
+    if time.time() - _last_backup_time(backup_dir()) >= interval:
+        jobs.submit(_scheduled_backup, interval)
+
+
+def init_app(app):
+    if app.config['BACKUP_INTERVAL_HOURS'] > 0:
+        app.before_request(_maybe_schedule)
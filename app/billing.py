@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, select, insert, update, delete, literal
+from app import db, receipts, rollups, versions
+from app.models import Customer, ServicePackage, Invoice
+
+
+def billable_select(bulan, tahun):
+    """Pelanggan aktif berpaket yang belum punya tagihan untuk periode (bulan, tahun)."""
+    # func.date(tanggal_bergabung) <= tanggal 1 periode, ditulis sebagai range agar index customer terpakai
+    batas_bergabung = datetime(tahun, bulan, 1) + timedelta(days=1)
+    sudah_ditagih = select(Invoice.id).where(Invoice.customer_id == Customer.id, Invoice.bulan == bulan, Invoice.tahun == tahun)
+    return (select(Customer.id.label('customer_id'), ServicePackage.harga.label('jumlah'))
+            .join(ServicePackage, Customer.package_id == ServicePackage.id)
+            .where(Customer.status == 'Aktif',
+                   Customer.tanggal_bergabung < batas_bergabung,
+                   ~sudah_ditagih.exists()))
+
+
+def build_invoice_insert(bulan, tahun, now=None):
+    """INSERT ... SELECT satu periode penuh. OR IGNORE + unique constraint membuat re-run aman."""
+    now = now or datetime.utcnow()
+    calon = billable_select(bulan, tahun).subquery()
+    rows = select(calon.c.customer_id, literal(bulan), literal(tahun), calon.c.jumlah, literal('Belum Lunas'), literal(now))
+    cols = ['customer_id', 'bulan', 'tahun', 'jumlah', 'status', 'tanggal_buat']
+    return insert(Invoice).from_select(cols, rows).prefix_with('OR IGNORE', dialect='sqlite')
+
+
+def preview_period(bulan, tahun, bind=None):
+    """Hitung jumlah dan total tagihan yang akan dibuat tanpa menulis apa pun."""
+    bind = bind if bind is not None else db.session
+    calon = billable_select(bulan, tahun).subquery()
+    count, total = bind.execute(select(func.count(), func.coalesce(func.sum(calon.c.jumlah), 0))).one()
+    return {'tagihan_baru': count, 'total_tagihan': total}
+
+
+def generate_period(bulan, tahun, dry_run=False, bind=None):
+    """Buat semua tagihan periode (bulan, tahun) dalam satu statement.
+
+    `bind` boleh Session atau Connection; default db.session. Commit diserahkan ke pemanggil.
+    """
+    if dry_run:
+        return preview_period(bulan, tahun, bind)
+    bind = bind if bind is not None else db.session
+    result = bind.execute(build_invoice_insert(bulan, tahun))
+    return {'tagihan_baru': result.rowcount}
+
+
+def pay_invoices(ids, tanggal_lunas):
+    """Tandai banyak tagihan lunas dengan satu UPDATE ... RETURNING dan perbarui rekapnya.
+
+    Kembalikan (id yang dilunasi, daftar {'id', 'alasan'} yang gagal). Commit diserahkan ke pemanggil.
+    """
+    paid = db.session.execute(update(Invoice)
+                              .where(Invoice.id.in_(ids), Invoice.status != 'Lunas')
+                              .values(status='Lunas', tanggal_lunas=tanggal_lunas)
+                              .returning(Invoice.id, Invoice.tahun, Invoice.bulan, Invoice.jumlah)
+                              .execution_options(synchronize_session=False)).all()
+    rollups.mark_paid_many((row.tahun, row.bulan, row.jumlah) for row in paid)
+    lunas = [row.id for row in paid]
+    sisa = set(ids) - set(lunas)
+    gagal = []
+    if sisa:
+        ada = set(db.session.scalars(select(Invoice.id).where(Invoice.id.in_(sisa))))
+        gagal = [{'id': i, 'alasan': 'Sudah lunas' if i in ada else 'Tagihan tidak ditemukan'} for i in ids if i in sisa]
+    return lunas, gagal
+
+
+def delete_customers(ids):
+    """Hapus pelanggan `ids` beserta tagihannya dengan jumlah statement tetap, berapa pun banyaknya.
+
+    Rekap dikurangi per periode dan referensi nota dilepas lebih dulu; tagihan lalu ikut terhapus oleh
+    ON DELETE CASCADE di database. File nota yang tidak dipakai lagi dihapus receipts setelah commit.
+    Kembalikan jumlah pelanggan yang dihapus. Commit diserahkan ke pemanggil.
+    """
+    if not ids:
+        return 0
+    milik = Invoice.customer_id.in_(ids)
+    rollups.remove_invoices(milik)
+    receipts.release_all(milik)
+    result = db.session.execute(delete(Customer).where(Customer.id.in_(ids)).execution_options(synchronize_session=False))
+    versions.touch('pelanggan')
+    return result.rowcount
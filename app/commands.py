@@ -0,0 +1,224 @@
+"""Perintah CLI `flask ...`. Modul layanan diimpor di dalam perintah supaya perintah lain tetap cepat dimulai."""
+import click
+from app import db, bcrypt
+from app.models import User
+
+
+@click.command("create-user")
+@click.argument("username")
+@click.argument("email")
+@click.argument("password")
+def create_user(username, email, password):
+    """Membuat user admin baru."""
+    if User.query.filter_by(email=email).first():
+        print(f"Error: Email '{email}' sudah terdaftar.")
+        return
+    if User.query.filter_by(username=username).first():
+        print(f"Error: Username '{username}' sudah terdaftar.")
+        return
+
+    hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+    user = User(username=username, email=email, password=hashed_password)
+    db.session.add(user)
+    db.session.commit()
+    print(f"User '{username}' berhasil dibuat.")
+
+
+@click.command("set-password")
+@click.argument("email")
+@click.argument("password")
+def set_password(email, password):
+    """Ganti password user dan keluarkan semua sesi yang sedang login."""
+    from app.identity import set_password as ganti_password
+    user = User.query.filter_by(email=email).first()
+    if not user:
+        print(f"Error: Email '{email}' tidak ditemukan.")
+        return
+    ganti_password(user, bcrypt.generate_password_hash(password).decode('utf-8'))
+    db.session.commit()
+    print(f"Password '{user.username}' berhasil diganti; semua sesi lama tidak berlaku lagi.")
+
+
+@click.command("db-optimize")
+@click.option("--no-checkpoint", is_flag=True, help="Lewati checkpoint WAL.")
+def db_optimize(no_checkpoint):
+    """PRAGMA optimize + checkpoint WAL. Jalankan berkala (mis. cron tiap jam)."""
+    from app.sqlite_setup import optimize
+    with db.engine.connect() as conn:
+        mode = conn.exec_driver_sql('PRAGMA journal_mode').scalar()
+        hasil = optimize(conn, checkpoint=not no_checkpoint and mode == 'wal')
+    print(f"journal_mode={mode}; PRAGMA optimize selesai." + (f" Checkpoint: {hasil[2]} dari {hasil[1]} halaman WAL." if hasil else ""))
+
+
+@click.command("check-query-plans")
+@click.option("--bulan", type=int, default=1)
+@click.option("--tahun", type=int, default=2025)
+def check_query_plans(bulan, tahun):
+    """Gagal (exit 1) jika ada query laporan yang jatuh ke full table scan."""
+    from app import archive
+    from app.reports import report_queries, full_scans
+    from app.billing import billable_select
+    gagal = False
+    with db.engine.connect() as conn:
+        queries = report_queries(bulan, tahun, arsip=archive.is_attached(conn))
+        queries['generate_tagihan'] = billable_select(bulan, tahun)
+        for name, stmt in queries.items():
+            scans = full_scans(conn, stmt)
+            print(f"{'SCAN' if scans else 'OK  '} {name}" + (f": {'; '.join(scans)}" if scans else ''))
+            gagal = gagal or bool(scans)
+    if gagal:
+        raise SystemExit(1)
+
+
+@click.command("rebuild-rollups")
+@click.option("--check", is_flag=True, help="Hanya periksa selisih, jangan tulis ulang.")
+def rebuild_rollups(check):
+    """Hitung ulang rekap bulanan dari tabel invoice & expense dan laporkan selisihnya."""
+    from app import rollups
+    drift = rollups.find_drift()
+    for line in drift:
+        print(f"Selisih: {line}")
+    if check:
+        print("Rekap sesuai dengan data." if not drift else f"{len(drift)} selisih ditemukan.")
+        if drift:
+            raise SystemExit(1)
+        return
+    rollups.rebuild()
+    db.session.commit()
+    print(f"Rekap bulanan dibangun ulang ({len(drift)} selisih diperbaiki).")
+
+
+@click.command("import-payments")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--dry-run", is_flag=True, help="Cocokkan saja, jangan simpan.")
+def import_payments_command(path, dry_run):
+    """Cocokkan mutasi bank (CSV/XLSX) ke tagihan yang belum lunas dan tandai lunas."""
+    from app.importer import import_payments
+    hasil = import_payments(path, dry_run=dry_run)
+    for e in hasil['kesalahan']:
+        print(f"Baris {e['baris']}: {e['alasan']}")
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+    print(f"{hasil['baris']} baris dibaca, {hasil['berhasil']} pembayaran cocok (Rp {hasil['total']:,.0f}), {hasil['gagal']} gagal."
+          + (" (dry run, tidak disimpan)" if dry_run else ""))
+
+
+@click.command("import-customers")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--dry-run", is_flag=True, help="Periksa saja, jangan simpan.")
+def import_customers_command(path, dry_run):
+    """Tambah/perbarui pelanggan dari CSV/XLSX berdasarkan nomor telepon."""
+    from app.importer import import_customers
+    hasil = import_customers(path, dry_run=dry_run)
+    for e in hasil['kesalahan']:
+        print(f"Baris {e['baris']}: {e['alasan']}")
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+    print(f"{hasil['baris']} baris dibaca, {hasil['baru']} pelanggan baru, {hasil['diperbarui']} diperbarui, {hasil['gagal']} gagal."
+          + (" (dry run, tidak disimpan)" if dry_run else ""))
+
+
+@click.command("seed-synthetic")
+@click.option("--customers", type=int, default=1000, show_default=True, help="Jumlah pelanggan.")
+@click.option("--years", type=int, default=2, show_default=True, help="Lama riwayat tagihan dan pengeluaran, sampai bulan ini.")
+@click.option("--seed", type=int, default=42, show_default=True, help="Seed acak; nilai sama menghasilkan data sama.")
+@click.option("--append", is_flag=True, help="Tetap tambahkan walaupun database sudah berisi pelanggan.")
+def seed_synthetic(customers, years, seed, append):
+    """Isi database dengan data WISP sintetis untuk benchmark. Jangan dijalankan di database produksi."""
+    import time
+    from app import synthetic
+    from app.models import Customer
+    if not append and Customer.query.first():
+        print("Error: database sudah berisi pelanggan. Pakai --append untuk tetap menambahkan data sintetis.")
+        return
+    start = time.perf_counter()
+    hasil = synthetic.seed(customers, years, seed=seed)
+    db.session.commit()
+    print(f"{hasil['pelanggan']} pelanggan, {hasil['tagihan']} tagihan, {hasil['pengeluaran']} pengeluaran "
+          f"({hasil['periode']}) dibuat dalam {time.perf_counter() - start:.1f} detik.")
+
+
+@click.command("build-assets")
+@click.option("--clean", is_flag=True, help="Hapus file build lama di static/dist yang tidak ada di manifest baru.")
+def build_assets(clean):
+    """Buat salinan aset statis ber-hash isi beserta varian .gz/.br dan manifest.json."""
+    from flask import current_app
+    from app import assets
+    hasil = assets.build(current_app.static_folder, clean=clean)
+    print(f"{hasil['aset']} aset di manifest, {hasil['ditulis']} file baru, {hasil['dihapus']} file lama dihapus "
+          f"(kompresi: {', '.join(hasil['varian'])}). Jalankan ulang server (gunicorn: USR2 lalu QUIT) agar manifest baru dipakai.")
+
+
+@click.command("backup")
+@click.option("--keep", type=int, help="Jumlah backup terbaru yang disimpan (bawaan BACKUP_KEEP).")
+@click.option("--list", "daftar", is_flag=True, help="Tampilkan backup yang ada tanpa membuat backup baru.")
+def backup_command(keep, daftar):
+    """Backup online database dan nota ke BACKUP_DIR, tanpa menghentikan server."""
+    from app import backup
+    if daftar:
+        for m in backup.list_backups():
+            print(f"{m['nama']}  {m['dibuat']}  db {m['database']['ukuran_gz'] / 1e6:.1f} MB (gz), {len(m['nota'])} nota")
+        return
+    try:
+        m = backup.backup(keep=keep)
+    except backup.BackupError as e:
+        raise SystemExit(f"Error: {e}")
+    print(f"Backup {m['berkas']} selesai dalam {m['detik']} detik: database {m['database']['ukuran'] / 1e6:.1f} MB "
+          f"-> {m['database']['ukuran_gz'] / 1e6:.1f} MB, {len(m['nota'])} nota ({m['nota_baru']} berkas baru), "
+          f"{m['dihapus']} backup lama dihapus.")
+
+
+@click.command("restore")
+@click.argument("nama", required=False)
+@click.option("--yes", is_flag=True, help="Jangan minta konfirmasi.")
+def restore_command(nama, yes):
+    """Kembalikan database dan nota dari backup NAMA (bawaan: terbaru). Lihat `flask backup --list`."""
+    from app import backup
+    if not yes:
+        click.confirm(f"Isi database sekarang akan diganti dengan backup {nama or 'terbaru'}. Lanjutkan?", abort=True)
+    try:
+        m = backup.restore(nama)
+    except backup.BackupError as e:
+        raise SystemExit(f"Error: {e}")
+    print(f"Database dikembalikan ke {m['nama']} ({m['dibuat']} UTC), {m['nota_dipulihkan']} nota dipulihkan.")
+
+
+@click.command("archive")
+@click.option("--before", "before", required=True, help="Periode YYYY-MM; data sebelum periode ini diarsipkan.")
+@click.option("--batch-size", type=int, default=None, help="Jumlah baris per batch (bawaan 5000).")
+@click.option("--dry-run", is_flag=True, help="Hanya hitung baris yang akan dipindah.")
+def archive_command(before, batch_size, dry_run):
+    """Pindahkan tagihan lunas dan pengeluaran sebelum periode BEFORE dari app.db ke archive.db."""
+    from app import archive
+    from app.periods import parse_period
+    try:
+        periode = parse_period(before)
+    except ValueError:
+        raise SystemExit("Error: --before harus berformat YYYY-MM.")
+    try:
+        hasil = archive.archive_before(periode, batch_size=batch_size or archive.BATCH_SIZE, dry_run=dry_run,
+                                       progress=lambda tabel, jumlah: print(f"  {tabel}: {jumlah} baris dipindah"))
+    except archive.ArchiveError as e:
+        raise SystemExit(f"Error: {e}")
+    if dry_run:
+        print(f"Dry run: {hasil['tagihan']} tagihan lunas dan {hasil['pengeluaran']} pengeluaran akan diarsipkan.")
+        return
+    print(f"{hasil['tagihan']} tagihan lunas dan {hasil['pengeluaran']} pengeluaran dipindah ke {archive.current_path()}. "
+          f"Periode sebelum {hasil['batas']} sekarang terarsip.")
+    if hasil['bentrok']:
+        print(f"Peringatan: {hasil['bentrok']} baris tidak dipindah karena id-nya sudah dipakai baris lain di arsip; "
+              "baris tersebut tetap di app.db.")
+
+
+COMMANDS = [create_user, set_password, db_optimize, check_query_plans, rebuild_rollups,
+            import_payments_command, import_customers_command, seed_synthetic, build_assets,
+            backup_command, restore_command, archive_command]
+
+
+def init_app(app):
+    for command in COMMANDS:
+        app.cli.add_command(command)
@@ -0,0 +1,45 @@
+"""Konfigurasi aplikasi dan server. Setiap nilai bisa diganti lewat environment dengan nama yang sama."""
+import os
+from app import sqlite_setup
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+
+
+def _int(name, default):
+    return int(os.environ.get(name) or default)
+
+
+class Config:
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'kunci-rahasia-yang-sangat-sulit-ditebak-sekali')
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///' + os.path.join(basedir, 'app.db'))
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLITE_PRAGMAS = sqlite_setup.pragmas_from_env()
+
+    # archive.db untuk tagihan lunas dan pengeluaran lama (`flask archive`). Kosong = di folder yang sama dengan app.db.
+    ARCHIVE_DATABASE = os.environ.get('ARCHIVE_DATABASE') or None
+
+    JOB_WORKERS = _int('JOB_WORKERS', 2)
+    AUTH_CACHE_TTL = _int('AUTH_CACHE_TTL', 60)
+    QUERY_COUNTER = os.environ.get('QUERY_COUNTER', '1') != '0'
+
+    # Metrik Prometheus di /metrics (lihat app/instrumentation.py). Tanpa METRICS_TOKEN hanya user
+    # yang login yang bisa membukanya; scraper memakai header "Authorization: Bearer <token>".
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '0') == '1'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN') or None
+    METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(os.path.dirname(basedir), 'instance', 'metrics'))
+    METRICS_FLUSH_SECONDS = _int('METRICS_FLUSH_SECONDS', 5)
+    SLOW_QUERY_MS = _int('SLOW_QUERY_MS', 250)
+
+    # Backup online database + nota (app/backup.py, `flask backup` / `flask restore`). BACKUP_INTERVAL_HOURS > 0
+    # menjalankan backup otomatis di thread job saat ada request dan backup terakhir sudah setua itu.
+    BACKUP_DIR = os.environ.get('BACKUP_DIR', os.path.join(os.path.dirname(basedir), 'instance', 'backups'))
+    BACKUP_KEEP = _int('BACKUP_KEEP', 14)
+    BACKUP_INTERVAL_HOURS = _int('BACKUP_INTERVAL_HOURS', 0)
+    BACKUP_PAGES = _int('BACKUP_PAGES', 256)
+
+    # Server produksi (gunicorn.conf.py). SQLite hanya punya satu penulis, jadi worker tidak perlu
+    # banyak; thread per worker menutup waktu tunggu I/O (unggah nota, unduh export).
+    WEB_BIND = os.environ.get('WEB_BIND', '0.0.0.0:5000')
+    WEB_WORKERS = _int('WEB_WORKERS', min(2 * (os.cpu_count() or 1) + 1, 5))
+    WEB_THREADS = _int('WEB_THREADS', 4)
+    WEB_TIMEOUT = _int('WEB_TIMEOUT', 120)
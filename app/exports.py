@@ -0,0 +1,144 @@
+"""Export laporan keuangan (XLSX/CSV) untuk satu atau beberapa periode dengan memori datar.
+
+Baris dibangkitkan satu per satu dari query `yield_per`, lalu ditulis ke workbook write-only
+(file sementara) atau langsung di-stream sebagai CSV.
+"""
+import csv
+import io
+import tempfile
+from datetime import datetime
+from sqlalchemy import select, tuple_
+from app import archive, db, rollups
+from app.models import Customer
+from app.periods import period_range
+from app.reports import SHARE_COLUMNS
+
+BATCH_SIZE = 1000
+CHUNK_SIZE = 64 * 1024
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def period_label(awal, akhir):
+    def nama(periode):
+        return f"{datetime(2000, periode[1], 1).strftime('%B')} {periode[0]}"
+    return nama(awal) if awal == akhir else f"{nama(awal)} - {nama(akhir)}"
+
+
+def file_name(awal, akhir):
+    """Nama file export tanpa ekstensi."""
+    if awal == akhir:
+        return f"laporan_{awal[1]}_{awal[0]}"
+    return f"laporan_{awal[0]}{awal[1]:02d}_{akhir[0]}{akhir[1]:02d}"
+
+
+def sheet_title(awal):
+    return f"Laporan {awal[1]}-{awal[0]}"
+
+
+def paid_invoice_rows(awal, akhir):
+    invoice = archive.invoice_source(awal)
+    periode = tuple_(invoice.c.tahun, invoice.c.bulan)
+    query = (select(invoice.c.tanggal_lunas, Customer.nama, invoice.c.jumlah, invoice.c.bulan, invoice.c.tahun)
+             .outerjoin(Customer, invoice.c.customer_id == Customer.id)
+             .where(invoice.c.status == 'Lunas', periode >= tuple_(*awal), periode <= tuple_(*akhir))
+             .order_by(invoice.c.tahun, invoice.c.bulan, invoice.c.id))
+    return db.session.execute(query.execution_options(yield_per=BATCH_SIZE))
+
+
+def expense_rows(awal, akhir):
+    mulai, selesai = period_range(awal[1], awal[0])[0], period_range(akhir[1], akhir[0])[1]
+    expense = archive.expense_source(awal)
+    query = (select(expense.c.tanggal, expense.c.deskripsi, expense.c.kategori, expense.c.jumlah)
+             .where(expense.c.tanggal >= mulai, expense.c.tanggal < selesai)
+             .order_by(expense.c.tanggal))
+    return db.session.execute(query.execution_options(yield_per=BATCH_SIZE))
+
+
+def report_rows(awal, akhir, settings, progress=None):
+    """Bangkitkan baris laporan untuk rentang (tahun, bulan) awal..akhir, inklusif.
+
+    `progress(persen, pesan)` opsional dipanggil di antara bagian laporan, saat tidak ada cursor yang terbuka.
+    """
+    progress = progress or (lambda persen, pesan: None)
+    rekap = rollups.get_range(awal, akhir)
+    pendapatan_kotor = sum(r['pendapatan'] for _, _, r in rekap)
+    total_pengeluaran = sum(r['pengeluaran'] for _, _, r in rekap)
+    yield ['Laporan Keuangan', f"Periode: {period_label(awal, akhir)}"]
+    yield []
+    yield ['', 'Pendapatan Kotor', pendapatan_kotor]
+    yield ['', 'Total Pengeluaran', total_pengeluaran]
+    yield []
+    bagi_hasil = settings.bagi_hasil(pendapatan_kotor) if awal == akhir else None
+    if bagi_hasil:
+        yield ['Kalkulasi Bagi Hasil']
+        yield ['', 'Alokasi Belanja', bagi_hasil['alokasi_belanja']]
+        yield ['', 'Setoran Balik Modal', bagi_hasil['setoran_balik_modal']]
+        yield ['', 'Dana Siap Bagi', bagi_hasil['dana_siap_bagi']]
+        yield ['', f"Bagian Anda ({bagi_hasil['persen_anda']}%)", bagi_hasil['bagian_anda']]
+        yield ['', f"Bagian Investor ({bagi_hasil['persen_investor']}%)", bagi_hasil['bagian_investor']]
+    yield []
+    progress(10, 'Menulis rincian pendapatan...')
+    yield ['Rincian Pendapatan']
+    yield ['Tanggal Lunas', 'Pelanggan', 'Jumlah', 'Periode']
+    for tanggal_lunas, nama, jumlah, bulan, tahun in paid_invoice_rows(awal, akhir):
+        yield [tanggal_lunas.strftime('%Y-%m-%d') if tanggal_lunas else '', nama or 'PELANGGAN DIHAPUS', jumlah, f"{bulan:02d}/{tahun}"]
+    yield []
+    progress(60, 'Menulis rincian pengeluaran...')
+    yield ['Rincian Pengeluaran']
+    yield ['Tanggal', 'Deskripsi', 'Kategori', 'Jumlah']
+    for tanggal, deskripsi, kategori, jumlah in expense_rows(awal, akhir):
+        yield [tanggal.strftime('%Y-%m-%d'), deskripsi, kategori, jumlah]
+    progress(90, 'Menyimpan berkas...')
+
+
+def profit_sharing_rows(awal, akhir, hasil, settings):
+    """Baris laporan bagi hasil beberapa periode dari hasil reports.profit_sharing()."""
+    yield ['Laporan Bagi Hasil', f"Periode: {period_label(awal, akhir)}"]
+    yield ['', f"Target pendapatan {settings.target_pendapatan}, bagian Anda {settings.persen_anda}%, "
+               f"bagian investor {settings.persen_investor}%"]
+    yield []
+    yield ['Periode', 'Pendapatan', 'Pengeluaran', 'Tunggakan', 'Target Tercapai', 'Alokasi Belanja',
+           'Setoran Balik Modal', 'Dana Siap Bagi', 'Bagian Anda', 'Bagian Investor']
+    for row in hasil['bulan']:
+        yield [f"{row['bulan']:02d}/{row['tahun']}", row['pendapatan'], row['pengeluaran'], row['tunggakan'],
+               'Ya' if row['target_tercapai'] else 'Tidak', *[row[col] for col in SHARE_COLUMNS]]
+    total = hasil['total']
+    yield ['Total', total['pendapatan'], total['pengeluaran'], total['tunggakan'],
+           f"{hasil['bulan_tercapai']} bulan", *[total[col] for col in SHARE_COLUMNS]]
+
+
+def write_xlsx(rows, title, fileobj):
+    """Tulis baris ke workbook write-only dan simpan ke `fileobj`."""
+    import openpyxl
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title=title[:31])
+    for row in rows:
+        ws.append(row)
+    wb.save(fileobj)
+
+
+def xlsx_stream(rows, title):
+    """Tulis workbook ke file sementara, lalu kembalikan generator potongan file."""
+    tmp = tempfile.TemporaryFile()
+    write_xlsx(rows, title, tmp)
+    tmp.seek(0)
+
+    def generate():
+        with tmp:
+            while chunk := tmp.read(CHUNK_SIZE):
+                yield chunk
+    return generate()
+
+
+def csv_stream(rows):
+    """Generator CSV (UTF-8 dengan BOM agar terbaca Excel) yang dikirim per potongan."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
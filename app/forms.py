@@ -1,5 +1,5 @@
 from flask_wtf import FlaskForm
-from flask_wtf.file import FileField, FileAllowed
+from flask_wtf.file import FileField, FileAllowed, FileRequired
 from wtforms import StringField, SubmitField, IntegerField, SelectField, TextAreaField, FloatField, PasswordField, BooleanField
 from wtforms.fields import DateField
 from wtforms.validators import DataRequired, Length, NumberRange, Email, EqualTo, ValidationError, Optional, InputRequired
@@ -31,6 +31,7 @@ class GenerateInvoicesForm(FlaskForm):
     bulan = SelectField('Bulan', coerce=int, choices=[(i, datetime(2000, i, 1).strftime('%B')) for i in range(1, 13)])
     tahun = IntegerField('Tahun', default=datetime.utcnow().year, validators=[DataRequired()])
     submit = SubmitField('Generate Tagihan untuk Periode Ini')
+    preview = SubmitField('Pratinjau')
 
 class PaymentForm(FlaskForm):
     tanggal_lunas = DateField('Tanggal Pembayaran', format='%Y-%m-%d', default=datetime.utcnow, validators=[DataRequired()])
@@ -38,6 +39,17 @@ class PaymentForm(FlaskForm):
     nota = FileField('Upload Nota (Opsional)', validators=[FileAllowed(['jpg', 'png', 'jpeg'])])
     submit = SubmitField('Simpan Pembayaran')
 
+class BulkPaymentForm(FlaskForm):
+    tanggal_lunas = DateField('Tanggal Pembayaran', format='%Y-%m-%d', default=datetime.utcnow, validators=[DataRequired()])
+    submit = SubmitField('Tandai Lunas')
+
+class BulkDeleteCustomersForm(FlaskForm):
+    submit = SubmitField('Hapus Terpilih')
+
+class ImportForm(FlaskForm):
+    berkas = FileField('File CSV / XLSX', validators=[FileRequired(), FileAllowed(['csv', 'xlsx'])])
+    submit = SubmitField('Import')
+
 class ExpenseForm(FlaskForm):
     deskripsi = TextAreaField('Deskripsi', validators=[DataRequired(), Length(min=3, max=200)])
     jumlah = IntegerField('Jumlah (Rp)', validators=[DataRequired(), NumberRange(min=1)])
@@ -0,0 +1,95 @@
+"""Resolusi user login tanpa query per request.
+
+ID sesi Flask-Login berbentuk "id:auth_version" (lihat User.get_id). User yang sudah diverifikasi
+disimpan di cache LRU ber-TTL per proses dengan kunci token itu. Ganti password menaikkan
+auth_version sehingga token lama tidak pernah cocok lagi: di proses yang sama langsung, di proses lain
+paling lambat setelah TTL (config AUTH_CACHE_TTL, detik).
+"""
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from flask_login import UserMixin
+from app import db, login_manager
+from app.models import User
+
+
+class CachedUser(UserMixin):
+    """Salinan ringan User untuk current_user; tidak terikat ke session SQLAlchemy."""
+
+    def __init__(self, user):
+        self.id, self.username, self.email, self.auth_version = user.id, user.username, user.email, user.auth_version
+
+    def get_id(self):
+        return f"{self.id}:{self.auth_version}"
+
+
+class TTLCache:
+    """LRU kecil dengan masa berlaku per entri, aman dipakai banyak thread."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_users = TTLCache(maxsize=256)
+
+
+@login_manager.user_loader
+def load_user(token):
+    cached = _users.get(token)
+    if cached is not None:
+        return cached
+    user_id, _, versi = token.partition(':')
+    try:
+        user = db.session.get(User, int(user_id))
+    except ValueError:
+        return None
+    if user is None:
+        return None
+    # Sesi lama tanpa versi (sebelum auth_version) dianggap versi 0: gugur begitu password pernah diganti.
+    if str(user.auth_version) != (versi or '0'):
+        return None
+    cached = CachedUser(user)
+    _users.set(token, cached, current_app.config['AUTH_CACHE_TTL'])
+    return cached
+
+
+def forget(token):
+    """Buang satu token dari cache proses ini (dipanggil saat logout)."""
+    _users.pop(token)
+
+
+def set_password(user, password_hash):
+    """Ganti password dan batalkan semua sesi user ini. Commit diserahkan ke pemanggil."""
+    user.password = password_hash
+    user.auth_version = (user.auth_version or 0) + 1
+    _users.clear()
@@ -0,0 +1,230 @@
+"""Import mutasi bank (pembayaran) dan data pelanggan dari CSV/XLSX, dibaca baris per baris.
+
+Pembayaran dicocokkan ke tagihan yang belum lunas lewat index di memori (telepon ternormalisasi,
+jumlah, periode), lalu ditulis per batch dengan executemany. Pelanggan di-upsert berdasarkan telepon.
+Commit diserahkan ke pemanggil.
+"""
+import csv
+import re
+from datetime import datetime, date, time
+from sqlalchemy import select, update, bindparam, func
+from sqlalchemy.dialects.sqlite import insert
+from app import db, rollups, versions
+from app.models import Customer, Invoice, ServicePackage
+from app.periods import parse_period
+from app.search import normalize_phone
+
+BATCH_SIZE = 1000
+MAX_ERRORS = 50
+STATUS_PELANGGAN = ('Aktif', 'Nonaktif', 'Isolir')
+ALIASES = {
+    'telepon': ('telepon', 'no_telepon', 'no_hp', 'hp', 'phone'),
+    'jumlah': ('jumlah', 'nominal', 'kredit', 'amount'),
+    'periode': ('periode', 'period'),
+    'tanggal': ('tanggal', 'tanggal_bayar', 'tanggal_lunas', 'date'),
+    'nama': ('nama', 'nama_pelanggan', 'name'),
+    'alamat': ('alamat', 'address'),
+    'paket': ('paket', 'nama_paket'),
+    'status': ('status',),
+    'tanggal_bergabung': ('tanggal_bergabung', 'bergabung'),
+}
+_KOLOM = {alias: kolom for kolom, aliases in ALIASES.items() for alias in aliases}
+_DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d %H:%M:%S')
+
+
+def _header(values):
+    return [_KOLOM.get(re.sub(r'\s+', '_', str(v or '').strip().lower())) for v in values]
+
+
+def iter_rows(path):
+    """Bangkitkan (nomor_baris, dict) dari CSV/XLSX tanpa memuat seluruh file; kolom dikenali lewat ALIASES."""
+    if path.lower().endswith('.xlsx'):
+        import openpyxl
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            header = _header(next(rows, ()))
+            for nomor, values in enumerate(rows, start=2):
+                if any(v not in (None, '') for v in values):
+                    yield nomor, {k: v for k, v in zip(header, values) if k}
+        finally:
+            wb.close()
+    else:
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = _header(next(reader, []))
+            for nomor, values in enumerate(reader, start=2):
+                if any(v.strip() for v in values):
+                    yield nomor, {k: v for k, v in zip(header, values) if k}
+
+
+def _text(value):
+    return str(value).strip() if value is not None else ''
+
+
+def _amount(value):
+    if isinstance(value, (int, float)):
+        return int(round(value))
+    text = re.sub(r'[.,]\d{1,2}$', '', _text(value))  # buang desimal: 150.000,00 / 150,000.00
+    digits = re.sub(r'\D', '', text)
+    if not digits:
+        raise ValueError(f"Jumlah tidak valid: {value!r}")
+    return int(digits)
+
+
+def _date(value):
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, time())
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(_text(value), fmt)
+        except ValueError:
+            pass
+    raise ValueError(f"Tanggal tidak valid: {value!r}")
+
+
+def _period(value):
+    if isinstance(value, (datetime, date)):
+        return value.year, value.month
+    try:
+        return parse_period(_text(value)[:7])
+    except ValueError:
+        raise ValueError(f"Periode harus YYYY-MM: {value!r}") from None
+
+
+def _open_invoice_index():
+    """Index tagihan belum lunas: (telepon, jumlah, tahun, bulan) dan (telepon, jumlah), periode tertua dulu."""
+    per_periode, per_jumlah = {}, {}
+    query = (select(Invoice.id, Invoice.tahun, Invoice.bulan, Invoice.jumlah, Customer.telepon)
+             .join(Customer, Invoice.customer_id == Customer.id)
+             .where(Invoice.status != 'Lunas')
+             .order_by(Invoice.tahun, Invoice.bulan, Invoice.id))
+    for invoice_id, tahun, bulan, jumlah, telepon in db.session.execute(query.execution_options(yield_per=BATCH_SIZE)):
+        telepon, tagihan = normalize_phone(telepon), (invoice_id, tahun, bulan, jumlah)
+        per_periode.setdefault((telepon, jumlah, tahun, bulan), []).append(tagihan)
+        per_jumlah.setdefault((telepon, jumlah), []).append(tagihan)
+    for antrean in per_jumlah.values():
+        antrean.reverse()  # pop() dari belakang = periode tertua
+    for antrean in per_periode.values():
+        antrean.reverse()
+    return per_periode, per_jumlah
+
+
+def _take(antrean, dipakai):
+    while antrean:
+        tagihan = antrean.pop()
+        if tagihan[0] not in dipakai:
+            return tagihan
+    return None
+
+
+class _Hasil(dict):
+    def __init__(self):
+        super().__init__(baris=0, berhasil=0, gagal=0, kesalahan=[])
+
+    def fail(self, nomor, alasan):
+        self['gagal'] += 1
+        if len(self['kesalahan']) < MAX_ERRORS:
+            self['kesalahan'].append({'baris': nomor, 'alasan': alasan})
+
+
+def import_payments(path, dry_run=False):
+    """Cocokkan setiap baris (telepon, jumlah, [periode], [tanggal]) ke satu tagihan terbuka dan tandai lunas.
+
+    Tanpa kolom periode, tagihan terbuka tertua dengan jumlah yang sama yang dipakai.
+    """
+    per_periode, per_jumlah = _open_invoice_index()
+    stmt = (update(Invoice)
+            .where(Invoice.id == bindparam('b_id'), Invoice.status != 'Lunas')
+            .values(status='Lunas', tanggal_lunas=bindparam('b_tanggal')))
+    hasil, dipakai, batch = _Hasil(), set(), []
+    hasil['total'] = 0
+    hari_ini = datetime.combine(date.today(), time())
+
+    def flush():
+        if batch and not dry_run:
+            db.session.connection().execute(stmt, [{'b_id': t[0], 'b_tanggal': tanggal} for t, tanggal in batch])
+            rollups.mark_paid_many((t[1], t[2], t[3]) for t, _ in batch)
+        batch.clear()
+
+    for nomor, row in iter_rows(path):
+        hasil['baris'] += 1
+        try:
+            telepon = normalize_phone(_text(row.get('telepon')))
+            if not telepon:
+                raise ValueError('Telepon kosong')
+            jumlah = _amount(row.get('jumlah'))
+            periode = _period(row['periode']) if _text(row.get('periode')) else None
+            tanggal = _date(row['tanggal']) if _text(row.get('tanggal')) else hari_ini
+        except ValueError as e:
+            hasil.fail(nomor, str(e))
+            continue
+        if periode:
+            tagihan = _take(per_periode.get((telepon, jumlah, *periode), []), dipakai)
+        else:
+            tagihan = _take(per_jumlah.get((telepon, jumlah), []), dipakai)
+        if tagihan is None:
+            hasil.fail(nomor, 'Tidak ada tagihan belum lunas yang cocok')
+            continue
+        dipakai.add(tagihan[0])
+        batch.append((tagihan, tanggal))
+        hasil['berhasil'] += 1
+        hasil['total'] += jumlah
+        if len(batch) >= BATCH_SIZE:
+            flush()
+    flush()
+    return hasil
+
+
+def import_customers(path, dry_run=False):
+    """Upsert pelanggan berdasarkan telepon. Kolom yang tidak ada di file tidak mengubah data lama."""
+    paket = {nama.lower(): package_id for package_id, nama in db.session.execute(select(ServicePackage.id, ServicePackage.nama_paket))}
+    # telepon ternormalisasi -> telepon tersimpan, supaya '0812-...' dan '62812...' mengenai baris yang sama
+    terdaftar = {normalize_phone(telepon): telepon for telepon in db.session.scalars(select(Customer.telepon))}
+    hasil, batch, stmt = _Hasil(), [], None
+    hasil.update(baru=0, diperbarui=0)
+    sekarang = datetime.utcnow()
+
+    def flush():
+        if batch and not dry_run:
+            db.session.connection().execute(stmt, batch)
+            versions.touch('pelanggan')
+        batch.clear()
+
+    for nomor, row in iter_rows(path):
+        hasil['baris'] += 1
+        if stmt is None:
+            kolom = [k for k in ('nama', 'alamat', 'status') if k in row] + (['package_id'] if 'paket' in row else [])
+            stmt = insert(Customer)
+            # Sel kosong tidak menimpa data lama: '' / NULL dari baris file jatuh ke nilai yang tersimpan.
+            set_ = {k: func.coalesce(func.nullif(stmt.excluded[k], ''), getattr(Customer, k)) for k in kolom}
+            stmt = stmt.on_conflict_do_update(index_elements=['telepon'], set_=set_) if kolom else stmt.on_conflict_do_nothing()
+        try:
+            telepon = _text(row.get('telepon'))
+            kunci = normalize_phone(telepon)
+            if not kunci:
+                raise ValueError('Telepon kosong')
+            nama, nama_paket = _text(row.get('nama')), _text(row.get('paket'))
+            baru = kunci not in terdaftar
+            status = _text(row.get('status')) or ('Aktif' if baru else '')
+            if not nama and (baru or 'nama' in row):
+                raise ValueError('Nama wajib diisi untuk pelanggan baru' if baru else 'Nama tidak boleh kosong')
+            if status and status not in STATUS_PELANGGAN:
+                raise ValueError(f"Status tidak dikenal: {status}")
+            if nama_paket and nama_paket.lower() not in paket:
+                raise ValueError(f"Paket tidak ditemukan: {nama_paket}")
+            bergabung = _date(row['tanggal_bergabung']) if _text(row.get('tanggal_bergabung')) else sekarang
+        except ValueError as e:
+            hasil.fail(nomor, str(e))
+            continue
+        hasil['baru' if baru else 'diperbarui'] += 1
+        telepon = terdaftar.setdefault(kunci, telepon)
+        batch.append({'telepon': telepon, 'nama': nama, 'alamat': _text(row.get('alamat')), 'status': status,
+                      'package_id': paket.get(nama_paket.lower()), 'tanggal_bergabung': bergabung})
+        hasil['berhasil'] += 1
+        if len(batch) >= BATCH_SIZE:
+            flush()
+    flush()
+    return hasil
@@ -0,0 +1,74 @@
+"""Instrumentasi per request: header X-Query-Count dan metrik Prometheus untuk /metrics.
+
+QUERY_COUNTER (bawaan aktif) hanya menghitung query SQL per request. METRICS_ENABLED menambahkan
+histogram latensi per endpoint, jumlah dan waktu SQL per request, serta log query lambat (logger
+`app.slow_query`, batas SLOW_QUERY_MS). Listener dan hook hanya dipasang untuk fitur yang aktif, jadi
+fitur yang mati tidak menambah beban per query. Query dari thread job tidak dihitung per request,
+tetapi tetap masuk log query lambat.
+"""
+import logging
+import time
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from app import db, metrics
+
+slow_log = logging.getLogger('app.slow_query')
+
+
+def init_app(app):
+    counter, enabled = app.config['QUERY_COUNTER'], app.config['METRICS_ENABLED']
+    if not (counter or enabled):
+        return
+    with app.app_context():
+        engine = db.engine
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            g.query_count = g.get('query_count', 0) + 1
+
+    if not enabled:
+        event.listen(engine, 'before_cursor_execute', count_query)
+
+        def query_count_header(response):
+            response.headers['X-Query-Count'] = str(g.get('query_count', 0))
+            return response
+        app.after_request(query_count_header)
+        return
+
+    slow_seconds = app.config['SLOW_QUERY_MS'] / 1000
+    folder, interval = app.config['METRICS_DIR'], app.config['METRICS_FLUSH_SECONDS']
+
+    def start_query(conn, cursor, statement, parameters, context, executemany):
+        context._mulai_query = time.perf_counter()
+        count_query(conn, cursor, statement, parameters, context, executemany)
+
+    def end_query(conn, cursor, statement, parameters, context, executemany):
+        durasi = time.perf_counter() - context._mulai_query
+        in_request = has_request_context()
+        if in_request:
+            g.sql_seconds = g.get('sql_seconds', 0.0) + durasi
+        if slow_seconds and durasi >= slow_seconds:
+            endpoint = (request.endpoint or 'tidak_dikenal') if in_request else 'tugas'
+            metrics.registry.inc('wisp_slow_queries_total', {'endpoint': endpoint})
+            slow_log.warning("Query lambat %.0f ms di %s: %s", durasi * 1000, endpoint, ' '.join(statement.split())[:500])
+
+    def start_request():
+        g.mulai_request = time.perf_counter()
+
+    def finish_request(response):
+        queries = g.get('query_count', 0)
+        if counter:
+            response.headers['X-Query-Count'] = str(queries)
+        if 'mulai_request' in g:
+            endpoint = request.endpoint or 'tidak_dikenal'
+            metrics.registry.inc('wisp_http_requests_total', {'endpoint': endpoint, 'method': request.method, 'status': str(response.status_code)})
+            metrics.registry.observe('wisp_http_request_duration_seconds', {'endpoint': endpoint}, time.perf_counter() - g.mulai_request)
+            metrics.registry.observe('wisp_sql_queries_per_request', {'endpoint': endpoint}, queries)
+            metrics.registry.inc('wisp_sql_duration_seconds_total', {'endpoint': endpoint}, g.get('sql_seconds', 0.0))
+            metrics.maybe_flush(folder, interval)
+        return response
+
+    event.listen(engine, 'before_cursor_execute', start_query)
+    event.listen(engine, 'after_cursor_execute', end_query)
+    app.before_request(start_request)
+    app.after_request(finish_request)
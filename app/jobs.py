@@ -0,0 +1,228 @@
+"""Tugas latar belakang di dalam proses, tanpa broker: thread pool + tabel `job`.
+
+Route memanggil `enqueue()` lalu langsung kembali; status dan progres dibaca lewat /jobs/<id>.
+Setiap job mencatat pemiliknya (host:pid:token). Job aktif yang pemiliknya sudah mati (server
+di-restart, worker dibunuh) ditandai Gagal oleh `recover_orphans()` pada request pertama tiap proses.
+"""
+import json
+import os
+import secrets
+import socket
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import select, update
+from app import archive, billing, db, rollups, exports, receipts, importer
+from app.models import Invoice, Job
+from app.settings import Settings
+
+AKTIF = ('Menunggu', 'Berjalan')
+PESAN_YATIM = 'Proses pekerja berhenti sebelum tugas selesai.'
+
+Task = namedtuple('Task', 'func judul kembali')
+TASKS = {}
+
+_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+_tokens = {}
+_recovered_pid = None
+
+
+def task(jenis, judul, kembali):
+    """Daftarkan fungsi tugas. `kembali` adalah endpoint tujuan tombol kembali di halaman job."""
+    def decorator(func):
+        TASKS[jenis] = Task(func, judul, kembali)
+        return func
+    return decorator
+
+
+def _token():
+    # Token per proses membedakan proses baru yang kebetulan mendapat pid yang sama (mis. pid 1 di container).
+    return _tokens.setdefault(os.getpid(), secrets.token_hex(4))
+
+
+def owner():
+    return f"{socket.gethostname()}:{os.getpid()}:{_token()}"
+
+
+def _get_executor():
+    global _executor, _executor_pid
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            # Thread pool tidak ikut ter-fork; proses anak (worker gunicorn) membuat pool sendiri.
+            _executor = ThreadPoolExecutor(max_workers=current_app.config['JOB_WORKERS'], thread_name_prefix='job')
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def enqueue(jenis, user_id=None, **parameter):
+    """Simpan job baru, commit, lalu jalankan di thread pool. Parameter harus bisa di-JSON-kan."""
+    job_id = secrets.token_hex(16)
+    db.session.add(Job(id=job_id, jenis=jenis, parameter=json.dumps(parameter), pemilik=owner(), user_id=user_id))
+    db.session.commit()
+    _get_executor().submit(_run, current_app._get_current_object(), job_id)
+    return job_id
+
+
+def submit(func, *args):
+    """Jalankan fungsi internal (tanpa baris Job) di thread pool yang sama, di dalam app context."""
+    app = current_app._get_current_object()
+
+    def run():
+        with app.app_context():
+            try:
+                func(*args)
+            except Exception:
+                app.logger.exception("Tugas internal %s gagal", func.__name__)
+    return _get_executor().submit(run)
+
+
+def _update(job_id, **values):
+    # Koneksi terpisah dari db.session milik tugas, supaya progres langsung terlihat oleh request lain.
+    with db.engine.begin() as conn:
+        conn.execute(update(Job).where(Job.id == job_id).values(**values))
+
+
+def progress(job_id, persen, pesan=None):
+    """Catat progres. Panggil di luar transaksi tulis tugas (SQLite hanya punya satu penulis)."""
+    _update(job_id, progres=persen, pesan=pesan)
+
+
+def _run(app, job_id):
+    with app.app_context():
+        job = db.session.get(Job, job_id)
+        if job is None or job.status != 'Menunggu':
+            return
+        jenis, parameter = job.jenis, json.loads(job.parameter)
+        job.status, job.tanggal_mulai = 'Berjalan', datetime.utcnow()
+        db.session.commit()
+        try:
+            hasil = TASKS[jenis].func(job_id, **parameter) or {}
+        except Exception as e:
+            db.session.rollback()
+            app.logger.exception("Job %s (%s) gagal", job_id, jenis)
+            _update(job_id, status='Gagal', pesan=str(e)[:200], tanggal_selesai=datetime.utcnow())
+            return
+        _update(job_id, status='Selesai', progres=100, pesan=hasil.pop('pesan', None), berkas=hasil.pop('berkas', None),
+                hasil=json.dumps(hasil), tanggal_selesai=datetime.utcnow())
+
+
+def _is_orphan(pemilik):
+    try:
+        host, pid, token = pemilik.rsplit(':', 2)
+        pid = int(pid)
+    except (AttributeError, ValueError):
+        return True
+    if host != socket.gethostname():
+        return False  # Proses di mesin lain tidak bisa diperiksa dari sini.
+    if pid == os.getpid():
+        return token != _token()
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+
+def recover_orphans():
+    """Tandai Gagal semua job aktif yang prosesnya sudah tidak ada. Kembalikan jumlahnya."""
+    aktif = db.session.execute(select(Job.id, Job.pemilik).where(Job.status.in_(AKTIF))).all()
+    yatim = [job_id for job_id, pemilik in aktif if _is_orphan(pemilik)]
+    if yatim:
+        db.session.execute(update(Job).where(Job.id.in_(yatim), Job.status.in_(AKTIF))
+                           .values(status='Gagal', pesan=PESAN_YATIM, tanggal_selesai=datetime.utcnow()))
+        db.session.commit()
+    return len(yatim)
+
+
+def _recover_once():
+    global _recovered_pid
+    if _recovered_pid != os.getpid():
+        _recovered_pid = os.getpid()
+        recover_orphans()
+
+
+def init_app(app):
+    app.before_request(_recover_once)
+
+
+def to_dict(job):
+    return {'id': job.id, 'jenis': job.jenis, 'status': job.status, 'progres': job.progres, 'pesan': job.pesan,
+            'hasil': json.loads(job.hasil) if job.hasil else None,
+            'tanggal_buat': job.tanggal_buat.isoformat(),
+            'tanggal_mulai': job.tanggal_mulai.isoformat() if job.tanggal_mulai else None,
+            'tanggal_selesai': job.tanggal_selesai.isoformat() if job.tanggal_selesai else None}
+
+
+def export_folder():
+    return os.path.join(current_app.instance_path, 'exports')
+
+
+def import_folder():
+    return os.path.join(current_app.instance_path, 'imports')
+
+
+# --- Tugas ---
+
+@task('generate_invoices', 'Generate Tagihan', 'invoices.index')
+def generate_invoices_task(job_id, bulan, tahun):
+    archive.ensure_open(bulan, tahun)
+    count = billing.generate_period(bulan, tahun)['tagihan_baru']
+    rollups.refresh_period(bulan, tahun)
+    db.session.commit()
+    if count > 0:
+        pesan = f'{count} tagihan baru untuk periode {bulan}/{tahun} berhasil dibuat!'
+    else:
+        pesan = 'Tidak ada tagihan baru yang dibuat. Semua pelanggan yang valid sudah punya tagihan untuk periode ini.'
+    return {'pesan': pesan, 'tagihan_baru': count}
+
+
+@task('delete_all_invoices', 'Hapus Semua Tagihan', 'invoices.index')
+def delete_all_invoices_task(job_id):
+    # File nota dihapus oleh receipts setelah commit; jika transaksi gagal, file masih utuh.
+    receipts.release_all()
+    num_rows_deleted = db.session.query(Invoice).delete()
+    rollups.reset_invoices()
+    db.session.commit()
+    return {'pesan': f'Berhasil menghapus {num_rows_deleted} tagihan dan semua file nota terkait.', 'tagihan_dihapus': num_rows_deleted}
+
+
+@task('export_financial_report', 'Export Laporan Keuangan', 'reports.index')
+def export_financial_report_task(job_id, awal, akhir, format, settings):
+    awal, akhir = tuple(awal), tuple(akhir)
+    os.makedirs(export_folder(), exist_ok=True)
+    berkas = f"{job_id}.{format}"
+    rows = exports.report_rows(awal, akhir, Settings(**settings), progress=lambda persen, pesan: progress(job_id, persen, pesan))
+    with open(os.path.join(export_folder(), berkas), 'wb') as f:
+        if format == 'csv':
+            for chunk in exports.csv_stream(rows):
+                f.write(chunk)
+        else:
+            exports.write_xlsx(rows, exports.sheet_title(awal), f)
+    return {'pesan': f"Laporan {exports.period_label(awal, akhir)} siap diunduh.", 'berkas': berkas,
+            'nama_file': f"{exports.file_name(awal, akhir)}.{format}"}
+
+
+@task('import_payments', 'Import Pembayaran', 'imports.index')
+def import_payments_task(job_id, path):
+    try:
+        hasil = importer.import_payments(path)
+        db.session.commit()
+    finally:
+        os.remove(path)
+    return dict(hasil, pesan=f"{hasil['berhasil']} pembayaran cocok (Rp {hasil['total']:,.0f}), {hasil['gagal']} baris gagal.")
+
+
+@task('import_customers', 'Import Pelanggan', 'imports.index')
+def import_customers_task(job_id, path):
+    try:
+        hasil = importer.import_customers(path)
+        db.session.commit()
+    finally:
+        os.remove(path)
+    return dict(hasil, pesan=f"{hasil['baru']} pelanggan baru, {hasil['diperbarui']} diperbarui, {hasil['gagal']} baris gagal.")
@@ -0,0 +1,128 @@
+"""Registry metrik kecil berformat teks Prometheus, tanpa dependensi tambahan.
+
+Setiap proses (worker gunicorn) mencatat ke registry di memorinya sendiri dan menulis salinannya ke
+METRICS_DIR/<pid>.json paling sering tiap METRICS_FLUSH_SECONDS. /metrics menjumlahkan semua file itu,
+sehingga hasilnya sama walaupun scrape dilayani worker yang berbeda. File dari worker yang sudah mati
+tetap dijumlahkan (counter tidak boleh turun) sampai `clear()` dipanggil saat master gunicorn mulai.
+"""
+import glob
+import json
+import os
+import threading
+import time
+
+BUCKETS_DETIK = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BUCKETS_QUERY = (1, 2, 5, 10, 25, 50, 100, 500)
+
+# nama: (tipe, bucket histogram atau None, keterangan)
+METRICS = {
+    'wisp_http_requests_total': ('counter', None, 'Jumlah request per endpoint, method, dan status.'),
+    'wisp_http_request_duration_seconds': ('histogram', BUCKETS_DETIK, 'Latensi request per endpoint (sampai response dibuat).'),
+    'wisp_sql_queries_per_request': ('histogram', BUCKETS_QUERY, 'Jumlah query SQL per request.'),
+    'wisp_sql_duration_seconds_total': ('counter', None, 'Total waktu eksekusi SQL per endpoint.'),
+    'wisp_slow_queries_total': ('counter', None, 'Query yang melewati SLOW_QUERY_MS; endpoint "tugas" untuk thread job.'),
+}
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, name, labels, value=1):
+        key = _key(name, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][1]
+        key = _key(name, labels)
+        with self._lock:
+            # [hitungan per bucket..., +Inf, sum]
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [0] * (len(buckets) + 2)
+            for i, batas in enumerate(buckets):
+                if value <= batas:
+                    data[i] += 1
+            data[-2] += 1
+            data[-1] += value
+
+    def snapshot(self):
+        with self._lock:
+            return {key: list(value) if isinstance(value, list) else value for key, value in self._values.items()}
+
+
+def _key(name, labels):
+    return json.dumps([name, sorted(labels.items())])
+
+
+registry = Registry()
+_last_flush = 0.0
+
+
+def flush(folder):
+    global _last_flush
+    _last_flush = time.monotonic()
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f'{os.getpid()}.json')
+    with open(path + '.tmp', 'w') as f:
+        json.dump(registry.snapshot(), f)
+    os.replace(path + '.tmp', path)
+
+
+def maybe_flush(folder, interval):
+    if time.monotonic() - _last_flush >= interval:
+        flush(folder)
+
+
+def clear(folder):
+    for path in glob.glob(os.path.join(folder, '*.json')):
+        os.remove(path)
+
+
+def collect(folder):
+    """Gabungan semua proses dalam format teks Prometheus."""
+    flush(folder)
+    total = {}
+    for path in glob.glob(os.path.join(folder, '*.json')):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue  # file sedang ditulis ulang / dihapus
+        for key, value in data.items():
+            if isinstance(value, list):
+                lama = total.setdefault(key, [0] * len(value))
+                total[key] = [a + b for a, b in zip(lama, value)]
+            else:
+                total[key] = total.get(key, 0) + value
+    return render(total)
+
+
+def _labels(items, extra=()):
+    pairs = list(items) + list(extra)
+    if not pairs:
+        return ''
+    escape = lambda v: str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')  # noqa: E731
+    return '{' + ','.join(f'{k}="{escape(v)}"' for k, v in pairs) + '}'
+
+
+def render(values):
+    per_nama = {}
+    for key, value in values.items():
+        name, labels = json.loads(key)
+        per_nama.setdefault(name, []).append((labels, value))
+    lines = []
+    for name, (tipe, buckets, keterangan) in METRICS.items():
+        lines += [f'# HELP {name} {keterangan}', f'# TYPE {name} {tipe}']
+        for labels, value in sorted(per_nama.get(name, [])):
+            if tipe == 'histogram':
+                kumulatif = value[:len(buckets)] + [value[-2]]
+                for batas, jumlah in zip([*(f'{b:g}' for b in buckets), '+Inf'], kumulatif):
+                    lines.append(f'{name}_bucket{_labels(labels, [("le", batas)])} {jumlah}')
+                lines.append(f'{name}_sum{_labels(labels)} {value[-1]:.6f}')
+                lines.append(f'{name}_count{_labels(labels)} {value[-2]}')
+            else:
+                lines.append(f'{name}{_labels(labels)} {value:g}' if isinstance(value, float) else f'{name}{_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
@@ -1,27 +1,32 @@
-from app import db, login_manager
+from app import db
 from datetime import datetime
 from flask_login import UserMixin
 
-@login_manager.user_loader
-def load_user(user_id):
-    return User.query.get(int(user_id))
-
 class User(db.Model, UserMixin):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(20), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password = db.Column(db.String(60), nullable=False)
+    auth_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    def get_id(self):
+        # Versi ikut tersimpan di sesi dan cookie remember; menaikkannya membatalkan semua sesi lama.
+        return f"{self.id}:{self.auth_version}"
 
 class Customer(db.Model):
+    __table_args__ = (db.Index('ix_customer_status_bergabung', 'status', 'tanggal_bergabung'),
+                      db.Index('ix_customer_nama', 'nama'))
     id = db.Column(db.Integer, primary_key=True)
     nama = db.Column(db.String(100), nullable=False)
     alamat = db.Column(db.String(200), nullable=False)
     telepon = db.Column(db.String(20), nullable=False, unique=True)
-    package_id = db.Column(db.Integer, db.ForeignKey('service_package.id'), nullable=True)
+    package_id = db.Column(db.Integer, db.ForeignKey('service_package.id', ondelete='SET NULL'), nullable=True)
     status = db.Column(db.String(20), nullable=False, default='Aktif')
     tanggal_bergabung = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    package = db.relationship('ServicePackage', backref=db.backref('customers', lazy=True))
-    invoices = db.relationship('Invoice', backref='customer', lazy=True, cascade="all, delete-orphan")
+    # Hapus paket/pelanggan ditangani foreign key di database (SET NULL / CASCADE, PRAGMA foreign_keys=ON);
+    # passive_deletes mencegah ORM memuat semua baris anak hanya untuk menghapus atau mengosongkannya.
+    package = db.relationship('ServicePackage', backref=db.backref('customers', lazy=True, passive_deletes=True))
+    invoices = db.relationship('Invoice', back_populates='customer', lazy=True, cascade="all, delete-orphan", passive_deletes=True)
 
 class ServicePackage(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -30,8 +35,13 @@ class ServicePackage(db.Model):
     harga = db.Column(db.Integer, nullable=False)
 
 class Invoice(db.Model):
+    __table_args__ = (db.UniqueConstraint('customer_id', 'bulan', 'tahun', name='uq_invoice_customer_periode'),
+                      db.Index('ix_invoice_periode_status', 'tahun', 'bulan', 'status', 'jumlah'),
+                      db.Index('ix_invoice_tahun_bulan', 'tahun', 'bulan'),
+                      db.Index('ix_invoice_tanggal_buat', 'tanggal_buat'),
+                      {'sqlite_autoincrement': True})
     id = db.Column(db.Integer, primary_key=True)
-    customer_id = db.Column(db.Integer, db.ForeignKey('customer.id'), nullable=False)
+    customer_id = db.Column(db.Integer, db.ForeignKey('customer.id', ondelete='CASCADE'), nullable=False)
     bulan = db.Column(db.Integer, nullable=False)
     tahun = db.Column(db.Integer, nullable=False)
     jumlah = db.Column(db.Integer, nullable=False)
@@ -40,8 +50,10 @@ class Invoice(db.Model):
     tanggal_lunas = db.Column(db.DateTime, nullable=True)
     # --- PERBAIKAN DI SINI ---
     bukti_pembayaran = db.Column(db.String(100), nullable=True)
+    customer = db.relationship('Customer', back_populates='invoices')
 
 class Expense(db.Model):
+    __table_args__ = (db.Index('ix_expense_tanggal', 'tanggal', 'jumlah'), {'sqlite_autoincrement': True})
     id = db.Column(db.Integer, primary_key=True)
     deskripsi = db.Column(db.String(200), nullable=False)
     jumlah = db.Column(db.Integer, nullable=False)
@@ -51,3 +63,45 @@ class Expense(db.Model):
 class Setting(db.Model):
     key = db.Column(db.String(50), primary_key=True)
     value = db.Column(db.String(200), nullable=False)
+
+class MonthlyRollup(db.Model):
+    tahun = db.Column(db.Integer, primary_key=True)
+    bulan = db.Column(db.Integer, primary_key=True)
+    pendapatan = db.Column(db.Integer, nullable=False, default=0)
+    tunggakan = db.Column(db.Integer, nullable=False, default=0)
+    tagihan_lunas = db.Column(db.Integer, nullable=False, default=0)
+    tagihan_belum_lunas = db.Column(db.Integer, nullable=False, default=0)
+    pengeluaran = db.Column(db.Integer, nullable=False, default=0)
+
+class MonthlyExpenseRollup(db.Model):
+    tahun = db.Column(db.Integer, primary_key=True)
+    bulan = db.Column(db.Integer, primary_key=True)
+    kategori = db.Column(db.String(50), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+
+class DataVersion(db.Model):
+    nama = db.Column(db.String(50), primary_key=True)
+    versi = db.Column(db.Integer, nullable=False, default=0)
+
+class Job(db.Model):
+    id = db.Column(db.String(32), primary_key=True)
+    jenis = db.Column(db.String(50), nullable=False)
+    parameter = db.Column(db.Text, nullable=False, default='{}')
+    status = db.Column(db.String(20), nullable=False, default='Menunggu', index=True)
+    progres = db.Column(db.Integer, nullable=False, default=0)
+    pesan = db.Column(db.String(200), nullable=True)
+    hasil = db.Column(db.Text, nullable=True)
+    berkas = db.Column(db.String(200), nullable=True)
+    pemilik = db.Column(db.String(100), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    tanggal_buat = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    tanggal_mulai = db.Column(db.DateTime, nullable=True)
+    tanggal_selesai = db.Column(db.DateTime, nullable=True)
+
+class Receipt(db.Model):
+    sha256 = db.Column(db.String(64), primary_key=True)
+    path = db.Column(db.String(100), nullable=False)
+    ukuran = db.Column(db.Integer, nullable=False)
+    refcount = db.Column(db.Integer, nullable=False, default=0)
+    diproses = db.Column(db.Boolean, nullable=False, default=False)
+    tanggal_buat = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,46 @@
+from datetime import datetime
+from sqlalchemy import and_
+
+
+def add_months(tahun, bulan, n):
+    """Geser periode (tahun, bulan) sejauh n bulan (boleh negatif)."""
+    idx = tahun * 12 + (bulan - 1) + n
+    return idx // 12, idx % 12 + 1
+
+
+def period_range(bulan, tahun):
+    """Rentang setengah terbuka [awal, akhir) untuk satu periode bulanan."""
+    tahun_akhir, bulan_akhir = add_months(tahun, bulan, 1)
+    return datetime(tahun, bulan, 1), datetime(tahun_akhir, bulan_akhir, 1)
+
+
+def in_period(column, bulan, tahun):
+    """Filter `column >= awal AND column < akhir` yang bisa memakai index, pengganti extract('month'/'year')."""
+    awal, akhir = period_range(bulan, tahun)
+    return and_(column >= awal, column < akhir)
+
+
+def check_period(tahun, bulan):
+    """Kembalikan (tahun, bulan) jika bisa dijadikan datetime; ValueError jika di luar 1..9998 / 1..12.
+
+    Batas atas 9998 karena period_range() juga membuat datetime untuk bulan sesudahnya.
+    """
+    if not (1 <= tahun <= 9998 and 1 <= bulan <= 12):
+        raise ValueError(f"{tahun}-{bulan}")
+    return tahun, bulan
+
+
+def parse_period(value):
+    """'YYYY-MM' -> (tahun, bulan). ValueError jika format salah atau di luar rentang."""
+    tahun, bulan = (int(part) for part in value.split('-'))
+    return check_period(tahun, bulan)
+
+
+def month_index(tahun, bulan):
+    return tahun * 12 + bulan - 1
+
+
+def iter_months(awal, akhir):
+    """Semua (tahun, bulan) dari awal sampai akhir, inklusif."""
+    for idx in range(month_index(*awal), month_index(*akhir) + 1):
+        yield idx // 12, idx % 12 + 1
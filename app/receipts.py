@@ -0,0 +1,196 @@
+"""Nota pembayaran disimpan berdasarkan isinya: static/uploads/cas/ab/cd/<sha256>.<ext>.
+
+Unggahan yang sama hanya disimpan sekali; `Receipt.refcount` menghitung tagihan yang memakainya.
+Setelah commit, thread pool job mengompres ulang nota baru dan membuat thumbnail, serta menghapus
+file yang tidak lagi dipakai. Nama file tetap hash unggahan asli walaupun isinya sudah dikompres ulang.
+Pillow ada di requirements.txt; jika tidak terpasang, nota disimpan apa adanya dan halaman tagihan
+menampilkan tautan biasa.
+"""
+import hashlib
+import os
+import tempfile
+from flask import current_app
+from sqlalchemy import event, select, update, delete, bindparam, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app import db, jobs
+from app.models import Receipt, Invoice
+
+CAS_DIR = 'cas'
+CHUNK_SIZE = 64 * 1024
+MAX_SIZE = (1600, 1600)
+THUMB_SIZE = (320, 320)
+JPEG_QUALITY = 80
+SQL_CHUNK = 500
+# NamedTemporaryFile membuat file 0600; nota harus bisa dibaca web server yang berjalan sebagai user lain.
+FILE_MODE = 0o644
+
+_NEW = 'receipts_baru'
+_RELEASED = 'receipts_dilepas'
+
+
+def upload_root():
+    return os.path.join(current_app.root_path, 'static/uploads')
+
+
+def _is_cas(path):
+    return path.startswith(CAS_DIR + '/')
+
+
+def _sha_of(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _thumb_of(path):
+    return f"{os.path.splitext(path)[0]}_thumb.jpg"
+
+
+def _publish(tmp_path, full):
+    """Pindahkan file sementara ke lokasi akhirnya dengan izin baca yang sama seperti FileStorage.save."""
+    os.chmod(tmp_path, FILE_MODE)
+    os.replace(tmp_path, full)
+
+
+def store(file_storage):
+    """Simpan unggahan (FileStorage) dan tambah satu referensi. Kembalikan path relatif untuk `bukti_pembayaran`."""
+    root = upload_root()
+    tmp_dir = os.path.join(root, CAS_DIR, 'tmp')
+    os.makedirs(tmp_dir, exist_ok=True)
+    digest, ukuran = hashlib.sha256(), 0
+    with tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False) as tmp:
+        while chunk := file_storage.stream.read(CHUNK_SIZE):
+            digest.update(chunk)
+            tmp.write(chunk)
+            ukuran += len(chunk)
+    sha = digest.hexdigest()
+    existing = db.session.get(Receipt, sha)
+    path = existing.path if existing else f"{CAS_DIR}/{sha[:2]}/{sha[2:4]}/{sha}{os.path.splitext(file_storage.filename)[1].lower()[:10]}"
+    full = os.path.join(root, path)
+    if os.path.exists(full):
+        os.remove(tmp.name)
+    else:
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        _publish(tmp.name, full)
+    stmt = insert(Receipt).values(sha256=sha, path=path, ukuran=ukuran, refcount=1)
+    db.session.execute(stmt.on_conflict_do_update(index_elements=['sha256'], set_={'refcount': Receipt.refcount + 1}))
+    if existing is None:
+        db.session.info.setdefault(_NEW, set()).add(path)
+    return path
+
+
+def release(path):
+    """Lepas satu referensi. File dihapus setelah commit jika tidak ada lagi yang memakainya."""
+    if not path:
+        return
+    if _is_cas(path):
+        db.session.execute(update(Receipt).where(Receipt.sha256 == _sha_of(path)).values(refcount=Receipt.refcount - 1))
+    db.session.info.setdefault(_RELEASED, set()).add(path)
+
+
+def release_all(*criteria):
+    """Lepas referensi semua tagihan (atau yang memenuhi `criteria`). Panggil sebelum tagihannya dihapus."""
+    counts = db.session.execute(select(Invoice.bukti_pembayaran, func.count())
+                                .where(Invoice.bukti_pembayaran.isnot(None), *criteria)
+                                .group_by(Invoice.bukti_pembayaran)).all()
+    cas = [{'sha': _sha_of(path), 'n': n} for path, n in counts if _is_cas(path)]
+    if cas:
+        stmt = update(Receipt).where(Receipt.sha256 == bindparam('sha')).values(refcount=Receipt.refcount - bindparam('n'))
+        db.session.connection().execute(stmt, cas)
+    db.session.info.setdefault(_RELEASED, set()).update(path for path, _ in counts)
+    return len(counts)
+
+
+def thumbnail_path(path):
+    """Path thumbnail relatif terhadap uploads, atau None jika belum/tidak ada."""
+    if not path or not _is_cas(path):
+        return None
+    thumb = _thumb_of(path)
+    return thumb if os.path.exists(os.path.join(upload_root(), thumb)) else None
+
+
+def init_app(app):
+    app.add_template_global(thumbnail_path, 'receipt_thumbnail')
+
+
+def _remove(root, path):
+    try:
+        os.remove(os.path.join(root, path))
+    except FileNotFoundError:
+        return
+    folder = os.path.dirname(os.path.join(root, path))
+    while folder != root:
+        try:
+            os.rmdir(folder)
+        except OSError:
+            break
+        folder = os.path.dirname(folder)
+
+
+def _cleanup(paths):
+    """Hapus baris Receipt tanpa referensi beserta file-nya; path lama (bukan cas/) langsung dihapus."""
+    root = upload_root()
+    cas = [path for path in paths if _is_cas(path)]
+    remaining = set()
+    with db.engine.begin() as conn:
+        for i in range(0, len(cas), SQL_CHUNK):
+            shas = [_sha_of(path) for path in cas[i:i + SQL_CHUNK]]
+            conn.execute(delete(Receipt).where(Receipt.sha256.in_(shas), Receipt.refcount <= 0))
+            remaining.update(conn.scalars(select(Receipt.sha256).where(Receipt.sha256.in_(shas))))
+    for path in paths:
+        if not _is_cas(path):
+            _remove(root, path)
+        elif _sha_of(path) not in remaining:
+            _remove(root, _thumb_of(path))
+            _remove(root, path)
+
+
+def _process(path):
+    """Kompres ulang foto besar dan buat thumbnail. Dilewati jika Pillow tidak terpasang."""
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return
+    root = upload_root()
+    full = os.path.join(root, path)
+    receipt = db.session.get(Receipt, _sha_of(path))
+    if receipt is None or receipt.diproses or not os.path.exists(full):
+        return
+    try:
+        with Image.open(full) as original:
+            format = original.format
+            img = ImageOps.exif_transpose(original)
+            thumb = img.convert('RGB')
+            thumb.thumbnail(THUMB_SIZE)
+            thumb.save(os.path.join(root, _thumb_of(path)), 'JPEG', quality=JPEG_QUALITY)
+            if format == 'JPEG':
+                img = img.convert('RGB')
+                img.thumbnail(MAX_SIZE)
+                with tempfile.NamedTemporaryFile(dir=os.path.dirname(full), delete=False) as tmp:
+                    img.save(tmp, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+                if os.path.getsize(tmp.name) < os.path.getsize(full):
+                    _publish(tmp.name, full)
+                else:
+                    os.remove(tmp.name)
+    except OSError:
+        current_app.logger.warning("Nota %s tidak bisa diproses sebagai gambar", path)
+    receipt.diproses, receipt.ukuran = True, os.path.getsize(full)
+    db.session.commit()
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session):
+    baru = session.info.pop(_NEW, None)
+    dilepas = session.info.pop(_RELEASED, None)
+    for path in sorted(baru or ()):
+        jobs.submit(_process, path)
+    if dilepas:
+        jobs.submit(_cleanup, sorted(dilepas))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop(_RELEASED, None)
+    baru = session.info.pop(_NEW, None)
+    if baru:
+        # File sudah ditulis tapi barisnya batal; _cleanup menghapusnya karena tidak ada baris Receipt.
+        jobs.submit(_cleanup, sorted(baru))
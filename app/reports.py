@@ -0,0 +1,129 @@
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.orm import joinedload, selectinload
+from app import archive, rollups
+from app.models import Customer, Invoice, Expense, MonthlyRollup
+from app.periods import in_period
+
+
+def rollup_query(bulan, tahun):
+    return select(MonthlyRollup).where(MonthlyRollup.tahun == tahun, MonthlyRollup.bulan == bulan)
+
+
+def paid_invoices_query(bulan, tahun, invoice=Invoice.__table__):
+    """Rincian pendapatan (id, nama, jumlah); `invoice` boleh tabel arsip atau gabungan dari archive.invoice_source()."""
+    return (select(invoice.c.id, Customer.nama, invoice.c.jumlah)
+            .outerjoin(Customer, invoice.c.customer_id == Customer.id)
+            .where(invoice.c.tahun == tahun, invoice.c.bulan == bulan, invoice.c.status == 'Lunas'))
+
+
+def expenses_query(bulan, tahun, expense=Expense.__table__):
+    """Rincian pengeluaran (id, deskripsi, jumlah); `expense` seperti pada paid_invoices_query."""
+    return select(expense.c.id, expense.c.deskripsi, expense.c.jumlah).where(in_period(expense.c.tanggal, bulan, tahun))
+
+
+def invoice_list_query(periode=None, status=None, customer_id=None, after=None):
+    """Daftar tagihan terbaru dulu, dengan filter opsional dan keyset `after=(tahun, bulan, id)`."""
+    query = select(Invoice).options(joinedload(Invoice.customer))
+    if periode:
+        query = query.where(Invoice.tahun == periode[0], Invoice.bulan == periode[1])
+    if status:
+        query = query.where(Invoice.status == status)
+    if customer_id:
+        query = query.where(Invoice.customer_id == customer_id)
+    if after:
+        query = query.where(tuple_(Invoice.tahun, Invoice.bulan, Invoice.id) < tuple_(*after))
+    return query.order_by(Invoice.tahun.desc(), Invoice.bulan.desc(), Invoice.id.desc())
+
+
+def customer_list_query(status=None, package_id=None, after=None):
+    """Daftar pelanggan urut nama, dengan filter opsional dan keyset `after=(nama, id)`.
+
+    package_id 0 berarti pelanggan tanpa paket. Paket dimuat dengan satu SELECT ... IN per halaman.
+    """
+    query = select(Customer).options(selectinload(Customer.package))
+    if status:
+        query = query.where(Customer.status == status)
+    if package_id is not None:
+        query = query.where(Customer.package_id == package_id if package_id else Customer.package_id.is_(None))
+    if after:
+        query = query.where(tuple_(Customer.nama, Customer.id) > tuple_(*after))
+    return query.order_by(Customer.nama, Customer.id)
+
+
+def customer_counts_query():
+    """Jumlah pelanggan per (status, package_id) dalam satu query GROUP BY."""
+    return select(Customer.status, Customer.package_id, func.count()).group_by(Customer.status, Customer.package_id)
+
+
+def active_customers_query():
+    return select(func.count(Customer.id)).where(Customer.status == 'Aktif')
+
+
+def dashboard_stats_query(bulan, tahun):
+    """Kartu dashboard dalam satu query: rekap periode dan jumlah pelanggan aktif.
+
+    SUM atas paling banyak satu baris rekap selalu menghasilkan satu baris, jadi periode yang belum
+    punya rekap bernilai nol tanpa query kedua.
+    """
+    kolom = [func.coalesce(func.sum(getattr(MonthlyRollup, col)), 0).label(col) for col in ('pendapatan', 'tunggakan', 'pengeluaran')]
+    return (select(*kolom, active_customers_query().scalar_subquery().label('pelanggan_aktif'))
+            .where(MonthlyRollup.tahun == tahun, MonthlyRollup.bulan == bulan))
+
+
+def recent_invoices_query(limit=5):
+    return select(Invoice).options(joinedload(Invoice.customer)).order_by(Invoice.tanggal_buat.desc()).limit(limit)
+
+
+SHARE_COLUMNS = ('alokasi_belanja', 'setoran_balik_modal', 'dana_siap_bagi', 'bagian_anda', 'bagian_investor')
+
+
+def profit_sharing(awal, akhir, settings):
+    """Bagi hasil tiap bulan dari awal sampai akhir ((tahun, bulan), inklusif) plus totalnya.
+
+    Pendapatan dan pengeluaran semua bulan diambil dari tabel rekap dalam satu query (rollups.get_range);
+    pembagian dihitung per bulan dengan aturan yang sama seperti laporan satu periode, tanpa query lagi.
+    Bulan yang belum mencapai target_pendapatan tidak dibagi (kolom pembagian bernilai 0).
+    Kembalikan {'bulan': [dict per bulan], 'total': dict, 'bulan_tercapai': n}.
+    """
+    bulan = []
+    for tahun, bln, rekap in rollups.get_range(awal, akhir):
+        bagi = settings.bagi_hasil(rekap['pendapatan'])
+        bulan.append({'periode': f"{tahun}-{bln:02d}", 'tahun': tahun, 'bulan': bln,
+                      'pendapatan': rekap['pendapatan'], 'pengeluaran': rekap['pengeluaran'],
+                      'tunggakan': rekap['tunggakan'], 'target_tercapai': bagi is not None,
+                      **{col: bagi[col] if bagi else 0 for col in SHARE_COLUMNS}})
+    total = {col: sum(row[col] for row in bulan) for col in ('pendapatan', 'pengeluaran', 'tunggakan') + SHARE_COLUMNS}
+    return {'bulan': bulan, 'total': total, 'bulan_tercapai': sum(row['target_tercapai'] for row in bulan)}
+
+
+def report_queries(bulan, tahun, arsip=False):
+    """Semua query laporan per periode, dipakai `flask check-query-plans`; `arsip` ikut memeriksa tabel arsip."""
+    queries = {
+        'rekap_bulanan': rollup_query(bulan, tahun),
+        'rincian_pendapatan': paid_invoices_query(bulan, tahun),
+        'rincian_pengeluaran': expenses_query(bulan, tahun),
+        'pelanggan_aktif': active_customers_query(),
+        'kartu_dashboard': dashboard_stats_query(bulan, tahun),
+        'tagihan_terbaru': recent_invoices_query(),
+        'daftar_tagihan': invoice_list_query(after=(tahun, bulan, 1_000_000)).limit(50),
+        'daftar_pelanggan': customer_list_query(after=('M', 1)).limit(50),
+    }
+    if arsip:
+        queries['rincian_pendapatan_arsip'] = paid_invoices_query(bulan, tahun, archive.invoices)
+        queries['rincian_pengeluaran_arsip'] = expenses_query(bulan, tahun, archive.expenses)
+    return queries
+
+
+def full_scans(conn, stmt):
+    """Jalankan EXPLAIN QUERY PLAN; kembalikan baris plan yang men-scan tabel/index penuh.
+
+    Scan index berurutan pada query ber-LIMIT tanpa sort sementara (ORDER BY ... LIMIT n mengikuti
+    index) hanya membaca n entri pertama, jadi tidak dihitung.
+    """
+    compiled = stmt.compile(dialect=conn.dialect)
+    params = compiled.construct_params()
+    args = tuple(str(params[name]) for name in compiled.positiontup)
+    plan = [row[-1] for row in conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + compiled.string, args).fetchall()]
+    bounded = ' LIMIT ' in compiled.string and not any('TEMP B-TREE' in detail for detail in plan)
+    return [detail for detail in plan if detail.startswith('SCAN ') and not detail.startswith('SCAN CONSTANT')
+            and not (bounded and ' USING INDEX ' in detail)]
@@ -0,0 +1,176 @@
+"""Rekap bulanan (MonthlyRollup) yang diperbarui di transaksi yang sama dengan perubahan data.
+
+Semua fungsi di sini hanya menulis ke db.session; commit tetap dilakukan oleh route. Perhitungan ulang
+dari nol ikut membaca tagihan dan pengeluaran terarsip (app/archive.py), jadi rekap selalu lengkap.
+"""
+from sqlalchemy import select, func, case, cast, update, delete, tuple_, Integer
+from sqlalchemy.dialects.sqlite import insert
+from app import archive, db, versions
+from app.models import Invoice, MonthlyRollup, MonthlyExpenseRollup
+from app.periods import iter_months
+
+INVOICE_COLUMNS = ('pendapatan', 'tunggakan', 'tagihan_lunas', 'tagihan_belum_lunas')
+ROLLUP_COLUMNS = INVOICE_COLUMNS + ('pengeluaran',)
+
+
+def _bump(model, keys, deltas):
+    """UPSERT `kolom = kolom + delta` untuk satu baris rekap."""
+    stmt = insert(model).values(**keys, **deltas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={col: getattr(model, col) + stmt.excluded[col] for col in deltas},
+    )
+    db.session.execute(stmt)
+    versions.touch('keuangan')
+
+
+def _invoice_deltas(status, jumlah, sign):
+    if status == 'Lunas':
+        return {'pendapatan': sign * jumlah, 'tagihan_lunas': sign}
+    return {'tunggakan': sign * jumlah, 'tagihan_belum_lunas': sign}
+
+
+def add_invoice(invoice, sign=1):
+    """Tambahkan (sign=1) atau kurangi (sign=-1) kontribusi satu tagihan."""
+    _bump(MonthlyRollup, {'tahun': invoice.tahun, 'bulan': invoice.bulan}, _invoice_deltas(invoice.status, invoice.jumlah, sign))
+
+
+def remove_invoices(*criteria):
+    """Kurangi kontribusi semua tagihan yang memenuhi `criteria` dengan satu INSERT ... SELECT ... ON CONFLICT.
+
+    Panggil sebelum tagihan dihapus (atau sebelum pelanggannya dihapus dan tagihannya ikut terhapus lewat CASCADE).
+    """
+    negatif = [(-agg).label(col) for agg, col in zip(_invoice_aggregates(), INVOICE_COLUMNS)]
+    rows = select(Invoice.tahun, Invoice.bulan, *negatif).where(*criteria).group_by(Invoice.tahun, Invoice.bulan)
+    stmt = insert(MonthlyRollup).from_select(['tahun', 'bulan', *INVOICE_COLUMNS], rows)
+    db.session.execute(stmt.on_conflict_do_update(index_elements=['tahun', 'bulan'],
+                                                  set_={col: getattr(MonthlyRollup, col) + stmt.excluded[col] for col in INVOICE_COLUMNS}))
+    versions.touch('keuangan')
+
+
+def mark_paid(invoice):
+    """Pindahkan tagihan dari tunggakan ke pendapatan. Panggil sebelum status diubah."""
+    if invoice.status == 'Lunas':
+        return
+    deltas = _invoice_deltas('Belum Lunas', invoice.jumlah, -1)
+    deltas.update(_invoice_deltas('Lunas', invoice.jumlah, 1))
+    _bump(MonthlyRollup, {'tahun': invoice.tahun, 'bulan': invoice.bulan}, deltas)
+
+
+def mark_paid_many(rows):
+    """Versi massal mark_paid untuk (tahun, bulan, jumlah) tagihan yang baru saja diubah jadi Lunas; satu UPSERT per periode."""
+    per_periode = {}
+    for tahun, bulan, jumlah in rows:
+        total, jumlah_tagihan = per_periode.get((tahun, bulan), (0, 0))
+        per_periode[(tahun, bulan)] = (total + jumlah, jumlah_tagihan + 1)
+    for (tahun, bulan), (total, jumlah_tagihan) in per_periode.items():
+        _bump(MonthlyRollup, {'tahun': tahun, 'bulan': bulan},
+              {'pendapatan': total, 'tagihan_lunas': jumlah_tagihan, 'tunggakan': -total, 'tagihan_belum_lunas': -jumlah_tagihan})
+
+
+def add_expense(expense, sign=1):
+    """Tambahkan (sign=1) atau kurangi (sign=-1) satu pengeluaran, total dan per kategori."""
+    tahun, bulan, jumlah = expense.tanggal.year, expense.tanggal.month, sign * expense.jumlah
+    _bump(MonthlyRollup, {'tahun': tahun, 'bulan': bulan}, {'pengeluaran': jumlah})
+    _bump(MonthlyExpenseRollup, {'tahun': tahun, 'bulan': bulan, 'kategori': expense.kategori}, {'total': jumlah})
+
+
+def _invoice_aggregates(invoice=Invoice.__table__):
+    lunas = invoice.c.status == 'Lunas'
+    return (func.coalesce(func.sum(case((lunas, invoice.c.jumlah), else_=0)), 0),
+            func.coalesce(func.sum(case((lunas, 0), else_=invoice.c.jumlah)), 0),
+            func.coalesce(func.sum(case((lunas, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((lunas, 0), else_=1)), 0))
+
+
+def _upsert_invoice_columns(rows):
+    """Timpa kolom tagihan untuk baris (tahun, bulan, *nilai INVOICE_COLUMNS)."""
+    values = [dict(zip(INVOICE_COLUMNS, nilai), tahun=tahun, bulan=bulan) for tahun, bulan, *nilai in rows]
+    if not values:
+        return
+    stmt = insert(MonthlyRollup).values(values)
+    db.session.execute(stmt.on_conflict_do_update(index_elements=['tahun', 'bulan'], set_={col: stmt.excluded[col] for col in INVOICE_COLUMNS}))
+
+
+def refresh_period(bulan, tahun):
+    """Hitung ulang kolom tagihan satu periode dari tabel invoice (dipakai setelah operasi massal)."""
+    invoice = archive.invoice_source((tahun, bulan))
+    values = db.session.execute(select(*_invoice_aggregates(invoice)).where(invoice.c.tahun == tahun, invoice.c.bulan == bulan)).one()
+    _upsert_invoice_columns([(tahun, bulan, *values)])
+    versions.touch('keuangan')
+
+
+def reset_invoices():
+    """Nolkan kolom tagihan di semua periode (setelah semua tagihan dihapus); tagihan terarsip tetap dihitung."""
+    db.session.execute(update(MonthlyRollup).values(**{col: 0 for col in INVOICE_COLUMNS}))
+    if archive.reaches():
+        arsip = archive.invoices
+        _upsert_invoice_columns(db.session.execute(select(arsip.c.tahun, arsip.c.bulan, *_invoice_aggregates(arsip))
+                                                   .group_by(arsip.c.tahun, arsip.c.bulan)).all())
+    versions.touch('keuangan')
+
+
+def get_month(bulan, tahun):
+    """Rekap satu periode sebagai dict; periode tanpa data bernilai nol."""
+    row = db.session.get(MonthlyRollup, (tahun, bulan))
+    return {col: getattr(row, col) if row else 0 for col in ROLLUP_COLUMNS}
+
+
+def get_range(awal, akhir):
+    """Rekap tiap bulan dari awal sampai akhir ((tahun, bulan), inklusif) dalam satu query.
+
+    Kembalikan list (tahun, bulan, dict) berurutan; bulan tanpa data diisi nol.
+    """
+    key = tuple_(MonthlyRollup.tahun, MonthlyRollup.bulan)
+    rows = db.session.execute(select(MonthlyRollup.tahun, MonthlyRollup.bulan, *[getattr(MonthlyRollup, col) for col in ROLLUP_COLUMNS])
+                              .where(key >= tuple_(*awal), key <= tuple_(*akhir)))
+    found = {(tahun, bulan): dict(zip(ROLLUP_COLUMNS, values)) for tahun, bulan, *values in rows}
+    zero = dict.fromkeys(ROLLUP_COLUMNS, 0)
+    return [(tahun, bulan, found.get((tahun, bulan), zero)) for tahun, bulan in iter_months(awal, akhir)]
+
+
+def compute_rollups():
+    """Hitung rekap dari nol: ({(tahun, bulan): {kolom: nilai}}, {(tahun, bulan, kategori): total})."""
+    months, kategori = {}, {}
+    invoice, expense = archive.invoice_source(), archive.expense_source()
+    q = select(invoice.c.tahun, invoice.c.bulan, *_invoice_aggregates(invoice)).group_by(invoice.c.tahun, invoice.c.bulan)
+    for tahun, bulan, *values in db.session.execute(q):
+        months[(tahun, bulan)] = dict(zip(INVOICE_COLUMNS, values), pengeluaran=0)
+    tahun_exp = cast(func.strftime('%Y', expense.c.tanggal), Integer)
+    bulan_exp = cast(func.strftime('%m', expense.c.tanggal), Integer)
+    q = select(tahun_exp, bulan_exp, expense.c.kategori, func.sum(expense.c.jumlah)).group_by(tahun_exp, bulan_exp, expense.c.kategori)
+    for tahun, bulan, kat, total in db.session.execute(q):
+        kategori[(tahun, bulan, kat)] = total
+        month = months.setdefault((tahun, bulan), dict.fromkeys(ROLLUP_COLUMNS, 0))
+        month['pengeluaran'] += total
+    return months, kategori
+
+
+def find_drift():
+    """Bandingkan rekap tersimpan dengan hasil hitung ulang. Kembalikan daftar pesan selisih."""
+    months, kategori = compute_rollups()
+    stored = {(r.tahun, r.bulan): {col: getattr(r, col) for col in ROLLUP_COLUMNS} for r in MonthlyRollup.query.all()}
+    stored_kat = {(r.tahun, r.bulan, r.kategori): r.total for r in MonthlyExpenseRollup.query.all()}
+    drift = []
+    zero = dict.fromkeys(ROLLUP_COLUMNS, 0)
+    for key in sorted(set(months) | set(stored)):
+        expected, actual = months.get(key, zero), stored.get(key, zero)
+        for col in ROLLUP_COLUMNS:
+            if expected[col] != actual[col]:
+                drift.append(f"{key[1]:02d}/{key[0]} {col}: tersimpan {actual[col]}, seharusnya {expected[col]}")
+    for key in sorted(set(kategori) | set(stored_kat)):
+        if kategori.get(key, 0) != stored_kat.get(key, 0):
+            drift.append(f"{key[1]:02d}/{key[0]} pengeluaran {key[2]}: tersimpan {stored_kat.get(key, 0)}, seharusnya {kategori.get(key, 0)}")
+    return drift
+
+
+def rebuild():
+    """Ganti seluruh isi tabel rekap dengan hasil hitung ulang."""
+    months, kategori = compute_rollups()
+    db.session.execute(delete(MonthlyRollup))
+    db.session.execute(delete(MonthlyExpenseRollup))
+    versions.touch('keuangan')
+    if months:
+        db.session.execute(insert(MonthlyRollup), [dict(tahun=t, bulan=b, **v) for (t, b), v in months.items()])
+    if kategori:
+        db.session.execute(insert(MonthlyExpenseRollup), [{'tahun': t, 'bulan': b, 'kategori': k, 'total': v} for (t, b, k), v in kategori.items()])
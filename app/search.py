@@ -0,0 +1,65 @@
+"""Pencarian pelanggan lewat tabel FTS5 `customer_fts` (nama, alamat, telepon).
+
+Tabel dan trigger sinkronisasinya dibuat oleh migrasi; FTS_SCHEMA di bawah adalah salinan yang sama
+untuk database sementara (benchmark).
+"""
+import re
+from sqlalchemy import select, func, table, column, literal_column
+from app.models import Customer
+
+
+def _phone_sql(col):
+    """Ekspresi SQL yang sama dengan normalize_phone(): digit saja, awalan 62 jadi 0."""
+    digits = f"replace(replace(replace(replace(replace(replace({col}, ' ', ''), '-', ''), '+', ''), '.', ''), '(', ''), ')', '')"
+    return f"CASE WHEN {digits} LIKE '62%' THEN '0' || substr({digits}, 3) ELSE {digits} END"
+
+
+FTS_SCHEMA = [
+    f"CREATE VIEW customer_search_src AS SELECT id, nama, alamat, {_phone_sql('telepon')} AS telepon FROM customer",
+    """CREATE VIRTUAL TABLE customer_fts USING fts5(
+        nama, alamat, telepon,
+        content='customer_search_src', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')""",
+    f"""CREATE TRIGGER customer_fts_ai AFTER INSERT ON customer BEGIN
+        INSERT INTO customer_fts(rowid, nama, alamat, telepon) VALUES (new.id, new.nama, new.alamat, {_phone_sql('new.telepon')});
+    END""",
+    f"""CREATE TRIGGER customer_fts_ad AFTER DELETE ON customer BEGIN
+        INSERT INTO customer_fts(customer_fts, rowid, nama, alamat, telepon) VALUES ('delete', old.id, old.nama, old.alamat, {_phone_sql('old.telepon')});
+    END""",
+    f"""CREATE TRIGGER customer_fts_au AFTER UPDATE OF nama, alamat, telepon ON customer BEGIN
+        INSERT INTO customer_fts(customer_fts, rowid, nama, alamat, telepon) VALUES ('delete', old.id, old.nama, old.alamat, {_phone_sql('old.telepon')});
+        INSERT INTO customer_fts(rowid, nama, alamat, telepon) VALUES (new.id, new.nama, new.alamat, {_phone_sql('new.telepon')});
+    END""",
+    "INSERT INTO customer_fts(customer_fts) VALUES ('rebuild')",
+]
+
+customer_fts = table('customer_fts', column('rowid'))
+_fts = literal_column('customer_fts')
+_PHONE = re.compile(r'^[\d\s+().-]+$')
+
+
+def normalize_phone(value):
+    """Nomor telepon jadi digit saja; awalan 62 diganti 0."""
+    digits = re.sub(r'\D', '', value or '')
+    return '0' + digits[2:] if digits.startswith('62') else digits
+
+
+def fts_query(text):
+    """Ubah input bebas jadi query FTS5: setiap kata jadi prefix, semua kata wajib ada (AND)."""
+    text = (text or '').strip()
+    if _PHONE.match(text) and any(ch.isdigit() for ch in text):
+        terms = [normalize_phone(text)]
+    else:
+        terms = re.findall(r'\w+', text)
+    return ' '.join(f'"{term}"*' for term in terms if term)
+
+
+def search_query(text):
+    """Select Customer yang cocok, diurutkan relevansi (bm25: nama > telepon > alamat). None jika input kosong."""
+    match = fts_query(text)
+    if not match:
+        return None
+    ranked = (select(customer_fts.c.rowid.label('id'), func.bm25(_fts, 10.0, 3.0, 5.0).label('skor'))
+              .where(_fts.op('MATCH')(match))
+              .subquery())
+    return select(Customer).join(ranked, Customer.id == ranked.c.id).order_by(ranked.c.skor)
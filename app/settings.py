@@ -0,0 +1,66 @@
+"""Pengaturan bagi hasil sebagai objek bertipe yang di-cache per proses.
+
+Cache dibatalkan lewat DataVersion 'pengaturan': tiap request cukup satu SELECT versi, dan tabel
+`setting` hanya dibaca ulang jika ada proses yang menyimpan pengaturan baru.
+"""
+from dataclasses import dataclass, asdict, fields
+from flask import g
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from app import db, versions
+from app.models import Setting
+
+
+@dataclass(frozen=True)
+class Settings:
+    target_pendapatan: int = 6500000
+    alokasi_belanja: int = 3000000
+    setoran_balik_modal: int = 2500000
+    persen_anda: float = 80.0
+    persen_investor: float = 20.0
+
+    @classmethod
+    def from_strings(cls, values):
+        """Bangun dari nilai string tabel `setting`; kunci yang tidak ada memakai default."""
+        return cls(**{f.name: f.type(values[f.name]) for f in fields(cls) if f.name in values})
+
+    def as_dict(self):
+        return asdict(self)
+
+    def bagi_hasil(self, pendapatan_kotor):
+        """Rincian bagi hasil untuk pendapatan kotor tertentu, atau None jika target belum tercapai."""
+        if pendapatan_kotor < self.target_pendapatan:
+            return None
+        dana_siap_bagi = pendapatan_kotor - self.alokasi_belanja - self.setoran_balik_modal
+        return {'alokasi_belanja': self.alokasi_belanja, 'setoran_balik_modal': self.setoran_balik_modal,
+                'dana_siap_bagi': dana_siap_bagi, 'persen_anda': self.persen_anda, 'persen_investor': self.persen_investor,
+                'bagian_anda': dana_siap_bagi * (self.persen_anda / 100),
+                'bagian_investor': dana_siap_bagi * (self.persen_investor / 100)}
+
+
+_cache = (None, None)  # (versi, Settings), diganti utuh supaya aman dibaca dari banyak thread
+
+
+def get_settings():
+    """Pengaturan terkini. Versi diperiksa sekali per request (disimpan di flask.g)."""
+    global _cache
+    if 'settings' in g:
+        return g.settings
+    versi = versions.current('pengaturan')['pengaturan']
+    cached_versi, settings = _cache
+    if settings is None or cached_versi != versi:
+        settings = Settings.from_strings(dict(db.session.execute(select(Setting.key, Setting.value)).all()))
+        _cache = (versi, settings)
+    g.settings = settings
+    return settings
+
+
+def save_settings(values):
+    """Simpan semua nilai dengan satu UPSERT dan naikkan versi 'pengaturan'. Commit diserahkan ke pemanggil."""
+    names = {f.name for f in fields(Settings)}
+    rows = [{'key': key, 'value': str(value)} for key, value in values.items() if key in names]
+    if rows:
+        stmt = insert(Setting).values(rows)
+        db.session.execute(stmt.on_conflict_do_update(index_elements=['key'], set_={'value': stmt.excluded.value}))
+        versions.touch('pengaturan')
+    g.pop('settings', None)
@@ -0,0 +1,48 @@
+"""PRAGMA SQLite yang dipasang di setiap koneksi baru lewat event `connect`.
+
+Bawaan: WAL (pembaca tidak menunggu penulis), synchronous=NORMAL, busy_timeout agar penulis
+bersamaan menunggu alih-alih "database is locked", cache dan mmap yang lebih besar, temp_store di
+memori, dan foreign key ditegakkan. Setiap nilai bisa diganti lewat environment SQLITE_<NAMA>, mis. SQLITE_BUSY_TIMEOUT=10000;
+nilai kosong berarti PRAGMA itu tidak dikirim.
+"""
+import os
+from sqlalchemy import event
+
+DEFAULT_PRAGMAS = {
+    'busy_timeout': '5000',     # dipasang pertama: pergantian journal_mode sendiri butuh kunci tulis
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': '-20000',     # negatif = KiB, jadi sekitar 20 MB per koneksi
+    'mmap_size': '268435456',   # 256 MB
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',       # ON DELETE CASCADE / SET NULL di invoice dan customer
+}
+
+
+def pragmas_from_env(environ=os.environ):
+    """DEFAULT_PRAGMAS yang sudah ditimpa environment; PRAGMA bernilai kosong dibuang."""
+    pragmas = {name: environ.get(f'SQLITE_{name.upper()}', value) for name, value in DEFAULT_PRAGMAS.items()}
+    return {name: value for name, value in pragmas.items() if value != ''}
+
+
+def install(engine, pragmas):
+    """Pasang PRAGMA di setiap koneksi DBAPI baru milik engine (hanya untuk SQLite)."""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+
+def optimize(connection, checkpoint=True):
+    """Jalankan PRAGMA optimize dan (opsional) checkpoint WAL. Kembalikan hasil checkpoint (busy, log, checkpointed)."""
+    connection.exec_driver_sql('PRAGMA optimize')
+    if checkpoint:
+        return tuple(connection.exec_driver_sql('PRAGMA wal_checkpoint(TRUNCATE)').one())
+    return None
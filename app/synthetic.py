@@ -0,0 +1,111 @@
+"""Data sintetis WISP untuk benchmark dan uji beban: paket, pelanggan, tagihan bulanan, pengeluaran.
+
+Semua baris ditulis dengan INSERT executemany per batch, lalu rekap bulanan dibangun ulang sekali.
+Hasilnya deterministik untuk `seed` yang sama. Commit diserahkan ke pemanggil.
+"""
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select, func
+from app import db, rollups, versions
+from app.models import Customer, ServicePackage, Invoice, Expense
+from app.periods import add_months, month_index
+
+BATCH_SIZE = 20000
+PACKAGES = [('Hemat 10 Mbps', 10, 150000), ('Rumahan 20 Mbps', 20, 200000), ('Keluarga 30 Mbps', 30, 250000),
+            ('Bisnis 50 Mbps', 50, 400000), ('Premium 100 Mbps', 100, 600000)]
+PACKAGE_WEIGHTS = [35, 30, 20, 10, 5]
+DEPAN = ['Budi', 'Siti', 'Agus', 'Dewi', 'Joko', 'Rina', 'Andi', 'Sri', 'Eko', 'Wati', 'Hendra', 'Yuni', 'Bambang', 'Ratna', 'Dedi', 'Lilis']
+BELAKANG = ['Santoso', 'Aminah', 'Saputra', 'Lestari', 'Widodo', 'Rahayu', 'Hidayat', 'Susanti', 'Prasetyo', 'Kurniawan', 'Setiawan', 'Wulandari']
+JALAN = ['Mawar', 'Melati', 'Kenanga', 'Anggrek', 'Sudirman', 'Diponegoro', 'Merdeka', 'Pahlawan', 'Cempaka', 'Kartini']
+EXPENSES = [('Operasional', 'Bayar bandwidth upstream', 1500000, 2500000), ('Operasional', 'Listrik tower', 300000, 600000),
+            ('Perangkat', 'Beli router pelanggan', 250000, 900000), ('Perangkat', 'Kabel dan konektor', 100000, 400000),
+            ('Gaji', 'Gaji teknisi', 1500000, 2500000), ('Lainnya', 'Transport pemasangan', 50000, 200000)]
+
+
+def _batched(rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(model, rows):
+    # Core executemany lewat koneksi session: bulk insert ORM memecah batch setiap kali kolom bernilai None berubah.
+    count, conn = 0, db.session.connection()
+    for batch in _batched(rows):
+        conn.execute(insert(model.__table__), batch)
+        count += len(batch)
+    return count
+
+
+def _package_prices():
+    """Paket sintetis yang belum ada ditambahkan; kembalikan [(id, harga)] sesuai urutan PACKAGES."""
+    ada = {nama: (package_id, harga) for package_id, nama, harga in db.session.execute(select(ServicePackage.id, ServicePackage.nama_paket, ServicePackage.harga))}
+    baru = [{'nama_paket': nama, 'kecepatan': kecepatan, 'harga': harga} for nama, kecepatan, harga in PACKAGES if nama not in ada]
+    if baru:
+        db.session.execute(insert(ServicePackage), baru)
+        versions.touch('paket')
+        ada = {nama: (package_id, harga) for package_id, nama, harga in db.session.execute(select(ServicePackage.id, ServicePackage.nama_paket, ServicePackage.harga))}
+    return [ada[nama] for nama, _, _ in PACKAGES]
+
+
+def seed(customers, years, seed=42, today=None):
+    """Buat `customers` pelanggan dengan riwayat tagihan dan pengeluaran `years` tahun sampai bulan ini."""
+    rnd = random.Random(seed)
+    today = today or datetime.utcnow()
+    akhir = (today.year, today.month)
+    awal = add_months(*akhir, 1 - 12 * years)
+    bulan_total = month_index(*akhir) - month_index(*awal) + 1
+    paket = _package_prices()
+    first_id = (db.session.scalar(select(func.max(Customer.id))) or 0) + 1
+
+    # Pelanggan: sebagian besar bergabung di awal, sisanya tersebar; sebagian berhenti (Nonaktif) atau diisolir.
+    pelanggan = []
+    for i in range(customers):
+        mulai = 0 if rnd.random() < 0.4 else rnd.randrange(bulan_total)
+        status = rnd.choices(('Aktif', 'Nonaktif', 'Isolir'), weights=(85, 10, 5))[0]
+        berhenti = rnd.randrange(mulai, bulan_total) if status == 'Nonaktif' else bulan_total
+        package_id, harga = rnd.choices(paket, weights=PACKAGE_WEIGHTS)[0]
+        pelanggan.append((first_id + i, mulai, berhenti, status, package_id, harga))
+
+    def customer_rows():
+        for customer_id, mulai, _, status, package_id, _ in pelanggan:
+            tahun, bulan = add_months(*awal, mulai)
+            yield {'id': customer_id, 'nama': f'{rnd.choice(DEPAN)} {rnd.choice(BELAKANG)}',
+                   'alamat': f'Jalan {rnd.choice(JALAN)} {rnd.randint(1, 200)} RT {rnd.randint(1, 12):02d}',
+                   'telepon': f'0899{customer_id:08d}', 'package_id': package_id, 'status': status,
+                   'tanggal_bergabung': datetime(tahun, bulan, rnd.randint(1, 28))}
+
+    def invoice_rows():
+        for customer_id, mulai, berhenti, status, _, harga in pelanggan:
+            for n in range(mulai, berhenti):
+                tahun, bulan = add_months(*awal, n)
+                dibuat = datetime(tahun, bulan, 1)
+                sisa = bulan_total - n
+                # Bulan lama hampir semua lunas; bulan berjalan dan pelanggan isolir lebih banyak menunggak.
+                peluang_lunas = 0.5 if sisa == 1 else 0.8 if sisa <= 3 or status == 'Isolir' else 0.97
+                lunas = rnd.random() < peluang_lunas
+                yield {'customer_id': customer_id, 'bulan': bulan, 'tahun': tahun, 'jumlah': harga,
+                       'status': 'Lunas' if lunas else 'Belum Lunas', 'tanggal_buat': dibuat,
+                       'tanggal_lunas': dibuat + timedelta(days=rnd.randint(0, 20), hours=rnd.randint(8, 20)) if lunas else None}
+
+    def expense_rows():
+        skala = max(customers // 100, 1)  # pengeluaran ikut membesar dengan jumlah pelanggan
+        for n in range(bulan_total):
+            tahun, bulan = add_months(*awal, n)
+            for kategori, deskripsi, minimum, maksimum in EXPENSES:
+                for _ in range(rnd.randint(1, 2) * (skala if kategori == 'Perangkat' else 1)):
+                    yield {'deskripsi': deskripsi, 'kategori': kategori, 'jumlah': rnd.randrange(minimum, maksimum, 1000),
+                           'tanggal': datetime(tahun, bulan, rnd.randint(1, 28))}
+
+    hasil = {'pelanggan': _insert(Customer, customer_rows()),
+             'tagihan': _insert(Invoice, invoice_rows()),
+             'pengeluaran': _insert(Expense, expense_rows()),
+             'periode': f"{awal[0]}-{awal[1]:02d} s.d. {akhir[0]}-{akhir[1]:02d}"}
+    rollups.rebuild()
+    versions.touch('pelanggan')
+    return hasil
@@ -0,0 +1,35 @@
+"""Penanda versi data per area ('keuangan', 'pelanggan', 'paket', 'pengaturan') untuk ETag dan invalidasi cache.
+
+`touch()` cukup dipanggil di tengah transaksi; kenaikan versi ditulis sekali saat commit.
+"""
+from sqlalchemy import event, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app import db
+from app.models import DataVersion
+
+_PENDING = 'data_versions'
+
+
+def touch(*names):
+    db.session.info.setdefault(_PENDING, set()).update(names)
+
+
+def current(*names):
+    """Versi sekarang sebagai dict {nama: versi}; nama yang belum pernah disentuh bernilai 0."""
+    rows = dict(db.session.execute(select(DataVersion.nama, DataVersion.versi).where(DataVersion.nama.in_(names))).all())
+    return {name: rows.get(name, 0) for name in names}
+
+
+@event.listens_for(Session, 'before_commit')
+def _bump_pending(session):
+    names = session.info.pop(_PENDING, None)
+    if not names:
+        return
+    stmt = insert(DataVersion).values([{'nama': name, 'versi': 1} for name in sorted(names)])
+    session.execute(stmt.on_conflict_do_update(index_elements=['nama'], set_={'versi': DataVersion.versi + 1}))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_pending(session):
+    session.info.pop(_PENDING, None)
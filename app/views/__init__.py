@@ -0,0 +1,4 @@
+"""Blueprint per area. Endpoint ditulis `<area>.<fungsi>`, mis. url_for('invoices.index')."""
+from app.views import auth, dashboard, customers, packages, invoices, jobs, imports, expenses, reports, settings, metrics
+
+BLUEPRINTS = [auth.bp, dashboard.bp, customers.bp, packages.bp, invoices.bp, jobs.bp, imports.bp, expenses.bp, reports.bp, settings.bp, metrics.bp]
@@ -0,0 +1,30 @@
+from flask import Blueprint, render_template, url_for, flash, redirect, request
+from flask_login import login_user, current_user, logout_user
+from app import bcrypt, identity
+from app.models import User
+from app.forms import LoginForm
+
+bp = Blueprint('auth', __name__)
+
+
+@bp.route("/login", methods=['GET', 'POST'])
+def login():
+    if current_user.is_authenticated: return redirect(url_for('dashboard.index'))
+    form = LoginForm()
+    if form.validate_on_submit():
+        user = User.query.filter_by(email=form.email.data).first()
+        if user and bcrypt.check_password_hash(user.password, form.password.data):
+            login_user(user, remember=form.remember.data)
+            next_page = request.args.get('next')
+            return redirect(next_page) if next_page else redirect(url_for('dashboard.index'))
+        else:
+            flash('Login Gagal. Silakan periksa email dan password.', 'danger')
+    return render_template('login.html', title='Login', form=form)
+
+
+@bp.route("/logout")
+def logout():
+    if current_user.is_authenticated:
+        identity.forget(current_user.get_id())
+    logout_user()
+    return redirect(url_for('auth.login'))
@@ -0,0 +1,162 @@
+from flask import Blueprint, render_template, url_for, flash, redirect, request, jsonify, abort
+from flask_login import login_required
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from app import db, versions
+from app.models import Customer, ServicePackage
+from app.billing import delete_customers
+from app.forms import CustomerForm, BulkDeleteCustomersForm
+from app.reports import customer_list_query, customer_counts_query
+from app.search import search_query
+
+bp = Blueprint('customers', __name__)
+
+CUSTOMER_PAGE_SIZE = 50
+MAX_CUSTOMER_PAGE_SIZE = 200
+MAX_BULK_DELETE = 500
+STATUSES = ('Aktif', 'Nonaktif', 'Isolir')
+
+# Cache per proses yang diganti utuh (aman dibaca dari banyak thread), dibatalkan lewat DataVersion:
+# pilihan paket oleh versi 'paket', jumlah pelanggan per status/paket oleh versi 'pelanggan'.
+_packages = (None, None)  # (versi, [(id, nama_paket)])
+_counts = (None, None)    # (versi, {'total', 'status', 'paket'})
+
+
+def package_choices(versi=None):
+    """[(id, nama_paket)] urut nama; tabel paket hanya dibaca ulang setelah paket ditambah/diubah/dihapus."""
+    global _packages
+    versi = versi if versi is not None else versions.current('paket')['paket']
+    cached_versi, choices = _packages
+    if choices is None or cached_versi != versi:
+        choices = db.session.execute(select(ServicePackage.id, ServicePackage.nama_paket).order_by(ServicePackage.nama_paket)).all()
+        choices = [(package_id, nama) for package_id, nama in choices]
+        _packages = (versi, choices)
+    return choices
+
+
+def customer_counts(versi):
+    """Jumlah pelanggan total, per status, dan per package_id (None = tanpa paket)."""
+    global _counts
+    cached_versi, counts = _counts
+    if counts is None or cached_versi != versi:
+        counts = {'total': 0, 'status': dict.fromkeys(STATUSES, 0), 'paket': {}}
+        for status, package_id, jumlah in db.session.execute(customer_counts_query()):
+            counts['total'] += jumlah
+            counts['status'][status] = counts['status'].get(status, 0) + jumlah
+            counts['paket'][package_id] = counts['paket'].get(package_id, 0) + jumlah
+        _counts = (versi, counts)
+    return counts
+
+
+def _form_choices(form):
+    form.package_id.choices = [(0, "--- Pilih Paket (Opsional) ---")] + package_choices()
+
+
+@bp.route('/customers')
+@login_required
+def index():
+    search = request.args.get('search')
+    status = request.args.get('status') if request.args.get('status') in STATUSES else None
+    package_id = request.args.get('paket', type=int)
+    limit = min(max(request.args.get('limit', CUSTOMER_PAGE_SIZE, type=int), 1), MAX_CUSTOMER_PAGE_SIZE)
+    versi = versions.current('pelanggan', 'paket')
+    query = search_query(search) if search else None
+    next_url = None
+    filters = {k: v for k, v in {'search': search, 'status': status, 'paket': package_id, 'limit': request.args.get('limit', type=int)}.items() if v is not None and v != ''}
+    if query is not None:
+        # Hasil pencarian urut relevansi: cukup halaman pertama, sisanya dengan kata kunci yang lebih spesifik.
+        if status:
+            query = query.where(Customer.status == status)
+        if package_id is not None:
+            query = query.where(Customer.package_id == package_id if package_id else Customer.package_id.is_(None))
+        rows = db.session.scalars(query.options(selectinload(Customer.package)).limit(limit + 1)).all()
+        page, terpotong = rows[:limit], len(rows) > limit
+    else:
+        after = None
+        after_id = request.args.get('after', type=int)
+        if after_id:
+            nama = db.session.scalar(select(Customer.nama).where(Customer.id == after_id))
+            after = (nama, after_id) if nama is not None else None
+        rows = db.session.scalars(customer_list_query(status, package_id, after).limit(limit + 1)).all()
+        page, terpotong = rows[:limit], False
+        if len(rows) > limit:
+            next_url = url_for('customers.index', after=page[-1].id, **filters)
+    return render_template('customers.html', customers=page, counts=customer_counts(versi['pelanggan']),
+                           packages=package_choices(versi['paket']), filters=filters, next_url=next_url, terpotong=terpotong,
+                           bulk_form=BulkDeleteCustomersForm())
+
+
+@bp.route('/api/customers/search')
+@login_required
+def search():
+    query = search_query(request.args.get('q'))
+    if query is None:
+        return jsonify({'results': []})
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+    return jsonify({'results': [{'id': c.id, 'nama': c.nama, 'alamat': c.alamat, 'telepon': c.telepon, 'status': c.status}
+                                for c in db.session.scalars(query.limit(limit))]})
+
+
+@bp.route('/customer/add', methods=['GET', 'POST'])
+@login_required
+def add():
+    form = CustomerForm()
+    _form_choices(form)
+    if form.validate_on_submit():
+        pkg_id = form.package_id.data if form.package_id.data != 0 else None
+        new_customer = Customer(nama=form.nama.data, alamat=form.alamat.data, telepon=form.telepon.data, package_id=pkg_id, status=form.status.data, tanggal_bergabung=form.tanggal_bergabung.data)
+        db.session.add(new_customer)
+        versions.touch('pelanggan')
+        db.session.commit()
+        flash('Pelanggan baru berhasil ditambahkan!', 'success')
+        return redirect(url_for('customers.index'))
+    return render_template('customer_form.html', title='Tambah Pelanggan', form=form)
+
+
+@bp.route('/customer/<int:customer_id>/update', methods=['GET', 'POST'])
+@login_required
+def update(customer_id):
+    customer = Customer.query.get_or_404(customer_id)
+    form = CustomerForm()
+    _form_choices(form)
+    if form.validate_on_submit():
+        pkg_id = form.package_id.data if form.package_id.data != 0 else None
+        customer.nama, customer.alamat, customer.telepon, customer.package_id, customer.status, customer.tanggal_bergabung = form.nama.data, form.alamat.data, form.telepon.data, pkg_id, form.status.data, form.tanggal_bergabung.data
+        versions.touch('pelanggan')
+        db.session.commit()
+        flash('Data pelanggan berhasil diperbarui!', 'success')
+        return redirect(url_for('customers.index'))
+    elif request.method == 'GET':
+        form.nama.data, form.alamat.data, form.telepon.data, form.package_id.data, form.status.data, form.tanggal_bergabung.data = customer.nama, customer.alamat, customer.telepon, customer.package_id or 0, customer.status, customer.tanggal_bergabung
+    return render_template('customer_form.html', title='Edit Pelanggan', form=form)
+
+
+@bp.route('/customer/<int:customer_id>/delete', methods=['POST'])
+@login_required
+def delete(customer_id):
+    if not delete_customers([customer_id]):
+        abort(404)
+    db.session.commit()
+    flash('Pelanggan berhasil dihapus.', 'info')
+    return redirect(url_for('customers.index'))
+
+
+@bp.route('/customers/delete-bulk', methods=['POST'])
+@login_required
+def delete_bulk():
+    """Hapus pelanggan terpilih (customer_ids[]) beserta tagihan dan notanya dalam jumlah statement tetap."""
+    form = BulkDeleteCustomersForm()
+    if not form.validate_on_submit():
+        flash('Permintaan tidak valid.', 'danger')
+        return redirect(url_for('customers.index'))
+    ids = list(dict.fromkeys(int(raw) for raw in request.form.getlist('customer_ids') if raw.isdigit()))
+    if len(ids) > MAX_BULK_DELETE:
+        flash(f'Maksimal {MAX_BULK_DELETE} pelanggan per penghapusan massal.', 'danger')
+        return redirect(url_for('customers.index'))
+    dihapus = delete_customers(ids)
+    db.session.commit()
+    if dihapus:
+        flash(f'{dihapus} pelanggan beserta tagihannya berhasil dihapus.', 'info')
+    else:
+        flash('Tidak ada pelanggan yang dipilih.', 'info')
+    return redirect(url_for('customers.index', **request.args))
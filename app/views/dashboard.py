@@ -0,0 +1,76 @@
+from datetime import datetime
+from flask import Blueprint, render_template, request, Response, jsonify, get_template_attribute
+from flask_login import login_required
+from app import db, rollups, versions
+from app.periods import parse_period, check_period, add_months, month_index
+from app.reports import dashboard_stats_query, recent_invoices_query
+
+bp = Blueprint('dashboard', __name__)
+
+MAX_SUMMARY_MONTHS = 120
+
+# (kunci, (kartu, tagihan terbaru)) dalam HTML jadi, diganti utuh supaya aman dibaca dari banyak thread.
+# Kunci memuat versi 'keuangan' (tagihan, pengeluaran) dan 'pelanggan', jadi setiap penulisan yang
+# memengaruhi isinya membuat fragmen dirender ulang; tanpa penulisan, dashboard cukup satu query versi.
+_fragments = (None, None)
+
+
+def _dashboard_fragments(bulan, tahun):
+    global _fragments
+    versi = versions.current('keuangan', 'pelanggan')
+    kunci = (tahun, bulan, versi['keuangan'], versi['pelanggan'])
+    cached_kunci, fragments = _fragments
+    if cached_kunci != kunci:
+        row = db.session.execute(dashboard_stats_query(bulan, tahun)).one()
+        stats = {'revenue_current_month': row.pendapatan, 'unpaid_current_month': row.tunggakan,
+                 'expense_current_month': row.pengeluaran, 'active_customers': row.pelanggan_aktif}
+        recent_invoices = db.session.scalars(recent_invoices_query()).all()
+        fragments = (get_template_attribute('dashboard_fragments.html', 'kartu')(stats),
+                     get_template_attribute('dashboard_fragments.html', 'tagihan_terbaru')(recent_invoices))
+        _fragments = (kunci, fragments)
+    return fragments
+
+
+@bp.route("/")
+@bp.route("/dashboard")
+@login_required
+def index():
+    now = datetime.utcnow()
+    kartu, tagihan_terbaru = _dashboard_fragments(now.month, now.year)
+    return render_template('dashboard.html', kartu=kartu, tagihan_terbaru=tagihan_terbaru, current_month_name=now.strftime('%B'), current_year=now.year)
+
+
+def _summary_error(pesan):
+    return jsonify({'error': pesan}), 400
+
+
+@bp.route("/api/financial_summary")
+@login_required
+def financial_summary():
+    today = datetime.utcnow()
+    try:
+        akhir = parse_period(request.args['to']) if 'to' in request.args else (today.year, today.month)
+        awal = parse_period(request.args['from']) if 'from' in request.args else None
+    except ValueError:
+        return _summary_error('Format periode harus YYYY-MM.')
+    if awal is None:
+        months = request.args.get('months', 6, type=int)
+        if not 1 <= months <= MAX_SUMMARY_MONTHS:
+            return _summary_error(f'Rentang harus 1 sampai {MAX_SUMMARY_MONTHS} bulan.')
+        try:
+            awal = check_period(*add_months(*akhir, 1 - months))
+        except ValueError:
+            return _summary_error('Rentang tidak boleh dimulai sebelum 0001-01.')
+    if not 1 <= month_index(*akhir) - month_index(*awal) + 1 <= MAX_SUMMARY_MONTHS:
+        return _summary_error(f'Rentang harus 1 sampai {MAX_SUMMARY_MONTHS} bulan.')
+    etag = f"keuangan-{versions.current('keuangan')['keuangan']}-{awal[0]}{awal[1]:02d}-{akhir[0]}{akhir[1]:02d}"
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        rows = rollups.get_range(awal, akhir)
+        response = jsonify({'labels': [datetime(tahun, bulan, 1).strftime("%b %Y") for tahun, bulan, _ in rows],
+                            'revenue': [rekap['pendapatan'] for _, _, rekap in rows],
+                            'expenses': [rekap['pengeluaran'] for _, _, rekap in rows]})
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -0,0 +1,58 @@
+from flask import Blueprint, render_template, url_for, flash, redirect, request
+from flask_login import login_required
+from app import db, rollups
+from app.models import Expense
+from app.forms import ExpenseForm
+
+bp = Blueprint('expenses', __name__)
+
+
+@bp.route('/expenses', methods=['GET'])
+@login_required
+def index():
+    form = ExpenseForm()
+    all_expenses = Expense.query.order_by(Expense.tanggal.desc()).all()
+    return render_template('expenses.html', expenses=all_expenses, form=form)
+
+
+@bp.route('/expense/add', methods=['POST'])
+@login_required
+def add():
+    form = ExpenseForm()
+    if form.validate_on_submit():
+        expense = Expense(deskripsi=form.deskripsi.data, jumlah=form.jumlah.data, kategori=form.kategori.data, tanggal=form.tanggal.data)
+        db.session.add(expense)
+        rollups.add_expense(expense)
+        db.session.commit()
+        flash('Pengeluaran baru berhasil ditambahkan!', 'success')
+    else:
+        flash('Gagal menambahkan pengeluaran. Periksa kembali data Anda.', 'danger')
+    return redirect(url_for('expenses.index'))
+
+
+@bp.route('/expense/<int:expense_id>/edit', methods=['GET', 'POST'])
+@login_required
+def edit(expense_id):
+    expense = Expense.query.get_or_404(expense_id)
+    form = ExpenseForm()
+    if form.validate_on_submit():
+        rollups.add_expense(expense, -1)
+        expense.tanggal, expense.deskripsi, expense.kategori, expense.jumlah = form.tanggal.data, form.deskripsi.data, form.kategori.data, form.jumlah.data
+        rollups.add_expense(expense)
+        db.session.commit()
+        flash('Data pengeluaran berhasil diperbarui!', 'success')
+        return redirect(url_for('expenses.index'))
+    elif request.method == 'GET':
+        form.tanggal.data, form.deskripsi.data, form.kategori.data, form.jumlah.data = expense.tanggal, expense.deskripsi, expense.kategori, expense.jumlah
+    return render_template('edit_expense.html', form=form)
+
+
+@bp.route('/expense/<int:expense_id>/delete', methods=['POST'])
+@login_required
+def delete(expense_id):
+    expense = Expense.query.get_or_404(expense_id)
+    rollups.add_expense(expense, -1)
+    db.session.delete(expense)
+    db.session.commit()
+    flash('Pengeluaran berhasil dihapus.', 'info')
+    return redirect(url_for('expenses.index'))
@@ -0,0 +1,35 @@
+import os
+import secrets
+from flask import Blueprint, render_template, url_for, flash, redirect, abort
+from flask_login import current_user, login_required
+from app import jobs
+from app.forms import ImportForm
+
+bp = Blueprint('imports', __name__)
+
+IMPORT_JOBS = {'pembayaran': 'import_payments', 'pelanggan': 'import_customers'}
+
+
+@bp.route('/import')
+@login_required
+def index():
+    return render_template('import.html', forms={jenis: ImportForm(prefix=jenis) for jenis in IMPORT_JOBS})
+
+
+@bp.route('/import/<jenis>', methods=['POST'])
+@login_required
+def upload(jenis):
+    if jenis not in IMPORT_JOBS:
+        abort(404)
+    form = ImportForm(prefix=jenis)
+    if not form.validate_on_submit():
+        for errors in form.errors.values():
+            for error in errors:
+                flash(f'Import gagal: {error}', 'danger')
+        return redirect(url_for('imports.index'))
+    os.makedirs(jobs.import_folder(), exist_ok=True)
+    _, ext = os.path.splitext(form.berkas.data.filename)
+    path = os.path.join(jobs.import_folder(), secrets.token_hex(8) + ext.lower())
+    form.berkas.data.save(path)
+    job_id = jobs.enqueue(IMPORT_JOBS[jenis], user_id=current_user.id, path=path)
+    return redirect(url_for('jobs.status', job_id=job_id))
@@ -0,0 +1,166 @@
+from datetime import datetime, time
+from flask import Blueprint, render_template, url_for, flash, redirect, request, jsonify
+from flask_login import current_user, login_required
+from app import archive, db, rollups, jobs, receipts
+from app.models import Invoice
+from app.forms import GenerateInvoicesForm, PaymentForm, BulkPaymentForm
+from app.billing import generate_period, pay_invoices
+from app.periods import parse_period
+from app.reports import invoice_list_query
+
+bp = Blueprint('invoices', __name__)
+
+INVOICE_PAGE_SIZE = 50
+MAX_INVOICE_PAGE_SIZE = 200
+MAX_BULK_PAYMENT = 500
+
+
+@bp.route('/invoices', methods=['GET'])
+@login_required
+def index():
+    try:
+        periode = parse_period(request.args['periode']) if request.args.get('periode') else None
+        after = tuple(int(part) for part in request.args['after'].split('-')) if request.args.get('after') else None
+        if after and len(after) != 3:
+            raise ValueError(request.args['after'])
+    except ValueError:
+        periode = after = None
+    status = request.args.get('status') if request.args.get('status') in ('Lunas', 'Belum Lunas') else None
+    customer_id = request.args.get('customer_id', type=int)
+    limit = min(max(request.args.get('limit', INVOICE_PAGE_SIZE, type=int), 1), MAX_INVOICE_PAGE_SIZE)
+    rows = db.session.scalars(invoice_list_query(periode, status, customer_id, after).limit(limit + 1)).all()
+    page, next_cursor = rows[:limit], None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = f"{last.tahun}-{last.bulan}-{last.id}"
+    filters = {k: v for k, v in {'periode': request.args.get('periode'), 'status': status, 'customer_id': customer_id, 'limit': request.args.get('limit', type=int)}.items() if v}
+    if request.args.get('format') == 'json':
+        return jsonify({'invoices': [{'id': inv.id, 'customer_id': inv.customer_id, 'pelanggan': inv.customer.nama if inv.customer else None,
+                                      'bulan': inv.bulan, 'tahun': inv.tahun, 'jumlah': inv.jumlah, 'status': inv.status,
+                                      'tanggal_lunas': inv.tanggal_lunas.strftime('%Y-%m-%d') if inv.tanggal_lunas else None,
+                                      'bukti_pembayaran': inv.bukti_pembayaran} for inv in page],
+                        'next': url_for('invoices.index', after=next_cursor, format='json', **filters) if next_cursor else None})
+    gen_form = GenerateInvoicesForm()
+    payment_form = PaymentForm()
+    gen_form.bulan.data = datetime.utcnow().month
+    return render_template('invoices.html', invoices=page, gen_form=gen_form, payment_form=payment_form, bulk_form=BulkPaymentForm(), filters=filters,
+                           next_url=url_for('invoices.index', after=next_cursor, **filters) if next_cursor else None)
+
+
+@bp.route('/invoice/<int:invoice_id>/pay', methods=['POST'])
+@login_required
+def pay(invoice_id):
+    invoice = Invoice.query.get_or_404(invoice_id)
+    form = PaymentForm()
+    if form.validate_on_submit():
+        if form.nota.data:
+            receipts.release(invoice.bukti_pembayaran)
+            invoice.bukti_pembayaran = receipts.store(form.nota.data)
+        rollups.mark_paid(invoice)
+        invoice.status, invoice.tanggal_lunas = 'Lunas', form.tanggal_lunas.data
+        db.session.commit()
+        flash(f'Tagihan untuk {invoice.customer.nama} telah ditandai lunas.', 'success')
+    else:
+        for field, errors in form.errors.items():
+            for error in errors:
+                flash(f"Error di field '{getattr(form, field).label.text}': {error}", 'danger')
+    return redirect(url_for('invoices.index'))
+
+
+def _invoice_id(raw):
+    """ID tagihan dari int JSON atau string digit; None untuk lainnya (true dan 1.5 tidak boleh jadi tagihan #1)."""
+    if isinstance(raw, int) and not isinstance(raw, bool):
+        return raw
+    if isinstance(raw, str) and raw.isascii() and raw.isdigit():
+        return int(raw)
+    return None
+
+
+@bp.route('/invoices/pay-bulk', methods=['POST'])
+@login_required
+def pay_bulk():
+    """Tandai banyak tagihan lunas sekaligus. Form (invoice_ids[] + tanggal_lunas) atau JSON dengan kunci yang sama."""
+    if request.is_json:
+        data = request.get_json(silent=True)
+        raw_ids = data.get('invoice_ids') if isinstance(data, dict) else None
+        if not isinstance(raw_ids, list):
+            return jsonify({'error': 'Body harus objek JSON dengan invoice_ids berupa daftar.'}), 400
+        try:
+            tanggal_lunas = datetime.strptime(data.get('tanggal_lunas') or '', '%Y-%m-%d')
+        except (TypeError, ValueError):
+            return jsonify({'error': 'tanggal_lunas harus berformat YYYY-MM-DD.'}), 400
+    else:
+        form = BulkPaymentForm()
+        if not form.validate_on_submit():
+            flash('Tanggal pembayaran tidak valid.', 'danger')
+            return redirect(url_for('invoices.index'))
+        raw_ids, tanggal_lunas = request.form.getlist('invoice_ids'), datetime.combine(form.tanggal_lunas.data, time())
+    ids, gagal = [], []
+    for raw in raw_ids:
+        invoice_id = _invoice_id(raw)
+        if invoice_id is None:
+            gagal.append({'id': raw, 'alasan': 'ID tidak valid'})
+        else:
+            ids.append(invoice_id)
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > MAX_BULK_PAYMENT:
+        pesan = f'Maksimal {MAX_BULK_PAYMENT} tagihan per pembayaran massal.'
+        if request.is_json:
+            return jsonify({'error': pesan}), 400
+        flash(pesan, 'danger')
+        return redirect(url_for('invoices.index'))
+    lunas = []
+    if ids:
+        lunas, gagal_update = pay_invoices(ids, tanggal_lunas)
+        gagal += gagal_update
+        db.session.commit()
+    if request.is_json:
+        return jsonify({'lunas': lunas, 'gagal': gagal})
+    if lunas:
+        flash(f'{len(lunas)} tagihan telah ditandai lunas.', 'success')
+    if gagal:
+        daftar = ', '.join(f"#{g['id']} ({g['alasan']})" for g in gagal[:10])
+        flash(f"{len(gagal)} tagihan gagal: {daftar}{', ...' if len(gagal) > 10 else ''}", 'warning')
+    if not lunas and not gagal:
+        flash('Tidak ada tagihan yang dipilih.', 'info')
+    return redirect(url_for('invoices.index'))
+
+
+@bp.route('/invoices/generate', methods=['POST'])
+@login_required
+def generate():
+    form = GenerateInvoicesForm()
+    if form.validate_on_submit():
+        bulan, tahun = form.bulan.data, form.tahun.data
+        try:
+            archive.ensure_open(bulan, tahun)
+        except archive.ArchiveError as e:
+            flash(str(e), 'danger')
+            return redirect(url_for('invoices.index'))
+        if form.preview.data:
+            hasil = generate_period(bulan, tahun, dry_run=True)
+            flash(f"Pratinjau {bulan}/{tahun}: {hasil['tagihan_baru']} tagihan baru, total Rp {hasil['total_tagihan']:,.0f}.", 'info')
+            return redirect(url_for('invoices.index'))
+        job_id = jobs.enqueue('generate_invoices', user_id=current_user.id, bulan=bulan, tahun=tahun)
+        return redirect(url_for('jobs.status', job_id=job_id))
+    else: flash('Data formulir tidak valid.', 'danger')
+    return redirect(url_for('invoices.index'))
+
+
+@bp.route('/invoice/<int:invoice_id>/delete', methods=['POST'])
+@login_required
+def delete(invoice_id):
+    invoice = Invoice.query.get_or_404(invoice_id)
+    receipts.release(invoice.bukti_pembayaran)
+    rollups.add_invoice(invoice, -1)
+    db.session.delete(invoice)
+    db.session.commit()
+    flash('Tagihan berhasil dihapus.', 'info')
+    return redirect(url_for('invoices.index'))
+
+
+@bp.route('/invoices/delete_all', methods=['POST'])
+@login_required
+def delete_all():
+    job_id = jobs.enqueue('delete_all_invoices', user_id=current_user.id)
+    return redirect(url_for('jobs.status', job_id=job_id))
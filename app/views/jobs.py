@@ -0,0 +1,30 @@
+from flask import Blueprint, render_template, url_for, request, jsonify, abort, send_from_directory
+from flask_login import login_required
+from app import jobs
+from app.models import Job
+
+bp = Blueprint('jobs', __name__)
+
+
+@bp.route('/jobs/<job_id>')
+@login_required
+def status(job_id):
+    job = Job.query.get_or_404(job_id)
+    if request.args.get('format') == 'json' or request.accept_mimetypes.best == 'application/json':
+        data = jobs.to_dict(job)
+        if job.status == 'Selesai' and job.berkas:
+            data['download'] = url_for('jobs.download', job_id=job.id)
+        response = jsonify(data)
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+    return render_template('job.html', job=job, task=jobs.TASKS.get(job.jenis), hasil=jobs.to_dict(job)['hasil'] or {})
+
+
+@bp.route('/jobs/<job_id>/download')
+@login_required
+def download(job_id):
+    job = Job.query.get_or_404(job_id)
+    if job.status != 'Selesai' or not job.berkas:
+        abort(404)
+    hasil = jobs.to_dict(job)['hasil'] or {}
+    return send_from_directory(jobs.export_folder(), job.berkas, as_attachment=True, download_name=hasil.get('nama_file', job.berkas))
@@ -0,0 +1,20 @@
+import secrets
+from flask import Blueprint, Response, current_app, request, abort
+from flask_login import current_user
+from app import metrics
+
+bp = Blueprint('metrics', __name__)
+
+
+@bp.route('/metrics')
+def index():
+    """Metrik format teks Prometheus. Butuh token METRICS_TOKEN (Bearer) atau user yang login."""
+    if not current_app.config['METRICS_ENABLED']:
+        abort(404)
+    token = current_app.config['METRICS_TOKEN']
+    dengan_token = token and secrets.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode())
+    if not dengan_token and not current_user.is_authenticated:
+        return Response('Butuh login atau token metrics.\n', 401, {'WWW-Authenticate': 'Bearer'}, mimetype='text/plain')
+    response = Response(metrics.collect(current_app.config['METRICS_DIR']), mimetype='text/plain; version=0.0.4')
+    response.headers['Cache-Control'] = 'no-store'
+    return response
@@ -0,0 +1,55 @@
+from flask import Blueprint, render_template, url_for, flash, redirect, request
+from flask_login import login_required
+from app import db, versions
+from app.models import ServicePackage
+from app.forms import ServicePackageForm
+
+bp = Blueprint('packages', __name__)
+
+
+@bp.route('/service-packages')
+@login_required
+def index():
+    packages = ServicePackage.query.all()
+    return render_template('service_packages.html', packages=packages)
+
+
+@bp.route('/service-package/add', methods=['GET', 'POST'])
+@login_required
+def add():
+    form = ServicePackageForm()
+    if form.validate_on_submit():
+        package = ServicePackage(nama_paket=form.nama_paket.data, kecepatan=form.kecepatan.data, harga=form.harga.data)
+        db.session.add(package)
+        versions.touch('paket')
+        db.session.commit()
+        flash('Paket layanan baru berhasil ditambahkan!', 'success')
+        return redirect(url_for('packages.index'))
+    return render_template('service_package_form.html', title='Tambah Paket Layanan', form=form)
+
+
+@bp.route('/service-package/<int:package_id>/update', methods=['GET', 'POST'])
+@login_required
+def update(package_id):
+    package = ServicePackage.query.get_or_404(package_id)
+    form = ServicePackageForm()
+    if form.validate_on_submit():
+        package.nama_paket, package.kecepatan, package.harga = form.nama_paket.data, form.kecepatan.data, form.harga.data
+        versions.touch('paket')
+        db.session.commit()
+        flash('Paket layanan berhasil diperbarui!', 'success')
+        return redirect(url_for('packages.index'))
+    elif request.method == 'GET':
+        form.nama_paket.data, form.kecepatan.data, form.harga.data = package.nama_paket, package.kecepatan, package.harga
+    return render_template('service_package_form.html', title='Edit Paket Layanan', form=form)
+
+
+@bp.route('/service-package/<int:package_id>/delete', methods=['POST'])
+@login_required
+def delete(package_id):
+    package = ServicePackage.query.get_or_404(package_id)
+    db.session.delete(package)
+    versions.touch('paket', 'pelanggan')
+    db.session.commit()
+    flash('Paket layanan berhasil dihapus.', 'info')
+    return redirect(url_for('packages.index'))
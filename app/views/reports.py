@@ -0,0 +1,101 @@
+from datetime import datetime
+from flask import Blueprint, render_template, url_for, flash, redirect, request, Response, stream_with_context, jsonify
+from flask_login import current_user, login_required
+from app import archive, db, rollups, exports, jobs
+from app.forms import GenerateInvoicesForm
+from app.periods import parse_period, check_period, month_index
+from app.reports import paid_invoices_query, expenses_query, profit_sharing
+from app.settings import get_settings
+
+bp = Blueprint('reports', __name__)
+
+MAX_RANGE_MONTHS = 120
+
+
+@bp.route('/financial-report', methods=['GET', 'POST'])
+@login_required
+def index():
+    form = GenerateInvoicesForm()
+    report_data = None
+    if request.method == 'POST' and form.validate_on_submit():
+        bulan, tahun = form.bulan.data, form.tahun.data
+        rekap = rollups.get_month(bulan, tahun)
+        pendapatan_kotor, total_pengeluaran = rekap['pendapatan'], rekap['pengeluaran']
+        rincian_pendapatan = db.session.execute(paid_invoices_query(bulan, tahun, archive.invoice_source((tahun, bulan)))).all()
+        rincian_pengeluaran = db.session.execute(expenses_query(bulan, tahun, archive.expense_source((tahun, bulan)))).all()
+        report_data = {'period': f"{form.bulan.choices[bulan-1][1]} {tahun}", 'bulan': bulan, 'tahun': tahun, 'pendapatan_kotor': pendapatan_kotor, 'total_pengeluaran': total_pengeluaran, 'rincian_pendapatan': rincian_pendapatan, 'rincian_pengeluaran': rincian_pengeluaran, 'target_pendapatan': get_settings().target_pendapatan, 'laba_bersih': None}
+        bagi_hasil = get_settings().bagi_hasil(pendapatan_kotor)
+        if bagi_hasil:
+            report_data.update(bagi_hasil, laba_bersih=bagi_hasil['dana_siap_bagi'])
+    return render_template('financial_report.html', form=form, report_data=report_data)
+
+
+@bp.route('/export/financial-report')
+@login_required
+def export():
+    try:
+        if request.args.get('from'):
+            awal = parse_period(request.args['from'])
+            akhir = parse_period(request.args.get('to') or request.args['from'])
+        else:
+            awal = akhir = check_period(int(request.args['tahun']), int(request.args['bulan']))
+    except (KeyError, ValueError):
+        flash('Periode tidak valid untuk export.', 'danger')
+        return redirect(url_for('reports.index'))
+    if akhir < awal:
+        flash('Periode akhir tidak boleh sebelum periode awal.', 'danger')
+        return redirect(url_for('reports.index'))
+    format = 'csv' if request.args.get('format') == 'csv' else 'xlsx'
+    if request.args.get('background'):
+        job_id = jobs.enqueue('export_financial_report', user_id=current_user.id, awal=awal, akhir=akhir, format=format, settings=get_settings().as_dict())
+        return redirect(url_for('jobs.status', job_id=job_id))
+    rows = exports.report_rows(awal, akhir, get_settings())
+    nama_file = exports.file_name(awal, akhir)
+    if format == 'csv':
+        return Response(stream_with_context(exports.csv_stream(rows)), mimetype='text/csv',
+                        headers={'Content-Disposition': f'attachment; filename={nama_file}.csv'})
+    return Response(exports.xlsx_stream(rows, exports.sheet_title(awal)), mimetype=exports.XLSX_MIMETYPE,
+                    headers={'Content-Disposition': f'attachment; filename={nama_file}.xlsx'})
+
+
+@bp.route('/financial-report/range')
+@login_required
+def range_report():
+    """Bagi hasil per bulan untuk rentang from..to (YYYY-MM), satu tahun penuh (?tahun=), atau bawaan tahun berjalan (YTD).
+
+    ?format=json|xlsx|csv untuk hasil yang sama dalam bentuk data atau berkas.
+    """
+    today = datetime.utcnow()
+    try:
+        if request.args.get('tahun'):
+            tahun = int(request.args['tahun'])
+            awal, akhir = check_period(tahun, 1), (tahun, 12)
+        else:
+            akhir = parse_period(request.args['to']) if request.args.get('to') else (today.year, today.month)
+            awal = parse_period(request.args['from']) if request.args.get('from') else (akhir[0], 1)
+    except ValueError:
+        return _range_error('Format periode harus YYYY-MM.')
+    if not 1 <= month_index(*akhir) - month_index(*awal) + 1 <= MAX_RANGE_MONTHS:
+        return _range_error(f'Rentang harus 1 sampai {MAX_RANGE_MONTHS} bulan.')
+    settings = get_settings()
+    hasil = profit_sharing(awal, akhir, settings)
+    format = request.args.get('format')
+    if format == 'json':
+        return jsonify(dict(hasil, dari=f"{awal[0]}-{awal[1]:02d}", sampai=f"{akhir[0]}-{akhir[1]:02d}", pengaturan=settings.as_dict()))
+    if format in ('xlsx', 'csv'):
+        rows = exports.profit_sharing_rows(awal, akhir, hasil, settings)
+        nama_file = 'bagi_hasil_' + exports.file_name(awal, akhir).removeprefix('laporan_')
+        if format == 'csv':
+            return Response(stream_with_context(exports.csv_stream(rows)), mimetype='text/csv',
+                            headers={'Content-Disposition': f'attachment; filename={nama_file}.csv'})
+        return Response(exports.xlsx_stream(rows, 'Bagi Hasil'), mimetype=exports.XLSX_MIMETYPE,
+                        headers={'Content-Disposition': f'attachment; filename={nama_file}.xlsx'})
+    return render_template('profit_sharing_report.html', hasil=hasil, settings=settings, period=exports.period_label(awal, akhir),
+                           dari=f"{awal[0]}-{awal[1]:02d}", sampai=f"{akhir[0]}-{akhir[1]:02d}")
+
+
+def _range_error(pesan):
+    if request.args.get('format') == 'json':
+        return jsonify({'error': pesan}), 400
+    flash(pesan, 'danger')
+    return redirect(url_for('reports.index'))
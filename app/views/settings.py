@@ -0,0 +1,22 @@
+from flask import Blueprint, render_template, url_for, flash, redirect, request
+from flask_login import login_required
+from app import db
+from app.forms import SettingsForm
+from app.settings import get_settings, save_settings
+
+bp = Blueprint('settings', __name__)
+
+
+@bp.route('/settings', methods=['GET', 'POST'])
+@login_required
+def index():
+    form = SettingsForm()
+    if form.validate_on_submit():
+        save_settings(form.data)
+        db.session.commit()
+        flash('Pengaturan berhasil disimpan!', 'success')
+        return redirect(url_for('settings.index'))
+    elif request.method == 'GET':
+        for key, value in get_settings().as_dict().items():
+            getattr(form, key).data = value
+    return render_template('settings.html', form=form)
@@ -0,0 +1,69 @@
+"""Benchmark pencarian pelanggan FTS5 vs LIKE '%x%' lama.
+
+    python benchmarks/bench_customer_search.py [--customers 100000] [--limit 10]
+
+Database dibuat di direktori sementara, app.db tidak disentuh.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, insert, select, or_  # noqa: E402
+from app import db  # noqa: E402
+from app.models import Customer  # noqa: E402
+from app.search import FTS_SCHEMA, search_query  # noqa: E402
+
+DEPAN = ['Budi', 'Siti', 'Agus', 'Dewi', 'Joko', 'Rina', 'Andi', 'Sri', 'Eko', 'Wati', 'Hendra', 'Yuni']
+BELAKANG = ['Santoso', 'Aminah', 'Saputra', 'Lestari', 'Widodo', 'Rahayu', 'Hidayat', 'Susanti', 'Prasetyo', 'Kurniawan']
+JALAN = ['Mawar', 'Melati', 'Kenanga', 'Anggrek', 'Sudirman', 'Diponegoro', 'Merdeka', 'Pahlawan', 'Cempaka']
+QUERIES = ['budi', 'siti am', 'mawar', 'jalan sudirman 12', '0812', '0812 345', 'hendra kurn', 'pahlawan rt 03']
+
+
+def seed(engine, n):
+    rnd = random.Random(42)
+    with engine.begin() as conn:
+        for stmt in FTS_SCHEMA:
+            conn.exec_driver_sql(stmt)
+        conn.execute(insert(Customer), [
+            {'nama': f'{rnd.choice(DEPAN)} {rnd.choice(BELAKANG)}', 'alamat': f'Jalan {rnd.choice(JALAN)} {rnd.randint(1, 200)} RT {rnd.randint(1, 12):02d}',
+             'telepon': f'08{rnd.randint(11, 99)}-{rnd.randint(1000, 9999)}-{i:04d}', 'status': 'Aktif', 'tanggal_bergabung': datetime(2024, 1, 1)}
+            for i in range(n)
+        ])
+
+
+def timed(conn, stmt, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        rows = conn.execute(stmt).all()
+    return (time.perf_counter() - start) / repeat * 1000, len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--customers', type=int, default=100000)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine('sqlite:///' + os.path.join(tmp, 'bench.db'))
+        db.metadata.create_all(engine)
+        seed(engine, args.customers)
+        print(f"{args.customers} pelanggan, top {args.limit}")
+        print(f"{'query':<22} {'fts5 (ms)':>10} {'hasil':>6} {'like (ms)':>10}")
+        with engine.connect() as conn:
+            for q in QUERIES:
+                fts_ms, found = timed(conn, search_query(q).limit(args.limit))
+                like = select(Customer).where(or_(Customer.nama.ilike(f'%{q}%'), Customer.alamat.ilike(f'%{q}%'))).order_by(Customer.nama).limit(args.limit)
+                like_ms, _ = timed(conn, like, repeat=3)
+                print(f"{q:<22} {fts_ms:>10.2f} {found:>6} {like_ms:>10.2f}")
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
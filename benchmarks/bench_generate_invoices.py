@@ -0,0 +1,107 @@
+"""Benchmark generate tagihan set-based (INSERT ... SELECT) vs loop per pelanggan lama.
+
+Jalankan dari root proyek:
+
+    python benchmarks/bench_generate_invoices.py [--sizes 1000 10000 100000] [--skip-legacy]
+
+Database dibuat di direktori sementara, app.db tidak disentuh.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, insert, select, func  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from app import db  # noqa: E402
+from app.models import Customer, ServicePackage, Invoice  # noqa: E402
+from app.billing import generate_period  # noqa: E402
+
+BULAN, TAHUN = 1, 2025
+
+
+def seed(engine, n):
+    with engine.begin() as conn:
+        conn.execute(insert(ServicePackage), [
+            {'id': i, 'nama_paket': f'Paket {i}', 'kecepatan': 10 * i, 'harga': 100000 + 50000 * i} for i in range(1, 6)
+        ])
+        bergabung = datetime(2024, 1, 1)
+        conn.execute(insert(Customer), [
+            {'nama': f'Pelanggan {i}', 'alamat': f'Jalan {i}', 'telepon': f'08{i:010d}', 'package_id': i % 5 + 1,
+             'status': 'Aktif' if i % 10 else 'Nonaktif', 'tanggal_bergabung': bergabung} for i in range(n)
+        ])
+
+
+def legacy_generate(session):
+    """Salinan loop lama di route generate_invoices, untuk pembanding."""
+    periode = datetime(TAHUN, BULAN, 1).date()
+    count = 0
+    for cust in session.query(Customer).filter(Customer.status == 'Aktif', func.date(Customer.tanggal_bergabung) <= periode).all():
+        ada = session.query(Invoice).filter_by(customer_id=cust.id, bulan=BULAN, tahun=TAHUN).first()
+        if not ada and cust.package:
+            session.add(Invoice(customer_id=cust.id, bulan=BULAN, tahun=TAHUN, jumlah=cust.package.harga, status='Belum Lunas'))
+            count += 1
+    session.commit()
+    return count
+
+
+def run(n, skip_legacy):
+    hasil = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine('sqlite:///' + os.path.join(tmp, 'bench.db'))
+        db.metadata.create_all(engine)
+        seed(engine, n)
+
+        with engine.begin() as conn:
+            start = time.perf_counter()
+            preview = generate_period(BULAN, TAHUN, dry_run=True, bind=conn)
+            hasil['dry_run_s'] = time.perf_counter() - start
+
+        with engine.begin() as conn:
+            start = time.perf_counter()
+            count = generate_period(BULAN, TAHUN, bind=conn)['tagihan_baru']
+            hasil['set_based_s'] = time.perf_counter() - start
+        assert count == preview['tagihan_baru']
+
+        with engine.begin() as conn:
+            start = time.perf_counter()
+            ulang = generate_period(BULAN, TAHUN, bind=conn)['tagihan_baru']
+            hasil['rerun_s'] = time.perf_counter() - start
+        assert ulang == 0
+
+        if not skip_legacy:
+            with engine.begin() as conn:
+                conn.execute(Invoice.__table__.delete())
+            with Session(engine) as session:
+                start = time.perf_counter()
+                legacy_count = legacy_generate(session)
+                hasil['legacy_s'] = time.perf_counter() - start
+            assert legacy_count == count
+
+        with engine.connect() as conn:
+            assert conn.execute(select(func.count()).select_from(Invoice)).scalar() == count
+        engine.dispose()
+    hasil['rows'] = count
+    return hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--skip-legacy', action='store_true', help='lewati loop lama (lambat di 100k)')
+    args = parser.parse_args()
+
+    print(f"{'pelanggan':>10} {'tagihan':>8} {'dry-run':>9} {'set-based':>10} {'baris/detik':>12} {'re-run':>8} {'loop lama':>10}")
+    for n in args.sizes:
+        h = run(n, args.skip_legacy)
+        legacy = f"{h['legacy_s']:.3f}s" if 'legacy_s' in h else '-'
+        print(f"{n:>10} {h['rows']:>8} {h['dry_run_s']:>8.3f}s {h['set_based_s']:>9.3f}s "
+              f"{h['rows'] / h['set_based_s']:>12,.0f} {h['rerun_s']:>7.3f}s {legacy:>10}")
+
+
+if __name__ == '__main__':
+    main()
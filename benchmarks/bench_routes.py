@@ -0,0 +1,162 @@
+"""Benchmark route lewat Flask test client pada beberapa ukuran data sintetis.
+
+    python benchmarks/bench_routes.py [--sizes 1000 10000] [--years 5] [--repeat 5] [--output hasil.json] [--compare lama.json]
+
+Untuk setiap ukuran, database sementara dibuat dengan migrasi lengkap lalu diisi `app.synthetic.seed`
+(sama dengan `flask seed-synthetic`). Setiap route diukur latensinya (median, p95), jumlah query SQL
+(header X-Query-Count), dan puncak memori Python (tracemalloc, di putaran terpisah agar tidak
+memengaruhi latensi). Body response selalu dibaca habis, jadi export streaming ikut terukur.
+
+Hasil disimpan sebagai JSON. Dengan --compare, setiap route dibandingkan dengan file JSON lama dan
+skrip keluar dengan kode 1 jika median latensi naik lebih dari --tolerance persen atau jumlah query bertambah.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from flask_migrate import upgrade  # noqa: E402
+from app import create_app, db, bcrypt  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.models import User  # noqa: E402
+from app import synthetic  # noqa: E402
+
+
+def routes(today):
+    """(nama, method, url, data). Periode laporan memakai bulan lalu supaya datanya lengkap."""
+    tahun, bulan = (today.year, today.month - 1) if today.month > 1 else (today.year - 1, 12)
+    periode = f"{tahun}-{bulan:02d}"
+    return [
+        ('dashboard', 'GET', '/dashboard', None),
+        ('financial_summary_12', 'GET', '/api/financial_summary?months=12', None),
+        ('invoices', 'GET', '/invoices', None),
+        ('invoices_periode_belum_lunas', 'GET', f'/invoices?periode={periode}&status=Belum+Lunas', None),
+        ('customers', 'GET', '/customers', None),
+        ('customers_search', 'GET', '/customers?search=budi', None),
+        ('financial_report', 'POST', '/financial-report', {'bulan': bulan, 'tahun': tahun}),
+        ('export_csv', 'GET', f'/export/financial-report?bulan={bulan}&tahun={tahun}&format=csv', None),
+        ('export_xlsx', 'GET', f'/export/financial-report?bulan={bulan}&tahun={tahun}&format=xlsx', None),
+    ]
+
+
+def make_app(path):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + path
+        WTF_CSRF_ENABLED = False
+        QUERY_COUNTER = True
+    return create_app(BenchConfig)
+
+
+def request(client, method, url, data):
+    response = client.open(url, method=method, data=data)
+    size = sum(len(chunk) for chunk in response.response)  # baca habis body streaming
+    response.close()
+    if response.status_code != 200:
+        raise SystemExit(f"{method} {url} -> {response.status_code}")
+    return int(response.headers.get('X-Query-Count', 0)), size
+
+
+def bench_size(customers, years, repeat, today):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, 'bench.db'))
+        with app.app_context():
+            with contextlib.redirect_stderr(io.StringIO()):  # log INFO alembic per migrasi
+                upgrade(directory=os.path.join(ROOT, 'migrations'))
+            start = time.perf_counter()
+            data = synthetic.seed(customers, years, today=today)
+            db.session.add(User(username='bench', email='bench@example.com', password=bcrypt.generate_password_hash('bench').decode('utf-8')))
+            db.session.commit()
+            data['seed_s'] = round(time.perf_counter() - start, 2)
+
+        client = app.test_client()
+        if client.post('/login', data={'email': 'bench@example.com', 'password': 'bench'}).status_code != 302:
+            raise SystemExit("Login gagal")
+        hasil = {}
+        for nama, method, url, form in routes(today):
+            request(client, method, url, form)  # pemanasan: cache template, statement, halaman SQLite
+            latensi = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                queries, size = request(client, method, url, form)
+                latensi.append((time.perf_counter() - start) * 1000)
+            tracemalloc.start()
+            request(client, method, url, form)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            latensi.sort()
+            hasil[nama] = {'median_ms': round(statistics.median(latensi), 2),
+                           'p95_ms': round(latensi[min(len(latensi) - 1, int(len(latensi) * 0.95))], 2),
+                           'max_ms': round(latensi[-1], 2), 'queries': queries,
+                           'peak_kib': round(peak / 1024, 1), 'bytes': size}
+        with app.app_context():
+            db.engine.dispose()
+    return data, hasil
+
+
+def compare(results, baseline, tolerance):
+    """Cetak perubahan terhadap baseline; kembalikan daftar regresi."""
+    regresi = []
+    for size, hasil in results['sizes'].items():
+        lama = baseline.get('sizes', {}).get(size, {}).get('routes', {})
+        for nama, baru in hasil['routes'].items():
+            if nama not in lama:
+                continue
+            delta = (baru['median_ms'] - lama[nama]['median_ms']) / lama[nama]['median_ms'] * 100 if lama[nama]['median_ms'] else 0
+            catatan = []
+            if delta > tolerance:
+                catatan.append(f"latensi +{delta:.0f}%")
+            if baru['queries'] > lama[nama]['queries']:
+                catatan.append(f"query {lama[nama]['queries']} -> {baru['queries']}")
+            print(f"{size:>8} {nama:<30} {lama[nama]['median_ms']:>9.1f} -> {baru['median_ms']:>9.1f} ms ({delta:+.0f}%)"
+                  + (f"  REGRESI: {', '.join(catatan)}" if catatan else ''))
+            if catatan:
+                regresi.append((size, nama, catatan))
+    return regresi
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help='jumlah pelanggan')
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='simpan hasil JSON ke file ini')
+    parser.add_argument('--compare', help='file JSON hasil sebelumnya')
+    parser.add_argument('--tolerance', type=float, default=20, help='kenaikan median latensi (persen) yang masih diterima')
+    args = parser.parse_args()
+
+    today = datetime.utcnow()
+    results = {'tanggal': today.isoformat(timespec='seconds'), 'python': platform.python_version(),
+               'years': args.years, 'repeat': args.repeat, 'sizes': {}}
+    print(f"{'pelanggan':>9} {'route':<30} {'median':>9} {'p95':>9} {'query':>6} {'peak KiB':>9} {'bytes':>10}")
+    for customers in args.sizes:
+        data, hasil = bench_size(customers, args.years, args.repeat, today)
+        results['sizes'][str(customers)] = {'data': data, 'routes': hasil}
+        for nama, r in hasil.items():
+            print(f"{customers:>9} {nama:<30} {r['median_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['queries']:>6} {r['peak_kib']:>9.0f} {r['bytes']:>10}")
+        print(f"{'':>9} ({data['tagihan']} tagihan, {data['pengeluaran']} pengeluaran, seed {data['seed_s']} s)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Hasil disimpan di {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nDibandingkan dengan {args.compare} ({baseline.get('tanggal')}):")
+        if compare(results, baseline, args.tolerance):
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark baca/tulis bersamaan: PRAGMA bawaan SQLite vs setelan app/sqlite_setup.py.
+
+    python benchmarks/bench_sqlite_concurrency.py [--readers 4] [--writers 2] [--seconds 5] [--invoices 50000]
+
+Setiap pembaca dan penulis adalah proses terpisah (seperti worker gunicorn). Pembaca menjalankan
+query laporan dan daftar tagihan; penulis melunasi/membatalkan tagihan dan menambah pengeluaran,
+commit per operasi. Database dibuat di direktori sementara, app.db tidak disentuh.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, insert, select, update, func, tuple_  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from app import db  # noqa: E402
+from app.models import Customer, ServicePackage, Invoice, Expense  # noqa: E402
+from app.sqlite_setup import DEFAULT_PRAGMAS, install  # noqa: E402
+
+SETUPS = {
+    'bawaan (journal DELETE)': {'journal_mode': 'DELETE'},
+    'app/sqlite_setup.py': DEFAULT_PRAGMAS,
+}
+
+
+def make_engine(path, pragmas):
+    engine = create_engine('sqlite:///' + path)
+    install(engine, pragmas)
+    return engine
+
+
+def seed(path, n):
+    engine = create_engine('sqlite:///' + path)
+    db.metadata.create_all(engine)
+    customers = max(n // 12, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(ServicePackage), [{'id': 1, 'nama_paket': 'Paket', 'kecepatan': 10, 'harga': 150000}])
+        conn.execute(insert(Customer), [{'id': i, 'nama': f'Pelanggan {i}', 'alamat': 'Jalan', 'telepon': f'08{i:010d}', 'package_id': 1,
+                                         'status': 'Aktif', 'tanggal_bergabung': datetime(2024, 1, 1)} for i in range(1, customers + 1)])
+        conn.execute(insert(Invoice), [{'customer_id': i % customers + 1, 'bulan': i // customers % 12 + 1, 'tahun': 2025 + i // (customers * 12), 'jumlah': 150000,
+                                        'status': 'Belum Lunas', 'tanggal_buat': datetime(2025, 1, 1)} for i in range(n)])
+    engine.dispose()
+
+
+def reader(path, pragmas, seconds, n, result):
+    engine, rnd, ops, errors = make_engine(path, pragmas), random.Random(os.getpid()), 0, 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        bulan = rnd.randint(1, 12)
+        try:
+            with engine.connect() as conn:
+                conn.execute(select(func.count(), func.sum(Invoice.jumlah)).where(Invoice.tahun == 2025, Invoice.bulan == bulan, Invoice.status == 'Lunas')).one()
+                conn.execute(select(Invoice).where(tuple_(Invoice.tahun, Invoice.bulan, Invoice.id) < tuple_(2025, bulan, rnd.randint(1, n)))
+                             .order_by(Invoice.tahun.desc(), Invoice.bulan.desc(), Invoice.id.desc()).limit(50)).all()
+            ops += 1
+        except OperationalError:
+            errors += 1
+    result.put(('baca', ops, errors))
+
+
+def writer(path, pragmas, seconds, n, result):
+    engine, rnd, ops, errors = make_engine(path, pragmas), random.Random(os.getpid()), 0, 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            with engine.begin() as conn:
+                status = rnd.choice(['Lunas', 'Belum Lunas'])
+                conn.execute(update(Invoice).where(Invoice.id == rnd.randint(1, n)).values(status=status))
+                conn.execute(insert(Expense).values(deskripsi='Benchmark', jumlah=1000, kategori='Operasional', tanggal=datetime(2025, 1, 1)))
+            ops += 1
+        except OperationalError:
+            errors += 1
+    result.put(('tulis', ops, errors))
+
+
+def run(path, pragmas, args):
+    result = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=reader, args=(path, pragmas, args.seconds, args.invoices, result)) for _ in range(args.readers)]
+    procs += [multiprocessing.Process(target=writer, args=(path, pragmas, args.seconds, args.invoices, result)) for _ in range(args.writers)]
+    for p in procs:
+        p.start()
+    totals = {'baca': [0, 0], 'tulis': [0, 0]}
+    for _ in procs:
+        kind, ops, errors = result.get()
+        totals[kind][0] += ops
+        totals[kind][1] += errors
+    for p in procs:
+        p.join()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--invoices', type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f"{args.readers} pembaca, {args.writers} penulis, {args.seconds:g} detik, {args.invoices} tagihan")
+    print(f"{'setelan':<44} {'baca/s':>9} {'gagal':>6} {'tulis/s':>9} {'gagal':>6}")
+    for name, pragmas in SETUPS.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.db')
+            seed(path, args.invoices)
+            totals = run(path, pragmas, args)
+        (baca, gagal_baca), (tulis, gagal_tulis) = totals['baca'], totals['tulis']
+        print(f"{name:<44} {baca / args.seconds:>9.0f} {gagal_baca:>6} {tulis / args.seconds:>9.0f} {gagal_tulis:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Cek regresi waktu start CLI dengan `python -X importtime`.
+
+    python benchmarks/check_import_time.py [--max-ms MS] [--runs 5] [--top 10]
+
+Menjalankan `flask --app run.py create-user --help` (memuat aplikasi lewat create_app() tanpa
+menyentuh database) beberapa kali dan mengambil waktu import terkecil. Exit 1 jika modul berat yang
+seharusnya ditunda (openpyxl, Pillow) ikut dimuat. Waktu import hanya dilaporkan: selisih antar
+percobaan bisa lebih dari 100 ms, jadi batas --max-ms (opsional) sebaiknya longgar, mis. dua kali
+angka biasanya.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+COMMAND = ['-m', 'flask', '--app', 'run.py', 'create-user', '--help']
+DEFERRED = ('openpyxl', 'PIL')
+
+
+def measure():
+    """Jalankan COMMAND sekali. Kembalikan {modul: (self_us, cumulative_us, level)}."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', *COMMAND], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.exit(f"Perintah gagal:\n{proc.stderr[-2000:]}")
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), level)
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--max-ms', type=float, default=None, help='Batas longgar waktu import (bawaan: hanya dilaporkan).')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    measure()  # pemanasan: kompilasi .pyc
+    runs = [measure() for _ in range(args.runs)]
+    totals = [sum(cum for _, cum, level in modules.values() if level == 0) / 1000 for modules in runs]
+    modules = runs[totals.index(min(totals))]
+
+    print(f"Import {' '.join(COMMAND)}: min {min(totals):.0f} ms, maks {max(totals):.0f} ms dari {args.runs} kali" + (f" (batas {args.max_ms:g} ms)" if args.max_ms else ''))
+    top = sorted(((cum, name) for name, (_, cum, level) in modules.items() if level == 0), reverse=True)[:args.top]
+    for cum, name in top:
+        print(f"  {cum / 1000:>8.1f} ms  {name}")
+    app_modules = sorted(((cum, name) for name, (_, cum, _) in modules.items() if name.startswith('app.')), reverse=True)[:args.top]
+    print("Modul aplikasi:")
+    for cum, name in app_modules:
+        print(f"  {cum / 1000:>8.1f} ms  {name}")
+
+    gagal = False
+    dimuat = sorted({name.split('.')[0] for name in modules} & set(DEFERRED))
+    if dimuat:
+        print(f"GAGAL: modul yang seharusnya ditunda ikut dimuat: {', '.join(dimuat)}")
+        gagal = True
+    if args.max_ms and min(totals) > args.max_ms:
+        print(f"GAGAL: waktu import {min(totals):.0f} ms melebihi batas {args.max_ms:g} ms")
+        gagal = True
+    if gagal:
+        raise SystemExit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
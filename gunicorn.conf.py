@@ -0,0 +1,39 @@
+"""Konfigurasi gunicorn (server WSGI pure-Python) untuk produksi.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Jumlah worker, thread, alamat, dan timeout diambil dari app/config.py (WEB_WORKERS, WEB_THREADS,
+WEB_BIND, WEB_TIMEOUT; bisa diganti lewat environment). Aplikasi dimuat sekali di proses master
+(preload) lalu di-fork ke setiap worker.
+
+Restart mulus:
+    kill -HUP <pid master>     worker diganti satu per satu, request yang berjalan diselesaikan dulu
+    kill -USR2 <pid master>    jalankan master baru dengan kode terbaru, lalu
+    kill -QUIT <pid master lama>
+"""
+from app.config import Config
+
+wsgi_app = 'wsgi:app'
+bind = Config.WEB_BIND
+workers = Config.WEB_WORKERS
+threads = Config.WEB_THREADS
+worker_class = 'gthread'
+timeout = Config.WEB_TIMEOUT
+graceful_timeout = 30
+preload_app = True
+accesslog = '-'
+
+
+def on_starting(server):
+    # Metrik per worker dari master sebelumnya tidak ikut dijumlahkan lagi.
+    from app import metrics
+    metrics.clear(Config.METRICS_DIR)
+
+
+def post_fork(server, worker):
+    # Koneksi SQLite milik master tidak boleh dipakai bersama proses anak; buang dari pool
+    # tanpa menutupnya supaya master tetap memegang koneksinya sendiri.
+    from app import db
+    from wsgi import app
+    with app.app_context():
+        db.engine.dispose(close=False)
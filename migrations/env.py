@@ -51,6 +51,17 @@ def get_metadata():
     return target_db.metadata
 
 
+# Tabel virtual FTS5 pencarian pelanggan dan shadow table-nya dibuat lewat SQL di migrasi, bukan model;
+# tanpa filter ini autogenerate menganggapnya terhapus dan membuat migrasi yang men-drop indeks pencarian.
+FTS_TABLE_PREFIX = 'customer_fts'
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == 'table' and name.startswith(FTS_TABLE_PREFIX):
+        return False
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +76,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,18 +105,34 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        # Batch migration SQLite membuat ulang tabel (DROP + RENAME). Dengan foreign_keys=ON, DROP TABLE
+        # customer ikut menghapus semua tagihan lewat ON DELETE CASCADE, jadi dimatikan selama migrasi.
+        # PRAGMA ini diabaikan di dalam transaksi, karena itu di-commit sebelum migrasi dimulai.
+        sqlite = connection.dialect.name == 'sqlite'
+        if sqlite:
+            foreign_keys = connection.exec_driver_sql('PRAGMA foreign_keys').scalar()
+            connection.exec_driver_sql('PRAGMA foreign_keys=OFF')
+            connection.commit()
+
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
             **conf_args
         )
 
-        with context.begin_transaction():
-            context.run_migrations()
+        try:
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            if sqlite:
+                connection.rollback()
+                connection.exec_driver_sql(f'PRAGMA foreign_keys={foreign_keys}')
+                connection.commit()
 
 
 if context.is_offline_mode():
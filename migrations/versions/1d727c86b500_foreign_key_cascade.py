@@ -0,0 +1,72 @@
+"""Foreign key ON DELETE CASCADE (invoice.customer_id) dan SET NULL (customer.package_id)
+
+Revision ID: 1d727c86b500
+Revises: d50116f06413
+Create Date: 2026-10-18 20:31:07.652914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1d727c86b500'
+down_revision = 'd50116f06413'
+branch_labels = None
+depends_on = None
+
+# SQLite menyimpan foreign key tanpa nama; konvensi ini memberi nama saat batch membaca ulang tabel.
+NAMING = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+FK_PAKET = 'fk_customer_package_id_service_package'
+FK_PELANGGAN = 'fk_invoice_customer_id_customer'
+
+
+def _phone_sql(col):
+    # Sama dengan app.search.normalize_phone(): digit saja, awalan 62 jadi 0.
+    digits = f"replace(replace(replace(replace(replace(replace({col}, ' ', ''), '-', ''), '+', ''), '.', ''), '(', ''), ')', '')"
+    return f"CASE WHEN {digits} LIKE '62%' THEN '0' || substr({digits}, 3) ELSE {digits} END"
+
+
+def _drop_search_objects():
+    # Batch membuat ulang tabel customer (DROP + RENAME); trigger ikut hilang dan view yang menunjuk
+    # customer membuat RENAME gagal. Isi indeks customer_fts tetap berlaku karena id tidak berubah.
+    op.execute("DROP TRIGGER IF EXISTS customer_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS customer_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS customer_fts_ai")
+    op.execute("DROP VIEW IF EXISTS customer_search_src")
+
+
+def _create_search_objects():
+    op.execute(f"CREATE VIEW customer_search_src AS SELECT id, nama, alamat, {_phone_sql('telepon')} AS telepon FROM customer")
+    op.execute(f"""CREATE TRIGGER customer_fts_ai AFTER INSERT ON customer BEGIN
+        INSERT INTO customer_fts(rowid, nama, alamat, telepon) VALUES (new.id, new.nama, new.alamat, {_phone_sql('new.telepon')});
+    END""")
+    op.execute(f"""CREATE TRIGGER customer_fts_ad AFTER DELETE ON customer BEGIN
+        INSERT INTO customer_fts(customer_fts, rowid, nama, alamat, telepon) VALUES ('delete', old.id, old.nama, old.alamat, {_phone_sql('old.telepon')});
+    END""")
+    op.execute(f"""CREATE TRIGGER customer_fts_au AFTER UPDATE OF nama, alamat, telepon ON customer BEGIN
+        INSERT INTO customer_fts(customer_fts, rowid, nama, alamat, telepon) VALUES ('delete', old.id, old.nama, old.alamat, {_phone_sql('old.telepon')});
+        INSERT INTO customer_fts(rowid, nama, alamat, telepon) VALUES (new.id, new.nama, new.alamat, {_phone_sql('new.telepon')});
+    END""")
+
+
+def _recreate_foreign_keys(ondelete_paket, ondelete_pelanggan):
+    _drop_search_objects()
+    with op.batch_alter_table('customer', schema=None, naming_convention=NAMING) as batch_op:
+        batch_op.drop_constraint(FK_PAKET, type_='foreignkey')
+        batch_op.create_foreign_key(FK_PAKET, 'service_package', ['package_id'], ['id'], ondelete=ondelete_paket)
+    _create_search_objects()
+    with op.batch_alter_table('invoice', schema=None, naming_convention=NAMING) as batch_op:
+        batch_op.drop_constraint(FK_PELANGGAN, type_='foreignkey')
+        batch_op.create_foreign_key(FK_PELANGGAN, 'customer', ['customer_id'], ['id'], ondelete=ondelete_pelanggan)
+
+
+def upgrade():
+    # Paket yang dulu dihapus meninggalkan package_id yang menggantung; kosongkan seperti SET NULL.
+    op.execute("UPDATE customer SET package_id = NULL WHERE package_id IS NOT NULL "
+               "AND package_id NOT IN (SELECT id FROM service_package)")
+    _recreate_foreign_keys('SET NULL', 'CASCADE')
+
+
+def downgrade():
+    _recreate_foreign_keys(None, None)
@@ -0,0 +1,49 @@
+"""Pencarian pelanggan full-text (FTS5) untuk nama, alamat, telepon
+
+Revision ID: 6dc31a433674
+Revises: 86a170e80446
+Create Date: 2026-10-18 15:34:52.018265
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6dc31a433674'
+down_revision = '86a170e80446'
+branch_labels = None
+depends_on = None
+
+
+def _phone_sql(col):
+    # Sama dengan app.search.normalize_phone(): digit saja, awalan 62 jadi 0.
+    digits = f"replace(replace(replace(replace(replace(replace({col}, ' ', ''), '-', ''), '+', ''), '.', ''), '(', ''), ')', '')"
+    return f"CASE WHEN {digits} LIKE '62%' THEN '0' || substr({digits}, 3) ELSE {digits} END"
+
+
+def upgrade():
+    op.execute(f"CREATE VIEW customer_search_src AS SELECT id, nama, alamat, {_phone_sql('telepon')} AS telepon FROM customer")
+    op.execute("""CREATE VIRTUAL TABLE customer_fts USING fts5(
+        nama, alamat, telepon,
+        content='customer_search_src', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')""")
+    op.execute(f"""CREATE TRIGGER customer_fts_ai AFTER INSERT ON customer BEGIN
+        INSERT INTO customer_fts(rowid, nama, alamat, telepon) VALUES (new.id, new.nama, new.alamat, {_phone_sql('new.telepon')});
+    END""")
+    op.execute(f"""CREATE TRIGGER customer_fts_ad AFTER DELETE ON customer BEGIN
+        INSERT INTO customer_fts(customer_fts, rowid, nama, alamat, telepon) VALUES ('delete', old.id, old.nama, old.alamat, {_phone_sql('old.telepon')});
+    END""")
+    op.execute(f"""CREATE TRIGGER customer_fts_au AFTER UPDATE OF nama, alamat, telepon ON customer BEGIN
+        INSERT INTO customer_fts(customer_fts, rowid, nama, alamat, telepon) VALUES ('delete', old.id, old.nama, old.alamat, {_phone_sql('old.telepon')});
+        INSERT INTO customer_fts(rowid, nama, alamat, telepon) VALUES (new.id, new.nama, new.alamat, {_phone_sql('new.telepon')});
+    END""")
+    op.execute("INSERT INTO customer_fts(customer_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS customer_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS customer_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS customer_fts_ai")
+    op.execute("DROP TABLE IF EXISTS customer_fts")
+    op.execute("DROP VIEW IF EXISTS customer_search_src")
@@ -0,0 +1,43 @@
+"""AUTOINCREMENT untuk id invoice dan expense, supaya id yang sudah diarsipkan tidak dipakai ulang
+
+Revision ID: 7f3b2c1d9e04
+Revises: 1d727c86b500
+Create Date: 2026-10-18 22:14:36.118402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7f3b2c1d9e04'
+down_revision = '1d727c86b500'
+branch_labels = None
+depends_on = None
+
+TABLES = ('invoice', 'expense')
+
+
+def _archive_attached():
+    return any(row[1] == 'arsip' for row in op.get_bind().exec_driver_sql('PRAGMA database_list'))
+
+
+def upgrade():
+    # Tanpa AUTOINCREMENT SQLite memberi ulang id 1..N setelah baris terbaru dihapus (mis. Hapus Semua Tagihan),
+    # sehingga id baru bisa sama dengan id yang sudah ada di archive.db.
+    arsip = _archive_attached()
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None, recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+            pass
+        # Urutan dimulai sesudah id terbesar di app.db maupun di arsip.
+        terbesar = [f"(SELECT coalesce(max(id), 0) FROM {table})"]
+        if arsip:
+            terbesar.append(f"(SELECT coalesce(max(id), 0) FROM arsip.{table})")
+        op.execute(f"DELETE FROM sqlite_sequence WHERE name = '{table}'")
+        op.execute(f"INSERT INTO sqlite_sequence (name, seq) VALUES ('{table}', max({', '.join(terbesar)}, 0))")
+
+
+def downgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None, recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+            pass
@@ -0,0 +1,27 @@
+"""Index (tahun, bulan) untuk daftar tagihan berhalaman
+
+Revision ID: 86a170e80446
+Revises: b5ca9e0c96d2
+Create Date: 2026-10-18 14:21:09.447301
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '86a170e80446'
+down_revision = 'b5ca9e0c96d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite menambahkan rowid di ujung index, jadi urutannya (tahun, bulan, id): cocok untuk keyset pagination.
+    with op.batch_alter_table('invoice', schema=None) as batch_op:
+        batch_op.create_index('ix_invoice_tahun_bulan', ['tahun', 'bulan'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('invoice', schema=None) as batch_op:
+        batch_op.drop_index('ix_invoice_tahun_bulan')
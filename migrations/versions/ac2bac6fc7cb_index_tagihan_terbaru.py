@@ -0,0 +1,27 @@
+"""Index tanggal_buat untuk daftar tagihan terbaru di dashboard
+
+Revision ID: ac2bac6fc7cb
+Revises: d0a7033c7cc6
+Create Date: 2026-10-18 17:42:18.204615
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ac2bac6fc7cb'
+down_revision = 'd0a7033c7cc6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ORDER BY tanggal_buat DESC LIMIT 5 membaca ujung index, bukan men-scan dan mengurutkan semua tagihan.
+    with op.batch_alter_table('invoice', schema=None) as batch_op:
+        batch_op.create_index('ix_invoice_tanggal_buat', ['tanggal_buat'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('invoice', schema=None) as batch_op:
+        batch_op.drop_index('ix_invoice_tanggal_buat')
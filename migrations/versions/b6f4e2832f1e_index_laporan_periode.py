@@ -0,0 +1,41 @@
+"""Index laporan per periode untuk invoice, expense dan customer
+
+Revision ID: b6f4e2832f1e
+Revises: c368f74c97ad
+Create Date: 2026-10-18 10:03:27.554190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6f4e2832f1e'
+down_revision = 'c368f74c97ad'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Invoice(customer_id) sudah tercakup prefix uq_invoice_customer_periode, tidak perlu index terpisah.
+    with op.batch_alter_table('invoice', schema=None) as batch_op:
+        batch_op.create_index('ix_invoice_periode_status', ['tahun', 'bulan', 'status', 'jumlah'], unique=False)
+
+    with op.batch_alter_table('expense', schema=None) as batch_op:
+        batch_op.create_index('ix_expense_tanggal', ['tanggal', 'jumlah'], unique=False)
+
+    with op.batch_alter_table('customer', schema=None) as batch_op:
+        batch_op.create_index('ix_customer_status_bergabung', ['status', 'tanggal_bergabung'], unique=False)
+
+    op.execute('ANALYZE')
+
+
+def downgrade():
+    with op.batch_alter_table('customer', schema=None) as batch_op:
+        batch_op.drop_index('ix_customer_status_bergabung')
+
+    with op.batch_alter_table('expense', schema=None) as batch_op:
+        batch_op.drop_index('ix_expense_tanggal')
+
+    with op.batch_alter_table('invoice', schema=None) as batch_op:
+        batch_op.drop_index('ix_invoice_periode_status')
@@ -0,0 +1,32 @@
+"""Unique tagihan per pelanggan per periode
+
+Revision ID: c368f74c97ad
+Revises: adbec801a4e9
+Create Date: 2026-10-18 09:12:44.120317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c368f74c97ad'
+down_revision = 'adbec801a4e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    duplikat = op.get_bind().execute(sa.text(
+        "SELECT COUNT(*) FROM (SELECT 1 FROM invoice GROUP BY customer_id, bulan, tahun HAVING COUNT(*) > 1)"
+    )).scalar()
+    if duplikat:
+        raise RuntimeError(f"Ada {duplikat} kombinasi pelanggan/periode dengan tagihan ganda. Bersihkan dulu sebelum migrasi.")
+
+    with op.batch_alter_table('invoice', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_invoice_customer_periode', ['customer_id', 'bulan', 'tahun'])
+
+
+def downgrade():
+    with op.batch_alter_table('invoice', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_invoice_customer_periode', type_='unique')
@@ -0,0 +1,27 @@
+"""Index nama pelanggan untuk daftar pelanggan berhalaman
+
+Revision ID: d50116f06413
+Revises: ac2bac6fc7cb
+Create Date: 2026-10-18 19:06:51.438207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd50116f06413'
+down_revision = 'ac2bac6fc7cb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ORDER BY nama, id LIMIT n dan keyset (nama, id) > (?, ?) membaca index, bukan mengurutkan semua pelanggan.
+    with op.batch_alter_table('customer', schema=None) as batch_op:
+        batch_op.create_index('ix_customer_nama', ['nama'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('customer', schema=None) as batch_op:
+        batch_op.drop_index('ix_customer_nama')
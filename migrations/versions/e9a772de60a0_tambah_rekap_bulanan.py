@@ -0,0 +1,62 @@
+"""Tambah rekap bulanan (monthly_rollup) dan isi dari data yang ada
+
+Revision ID: e9a772de60a0
+Revises: b6f4e2832f1e
+Create Date: 2026-10-18 11:40:06.731842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9a772de60a0'
+down_revision = 'b6f4e2832f1e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('monthly_rollup',
+    sa.Column('tahun', sa.Integer(), nullable=False),
+    sa.Column('bulan', sa.Integer(), nullable=False),
+    sa.Column('pendapatan', sa.Integer(), nullable=False),
+    sa.Column('tunggakan', sa.Integer(), nullable=False),
+    sa.Column('tagihan_lunas', sa.Integer(), nullable=False),
+    sa.Column('tagihan_belum_lunas', sa.Integer(), nullable=False),
+    sa.Column('pengeluaran', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('tahun', 'bulan')
+    )
+    op.create_table('monthly_expense_rollup',
+    sa.Column('tahun', sa.Integer(), nullable=False),
+    sa.Column('bulan', sa.Integer(), nullable=False),
+    sa.Column('kategori', sa.String(length=50), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('tahun', 'bulan', 'kategori')
+    )
+
+    op.execute("""
+        INSERT INTO monthly_rollup (tahun, bulan, pendapatan, tunggakan, tagihan_lunas, tagihan_belum_lunas, pengeluaran)
+        SELECT tahun, bulan, SUM(pendapatan), SUM(tunggakan), SUM(lunas), SUM(belum_lunas), SUM(pengeluaran) FROM (
+            SELECT tahun, bulan,
+                   SUM(CASE WHEN status = 'Lunas' THEN jumlah ELSE 0 END) AS pendapatan,
+                   SUM(CASE WHEN status = 'Lunas' THEN 0 ELSE jumlah END) AS tunggakan,
+                   SUM(CASE WHEN status = 'Lunas' THEN 1 ELSE 0 END) AS lunas,
+                   SUM(CASE WHEN status = 'Lunas' THEN 0 ELSE 1 END) AS belum_lunas,
+                   0 AS pengeluaran
+            FROM invoice GROUP BY tahun, bulan
+            UNION ALL
+            SELECT CAST(strftime('%Y', tanggal) AS INTEGER), CAST(strftime('%m', tanggal) AS INTEGER), 0, 0, 0, 0, SUM(jumlah)
+            FROM expense GROUP BY 1, 2
+        ) GROUP BY tahun, bulan
+    """)
+    op.execute("""
+        INSERT INTO monthly_expense_rollup (tahun, bulan, kategori, total)
+        SELECT CAST(strftime('%Y', tanggal) AS INTEGER), CAST(strftime('%m', tanggal) AS INTEGER), kategori, SUM(jumlah)
+        FROM expense GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade():
+    op.drop_table('monthly_expense_rollup')
+    op.drop_table('monthly_rollup')
@@ -1,37 +1,20 @@
 #!/bin/bash
 # Script untuk memulai aplikasi WISP Financial Admin
-# dan menyimpan perubahan ke GitHub saat dihentikan.
+# dan membuat backup database + nota saat dihentikan.
 
-# Fungsi cleanup_and_push tetap sama...
-cleanup_and_push() {
+# Database dan nota tidak lagi disimpan ke git (lihat .gitignore); backup online dibuat dengan
+# `flask backup` ke instance/backups (atur BACKUP_DIR, BACKUP_KEEP, BACKUP_INTERVAL_HOURS).
+backup_on_exit() {
     echo ""
     echo "========================================="
-    echo "Server dihentikan."
-    read -p "Simpan semua perubahan ke GitHub? (y/n): " choice
-    echo "========================================="
-
-    case "$choice" in 
-      y|Y ) 
-        echo "--> Menambahkan semua perubahan..."
-        git add .
-        commit_message="Update otomatis pada $(date +'%Y-%m-%d %H:%M:%S')"
-        echo "--> Membuat commit dengan pesan: '$commit_message'"
-        git commit -m "$commit_message"
-        echo "--> Mengunggah ke GitHub..."
-        git push
-        echo "--> Selesai! Perubahan berhasil disimpan."
-        ;;
-      * ) 
-        echo "--> Keluar tanpa menyimpan ke GitHub."
-        ;;
-    esac
-
+    echo "Server dihentikan. Membuat backup..."
+    flask backup
     echo "========================================="
     exit 0
 }
 
 # Menjebak sinyal Ctrl+C (SIGINT)
-trap cleanup_and_push SIGINT
+trap backup_on_exit SIGINT
 
 # =======================================================
 # BAGIAN BARU YANG DIPERBARUI
@@ -66,8 +49,18 @@ echo ""
 echo "========================================="
 echo "Memulai WISP Financial Admin..."
 echo "Tekan Ctrl+C untuk menghentikan server."
+echo "Restart worker tanpa putus: kill -HUP <pid master gunicorn>"
 echo "========================================="
 
-# 5. Jalankan server aplikasi Flask
+# 5. Terapkan migrasi database, bangun aset statis ber-hash, lalu jalankan server produksi (gunicorn, beberapa worker).
+#    Jumlah worker/thread: WEB_WORKERS, WEB_THREADS (lihat app/config.py).
+#    Untuk server pengembangan dengan debugger: FLASK_DEBUG=1 python3 run.py
 export FLASK_APP=run.py
-python3 run.py
+flask db upgrade
+# Repo tidak punya test suite; pemeriksaan ini yang menggagalkan start jika query laporan kehilangan index.
+if ! flask check-query-plans; then
+    echo "Query laporan jatuh ke full table scan; periksa index sebelum menjalankan server."
+    exit 1
+fi
+flask build-assets
+gunicorn -c gunicorn.conf.py wsgi:app
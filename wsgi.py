@@ -0,0 +1,7 @@
+"""Titik masuk WSGI untuk server produksi:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+from app import create_app
+
+app = create_app()